@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+End-to-end and per-phase build benchmark on synthetic corpora.
+
+For every corpus size the harness generates a content tree with
+benchmarks/corpus.py, times build_site end to end, then times the build
+phases (discovery, parsing, nav, render, write) separately using the same
+functions build_site uses. Parsing covers both the frontmatter scan and
+markdown body conversion. Results are written as JSON; passing a previous
+result file with --baseline fails the run when any timing regresses by more
+than --threshold.
+
+Usage:
+    python3 benchmarks/bench_build.py --pages 100 10000 --output bench.json
+    python3 benchmarks/bench_build.py --pages 100 --baseline bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+from pathlib import Path
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from src.builder.html import build_site, resolve_page_paths
+from src.builder.navigation import generate_navigation, build_navigation
+from src.builder.staging import remove_output
+from src.builder.utils import extract_description
+from src.config.markdown import MARKDOWN_PATTERN
+from src.parser.markdown import read_frontmatter, render_markdown_file
+from src.templates.loader import load_template, compile_template
+
+TEMPLATE_FILE = os.path.join(ROOT, "templates", "base.html")
+PHASES = ["discovery", "parsing", "nav", "render", "write"]
+
+
+def quiet_logger():
+    """Return a logger that formats records at INFO level but emits nothing."""
+    logger = logging.getLogger("static_site_generator.bench")
+    logger.handlers = [logging.NullHandler()]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def time_build_site(content_dir, output_dir, logger, jobs):
+    """Time a complete build_site call."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        successful, errors = build_site(logger, content_dir, output_dir, TEMPLATE_FILE, jobs=jobs)
+        elapsed = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(f"build_site reported {errors} errors")
+    return elapsed, successful
+
+
+def time_phases(content_dir, output_dir, logger):
+    """Run the build pipeline phase by phase and time each phase."""
+    timings = dict.fromkeys(PHASES, 0.0)
+    template = compile_template(load_template(TEMPLATE_FILE, logger))
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        markdown_files = sorted(Path(content_dir).rglob(MARKDOWN_PATTERN))
+        timings["discovery"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pages_info = []
+        for md_file in markdown_files:
+            fm = read_frontmatter(md_file, logger)
+            url_path, output_path = resolve_page_paths(fm, md_file, content_dir, output_dir)
+            if url_path is None:
+                continue
+            pages_info.append({
+                'title': fm.get("title", md_file.stem),
+                'url_path': url_path,
+                'output_path': output_path,
+                'frontmatter': fm,
+                'source': md_file,
+            })
+        for page in pages_info:
+            page['html_body'] = render_markdown_file(page['source'], logger)
+            page['description'] = extract_description(page['frontmatter'], page['html_body'])
+        timings["parsing"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    navigation = build_navigation(generate_navigation(pages_info, logger))
+    timings["nav"] = time.perf_counter() - start
+
+    for page in pages_info:
+        start = time.perf_counter()
+        html = template.render(
+            title=page['title'],
+            content=page['html_body'],
+            navigation=navigation.render(page['url_path']),
+            description=page['description'],
+        )
+        rendered = time.perf_counter()
+        page['output_path'].parent.mkdir(parents=True, exist_ok=True)
+        page['output_path'].write_text(html, encoding="utf-8")
+        timings["render"] += rendered - start
+        timings["write"] += time.perf_counter() - rendered
+
+    return timings
+
+
+def run_size(pages, repeat, jobs, seed, work_dir):
+    """Benchmark one corpus size, keeping the fastest of repeat runs."""
+    content_dir = os.path.join(work_dir, f"content-{pages}")
+    corpus_bytes = generate_corpus(content_dir, pages, seed)
+    logger = quiet_logger()
+
+    best_build = None
+    best_phases = None
+    for run in range(repeat):
+        output_dir = os.path.join(work_dir, f"dist-{pages}-{run}")
+        elapsed, successful = time_build_site(content_dir, output_dir, logger, jobs)
+        remove_output(output_dir)
+        best_build = elapsed if best_build is None else min(best_build, elapsed)
+
+        phases = time_phases(content_dir, output_dir, logger)
+        remove_output(output_dir)
+        if best_phases is None:
+            best_phases = phases
+        else:
+            best_phases = {name: min(best_phases[name], phases[name]) for name in PHASES}
+
+    shutil.rmtree(content_dir, ignore_errors=True)
+    return {
+        "pages": pages,
+        "pages_built": successful,
+        "corpus_bytes": corpus_bytes,
+        "build_site": best_build,
+        "pages_per_second": successful / best_build if best_build else None,
+        "phases": best_phases,
+    }
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Return a list of regressions of results against baseline.
+
+    A timing regresses when it is more than threshold slower relative to the
+    baseline and more than min_delta seconds slower in absolute terms, so
+    noise on phases that take microseconds does not fail the check.
+    """
+    regressions = []
+    previous = {entry["pages"]: entry for entry in baseline.get("results", [])}
+    for entry in results["results"]:
+        old = previous.get(entry["pages"])
+        if old is None:
+            continue
+        metrics = {"build_site": (entry["build_site"], old["build_site"])}
+        for name in PHASES:
+            if name in entry["phases"] and name in old.get("phases", {}):
+                metrics[name] = (entry["phases"][name], old["phases"][name])
+        for name, (new_time, old_time) in metrics.items():
+            if old_time and new_time > old_time * (1 + threshold) and new_time - old_time > min_delta:
+                regressions.append(
+                    f"{entry['pages']} pages {name}: {old_time:.4f}s -> {new_time:.4f}s "
+                    f"(+{(new_time / old_time - 1) * 100:.1f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build_site on synthetic corpora.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000],
+                        help="corpus sizes to benchmark (default: 100 1000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, fastest is kept")
+    parser.add_argument("--jobs", type=int, default=1, help="parser processes for build_site")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="ignore slowdowns smaller than this many seconds (default: 0.01)")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="ssg-bench-") as work_dir:
+        for pages in args.pages:
+            entry = run_size(pages, args.repeat, args.jobs, args.seed, work_dir)
+            results["results"].append(entry)
+            phases = " ".join(f"{name}={entry['phases'][name]:.3f}s" for name in PHASES)
+            print(f"{pages:>7} pages: build_site={entry['build_site']:.3f}s "
+                  f"({entry['pages_per_second']:.0f} pages/s) {phases}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote results to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print("Performance regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
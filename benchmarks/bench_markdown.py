@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark comparing markdown.markdown() with the pooled converter.
+
+markdown.markdown() builds a new Markdown instance and reloads every
+extension for each call; render_markdown() reuses one converter per thread
+and resets it between documents. The difference is per-document overhead,
+so it shows most on many small pages.
+
+Usage:
+    python3 benchmarks/bench_markdown.py [--pages N] [--repeat N]
+"""
+
+import os
+import sys
+import random
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import markdown
+
+from corpus import body
+from src.config.markdown import MARKDOWN_EXTENSIONS
+from src.parser.markdown import render_markdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled markdown conversion.")
+    parser.add_argument("--pages", type=int, default=2000, help="number of documents per run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'blocks/page':>12} {'fresh (us/doc)':>15} {'pooled (us/doc)':>16} {'speedup':>8}")
+    for blocks in [1, 4, 16]:
+        documents = [body(rng, blocks) for _ in range(args.pages)]
+        for document in documents[:50]:
+            assert render_markdown(document) == markdown.markdown(document, extensions=MARKDOWN_EXTENSIONS)
+
+        fresh = min(timeit.repeat(
+            lambda: [markdown.markdown(d, extensions=MARKDOWN_EXTENSIONS) for d in documents],
+            number=1, repeat=args.repeat)) / len(documents)
+        pooled = min(timeit.repeat(
+            lambda: [render_markdown(d) for d in documents],
+            number=1, repeat=args.repeat)) / len(documents)
+        print(f"{blocks:>12} {fresh * 1e6:>15.1f} {pooled * 1e6:>16.1f} {fresh / pooled:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
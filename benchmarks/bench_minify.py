@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the HTML minifier on rendered synthetic pages.
+
+Pages are generated with benchmarks/corpus.py, rendered with the site
+template and navigation exactly as build_site does, and then minified.
+Throughput is reported in MB/s of input HTML, together with the share of
+bytes removed.
+
+Usage:
+    python3 benchmarks/bench_minify.py [--pages N] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus
+from src.builder.html import resolve_page_paths
+from src.builder.minify import minify_html
+from src.builder.navigation import generate_navigation, build_navigation
+from src.config.markdown import MARKDOWN_PATTERN
+from src.parser.markdown import read_frontmatter, render_markdown_file
+from src.templates.loader import load_template, compile_template
+
+TEMPLATE_FILE = os.path.join(ROOT, "templates", "base.html")
+
+
+def render_pages(content_dir, logger):
+    """Render every page of a content tree to its complete HTML."""
+    template = compile_template(load_template(TEMPLATE_FILE, logger))
+    pages = []
+    for md_file in sorted(Path(content_dir).rglob(MARKDOWN_PATTERN)):
+        fm = read_frontmatter(md_file, logger)
+        url_path, _ = resolve_page_paths(fm, md_file, content_dir, "dist")
+        if url_path is not None:
+            pages.append({'title': fm.get("title", md_file.stem), 'url_path': url_path, 'source': md_file})
+    navigation = build_navigation(generate_navigation(pages, logger))
+    return [
+        template.render(
+            title=page['title'],
+            content=render_markdown_file(page['source'], logger),
+            navigation=navigation.render(page['url_path']),
+            description="",
+        )
+        for page in pages
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500, help="synthetic pages to render (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions, fastest is kept")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("static_site_generator.bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    with tempfile.TemporaryDirectory(prefix="ssg-minify-") as work_dir:
+        generate_corpus(work_dir, args.pages, args.seed)
+        pages = render_pages(work_dir, logger)
+
+    input_bytes = sum(len(html.encode("utf-8")) for html in pages)
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        minified = [minify_html(html) for html in pages]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    output_bytes = sum(len(html.encode("utf-8")) for html in minified)
+
+    print(f"pages:       {len(pages)}")
+    print(f"input:       {input_bytes / 1e6:.2f} MB")
+    print(f"output:      {output_bytes / 1e6:.2f} MB ({(1 - output_bytes / input_bytes) * 100:.1f}% saved)")
+    print(f"time:        {best * 1000:.1f} ms")
+    print(f"throughput:  {input_bytes / 1e6 / best:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
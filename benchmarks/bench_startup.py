@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the command line's startup cost, measured with -X importtime.
+
+Compares importing src.generator, which defers markdown, yaml and the
+builder until a command needs them, with importing markdown and yaml up
+front as the generator used to.
+
+Usage:
+    python3 benchmarks/bench_startup.py [--repeat N]
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED = ("markdown", "yaml")
+
+
+def import_times(statement):
+    """Run statement in a fresh interpreter and return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per variant, fastest is kept")
+    args = parser.parse_args()
+
+    lazy = min(import_times("import src.generator")["src.generator"] for _ in range(args.repeat))
+    eager = min(
+        sum(times[module] for module in DEFERRED + ("src.generator",))
+        for times in (import_times("import markdown, yaml, src.generator") for _ in range(args.repeat))
+    )
+
+    print(f"lazy:   {lazy / 1000:.1f} ms")
+    print(f"eager:  {eager / 1000:.1f} ms")
+    print(f"saved:  {(1 - lazy / eager) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
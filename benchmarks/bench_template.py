@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark comparing chained str.replace rendering with the compiled template.
+
+Usage:
+    python3 benchmarks/bench_template.py [--repeat N]
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.templates.loader import compile_template
+
+TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "templates", "base.html")
+BODY_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def render_with_replace(template, title, content, navigation, description):
+    """The rendering previously used by build_site."""
+    return template.replace("{title}", title).replace("{content}", content).replace("{navigation}", navigation).replace("{description}", description)
+
+
+def make_body(size):
+    """Build an HTML body of roughly size characters."""
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4 + "</p>\n"
+    return paragraph * (size // len(paragraph) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions per size")
+    args = parser.parse_args()
+
+    with open(TEMPLATE_FILE, encoding="utf-8") as f:
+        source = f.read()
+    compiled = compile_template(source)
+    navigation = '<nav class="site-navigation">\n' + '  <a href="/page">Page</a>\n' * 20 + '</nav>\n'
+    values = {"title": "Benchmark", "navigation": navigation, "description": "A benchmark page"}
+
+    print(f"{'body size':>12} {'replace (ms)':>14} {'compiled (ms)':>14} {'speedup':>8}")
+    for size in BODY_SIZES:
+        body = make_body(size)
+        number = max(1, 2_000_000 // size)
+        assert compiled.render(content=body, **values) == render_with_replace(source, content=body, **values)
+        replace_time = min(timeit.repeat(lambda: render_with_replace(source, content=body, **values),
+                                         number=number, repeat=args.repeat)) / number
+        compiled_time = min(timeit.repeat(lambda: compiled.render(content=body, **values),
+                                          number=number, repeat=args.repeat)) / number
+        print(f"{size:>12,} {replace_time * 1000:>14.3f} {compiled_time * 1000:>14.3f} "
+              f"{replace_time / compiled_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Conformance and throughput harness for the markdown backends.
+
+Renders the bodies of content/ and a synthetic corpus through every
+installed backend in src/parser/backends.py and compares the HTML with
+Python-Markdown, the reference. Each document counts as exact when the HTML
+is identical, as equivalent when it only differs in whitespace between
+tags, and as differing otherwise; a diff of the first differing documents
+is printed. Throughput is reported in documents and megabytes of markdown
+per second.
+
+Run this before switching MARKDOWN_BACKEND: a backend with differing
+documents changes the rendered site.
+
+Usage:
+    python3 benchmarks/compare_backends.py [--pages N] [--repeat N] [--diffs N]
+"""
+
+import os
+import re
+import sys
+import random
+import timeit
+import difflib
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import body
+from src.parser.backends import BACKENDS, DEFAULT_BACKEND, available_backends
+from src.parser.markdown import split_frontmatter
+
+BETWEEN_TAGS = re.compile(r">\s+<")
+
+
+def normalize(html):
+    """Drop whitespace between tags and around the document."""
+    return BETWEEN_TAGS.sub("><", html.strip())
+
+
+def load_documents(content_dir, pages, seed=0):
+    """Return (name, body) of every page in content_dir, then of pages synthetic bodies."""
+    documents = []
+    for path in sorted(Path(content_dir).rglob("*.md")):
+        _, text = split_frontmatter(path.read_text(encoding="utf-8"))
+        documents.append((str(path), text))
+    rng = random.Random(seed)
+    for index in range(pages):
+        documents.append((f"synthetic/{index}", body(rng, rng.choice([1, 4, 16]))))
+    return documents
+
+
+def show_diff(name, expected, actual):
+    """Print a unified diff of two HTML documents, one tag per line."""
+    print(f"    --- {name}")
+    expected_lines = normalize(expected).replace("><", ">\n<").splitlines()
+    actual_lines = normalize(actual).replace("><", ">\n<").splitlines()
+    diff = difflib.unified_diff(expected_lines, actual_lines, DEFAULT_BACKEND, "backend", lineterm="", n=1)
+    for line in list(diff)[2:40]:
+        print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the output and speed of the markdown backends.")
+    parser.add_argument("--content", default="content", help="directory of markdown pages to include")
+    parser.add_argument("--pages", type=int, default=500, help="number of synthetic documents")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions")
+    parser.add_argument("--diffs", type=int, default=2, help="differing documents to show per backend")
+    args = parser.parse_args()
+
+    documents = load_documents(args.content, args.pages)
+    megabytes = sum(len(text.encode("utf-8")) for _, text in documents) / 1e6
+    names = available_backends()
+    missing = sorted(set(BACKENDS) - set(names))
+    print(f"{len(documents)} documents, {megabytes:.2f} MB of markdown")
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+
+    reference = BACKENDS[DEFAULT_BACKEND]()
+    expected = [reference.render(text) for _, text in documents]
+
+    print(f"{'backend':>16} {'version':>9} {'exact':>6} {'equiv':>6} {'differ':>7} {'docs/s':>9} {'MB/s':>7}")
+    for name in names:
+        backend = BACKENDS[name]()
+        rendered = [backend.render(text) for _, text in documents]
+        exact = sum(html == reference_html for html, reference_html in zip(rendered, expected))
+        differing = [
+            index for index, (html, reference_html) in enumerate(zip(rendered, expected))
+            if normalize(html) != normalize(reference_html)
+        ]
+        seconds = min(timeit.repeat(
+            lambda: [backend.render(text) for _, text in documents], number=1, repeat=args.repeat))
+        print(f"{name:>16} {BACKENDS[name].version():>9} {exact:>6} {len(documents) - exact - len(differing):>6} "
+              f"{len(differing):>7} {len(documents) / seconds:>9.0f} {megabytes / seconds:>7.2f}")
+        for index in differing[:args.diffs]:
+            show_diff(documents[index][0], expected[index], rendered[index])
+
+
+if __name__ == "__main__":
+    main()
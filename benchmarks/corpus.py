@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Synthetic content corpus generator for benchmarks.
+
+Generates a content/ tree of markdown pages with YAML frontmatter. Pages vary
+in body length and directory depth, and mix headings, lists, tables and
+fenced code, so builds exercise the same paths as real content.
+
+Usage:
+    python3 benchmarks/corpus.py OUTPUT_DIR --pages N [--seed S]
+"""
+
+import os
+import sys
+import random
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = (
+    "static site generator markdown template navigation build cache page "
+    "python cloud system design running backpacking book review distributed "
+    "latency throughput index render parse write asset deploy container "
+    "kubernetes database query schema network protocol engineer project"
+).split()
+
+SECTIONS = ["tech", "life", "notes", "projects", "books", "running"]
+
+CODE_SNIPPETS = {
+    "python": "def handler(event):\n    items = [x * 2 for x in event['items']]\n    return {'count': len(items)}\n",
+    "go": "func main() {\n\tfor i := 0; i < 10; i++ {\n\t\tfmt.Println(i)\n\t}\n}\n",
+    "bash": "set -euo pipefail\nfor f in content/*.md; do\n  wc -l \"$f\"\ndone\n",
+    "yaml": "services:\n  web:\n    image: nginx:alpine\n    ports:\n      - \"80:80\"\n",
+}
+
+
+def sentence(rng, min_words=6, max_words=18):
+    """Return a random sentence."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + rng.choice([".", ".", ".", "!", "?"])
+
+
+def paragraph(rng):
+    """Return a paragraph with inline markup."""
+    text = " ".join(sentence(rng) for _ in range(rng.randint(2, 6)))
+    word = rng.choice(WORDS)
+    return text.replace(f" {word} ", f" **{word}** ", 1)
+
+
+def table(rng):
+    """Return a markdown table."""
+    columns = rng.randint(2, 5)
+    header = "| " + " | ".join(rng.choice(WORDS).title() for _ in range(columns)) + " |"
+    divider = "|" + "---|" * columns
+    rows = [
+        "| " + " | ".join(str(rng.randint(0, 1000)) for _ in range(columns)) + " |"
+        for _ in range(rng.randint(2, 12))
+    ]
+    return "\n".join([header, divider] + rows)
+
+
+def code_block(rng):
+    """Return a fenced code block."""
+    language = rng.choice(sorted(CODE_SNIPPETS))
+    return f"```{language}\n{CODE_SNIPPETS[language] * rng.randint(1, 4)}```"
+
+
+def bullet_list(rng):
+    """Return a bulleted list."""
+    return "\n".join(f"- {sentence(rng, 3, 8)}" for _ in range(rng.randint(3, 8)))
+
+
+def body(rng, blocks):
+    """Return a markdown body made of the given number of blocks."""
+    parts = [f"# {sentence(rng, 2, 6).rstrip('.!?')}"]
+    for _ in range(blocks):
+        kind = rng.random()
+        if kind < 0.55:
+            parts.append(paragraph(rng))
+        elif kind < 0.65:
+            parts.append(f"## {sentence(rng, 2, 5).rstrip('.!?')}")
+        elif kind < 0.78:
+            parts.append(bullet_list(rng))
+        elif kind < 0.89:
+            parts.append(table(rng))
+        else:
+            parts.append(code_block(rng))
+    return "\n\n".join(parts) + "\n"
+
+
+def frontmatter(rng, index, slug):
+    """Return the YAML frontmatter for a page."""
+    lines = [
+        f"title: {rng.choice(WORDS).title()} {rng.choice(WORDS)} {index}",
+        f"slug: {slug}",
+        f"date: {date(2020, 1, 1) + timedelta(days=rng.randint(0, 2000))}",
+        f"tags: [{', '.join(rng.sample(WORDS, rng.randint(1, 4)))}]",
+    ]
+    if rng.random() < 0.3:
+        lines.append(f"description: {sentence(rng, 8, 20)}")
+    if rng.random() < 0.1:
+        lines.append("layout: post")
+    return "---\n" + "\n".join(lines) + "\n---\n\n"
+
+
+def generate_corpus(content_dir, pages, seed=0):
+    """Write a synthetic corpus of pages markdown files into content_dir.
+
+    Body lengths follow a long-tailed distribution, and most pages sit in
+    nested section directories while a handful live at the top level.
+
+    Returns:
+        int: Total number of bytes written
+    """
+    rng = random.Random(seed)
+    content_dir = Path(content_dir)
+    content_dir.mkdir(parents=True, exist_ok=True)
+    total_bytes = 0
+
+    for index in range(pages):
+        if index < min(len(SECTIONS), pages // 20):
+            # A few top-level pages so the navigation has entries
+            directory = content_dir
+            slug = SECTIONS[index]
+        else:
+            depth = rng.choice([1, 1, 1, 2, 2, 3])
+            parts = [rng.choice(SECTIONS)] + [f"{rng.choice(WORDS)}-{rng.randint(0, 9)}" for _ in range(depth - 1)]
+            directory = content_dir.joinpath(*parts)
+            slug = f"page-{index}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        blocks = min(400, int(rng.paretovariate(1.5) * 4))
+        text = frontmatter(rng, index, slug) + body(rng, blocks)
+        data = text.encode("utf-8")
+        (directory / f"page-{index}.md").write_bytes(data)
+        total_bytes += len(data)
+
+    return total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic content corpus.")
+    parser.add_argument("output_dir", help="directory to write markdown files into")
+    parser.add_argument("--pages", type=int, default=100, help="number of pages to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    if os.path.exists(args.output_dir) and os.listdir(args.output_dir):
+        sys.exit(f"Refusing to write into non-empty directory: {args.output_dir}")
+    total_bytes = generate_corpus(args.output_dir, args.pages, args.seed)
+    print(f"Wrote {args.pages} pages ({total_bytes:,} bytes) to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
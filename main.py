@@ -1,6 +1,8 @@
+import sys
+
 from src.generator import generate_site
 
 if __name__ == "__main__":
-    generate_site()
+    sys.exit(generate_site())
 else:
-    print("This module is not meant to be imported.")
\ No newline at end of file
+    print("This module is not meant to be imported.")
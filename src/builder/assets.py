@@ -1,36 +1,192 @@
 """
 Asset management functionality for the static site generator.
+
+Every file in the template directory except the HTML templates themselves is
+treated as a static asset. The size, modification time and hash of each copied
+asset are recorded in the build state of the output, so later builds only copy
+assets that changed. A build into a new release directory reads those records
+from the previous release and hardlinks its unchanged assets from there.
 """
 
+import os
+import json
 import shutil
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from src.builder.cache import hash_file
+from src.builder.staging import build_state_dir, write_build_state
+from src.config.default import ASSET_MANIFEST_FILE, DEFAULT_ASSET_THREADS
+
+# Template directory entries that are never copied to the output
+TEMPLATE_SUFFIXES = (".html",)
+IGNORED_NAMES = ("__pycache__",)
+
+
+def discover_assets(template_dir):
+    """Return the relative paths of all static assets in template_dir, sorted."""
+    template_dir = Path(template_dir)
+    assets = []
+    for root, dirs, files in os.walk(template_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in IGNORED_NAMES)
+        for name in files:
+            if name.startswith(".") or name.endswith(TEMPLATE_SUFFIXES):
+                continue
+            assets.append((Path(root) / name).relative_to(template_dir))
+    return sorted(assets)
+
+
+def _load_asset_state(output_dir):
+    """Load the asset records written by the previous build."""
+    state_path = build_state_dir(output_dir) / ASSET_MANIFEST_FILE
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_asset_state(output_dir, state):
+    """Write the asset records for the next build."""
+    write_build_state(output_dir, ASSET_MANIFEST_FILE, json.dumps(state, indent=2, sort_keys=True))
+
+
+def _is_unchanged(source, dest, stat, previous):
+    """Check whether dest already holds the current contents of source.
+
+    The size and modification time are compared first; the hash is only
+    computed when the size matches but the modification time changed.
+
+    Returns:
+        tuple: (unchanged, source_hash) - source_hash is None when not computed
+    """
+    if not previous or not dest.exists() or dest.stat().st_size != stat.st_size:
+        return False, None
+    if previous.get('size') != stat.st_size:
+        return False, None
+    if previous.get('mtime_ns') == stat.st_mtime_ns:
+        return True, previous.get('hash')
+    source_hash = hash_file(source)
+    return source_hash == previous.get('hash'), source_hash
+
+
+def _reuse_asset(previous, dest):
+    """Put the previous build's copy of an unchanged asset at dest.
+
+    The copy is hardlinked, falling back to a copy when linking is not
+    possible; nothing is done when dest already is that file.
+    """
+    if dest == previous or (dest.exists() and os.path.samefile(previous, dest)):
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    try:
+        os.link(previous, dest)
+    except OSError:
+        shutil.copy2(previous, dest)
+
+
+def _copy_asset(source, dest, link, source_hash):
+    """Copy (or hardlink) a single asset, replacing any existing file.
+
+    Returns:
+        tuple: (mode, source_hash) - mode is "linked" or "copied", and the
+        source is hashed here when the hash was not already known
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    # Remove first: the old file may be a hardlink to the source itself
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    mode = "copied"
+    if link:
+        try:
+            os.link(source, dest)
+            mode = "linked"
+        except OSError:
+            pass
+    if mode == "copied":
+        shutil.copy2(source, dest)
+    return mode, source_hash or hash_file(source)
+
+
+def copy_static_assets(template_dir, output_dir, logger, link=False, threads=DEFAULT_ASSET_THREADS,
+                       previous_dir=None):
+    """Copy static assets (CSS, favicons, etc.) to output directory.
+
+    Only assets that are new or changed since the previous build are copied.
+    Copies run on a thread pool and are summarised in a single log line.
+
+    Args:
+        link: Hardlink assets into the output directory instead of copying
+            them, falling back to a copy when linking is not possible
+        threads: Number of threads used to copy assets
+        previous_dir: Output of the previous build, whose asset records are
+            compared and whose unchanged assets are hardlinked into
+            output_dir; output_dir itself by default
+
+    Returns:
+        tuple: (copied, unchanged, failed) - Number of assets in each state
+    """
+    template_dir = Path(template_dir)
+    output_dir = Path(output_dir)
+    previous_dir = Path(previous_dir) if previous_dir is not None else output_dir
+    previous_state = _load_asset_state(previous_dir)
+    assets = discover_assets(template_dir)
+    if not assets:
+        logger.warning(f"No static assets found in: {template_dir}")
+
+    state = {}
+    pending = []
+    unchanged = 0
+    for rel_path in assets:
+        key = rel_path.as_posix()
+        source = template_dir / rel_path
+        dest = output_dir / rel_path
+        previous = previous_dir / rel_path
+        stat = source.stat()
+        is_unchanged, source_hash = _is_unchanged(source, previous, stat, previous_state.get(key))
+        state[key] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': source_hash,
+        }
+        if is_unchanged:
+            try:
+                _reuse_asset(previous, dest)
+                unchanged += 1
+                continue
+            except OSError:
+                pass
+        pending.append((key, source, dest))
+
+    # Remove assets that were deleted from the template directory
+    for key in previous_state.keys() - state.keys():
+        stale_path = output_dir / key
+        if stale_path.exists():
+            stale_path.unlink()
+            logger.info("Removed stale asset: %s", stale_path)
+
+    results = {"copied": 0, "linked": 0}
+    failed = 0
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(threads, len(pending)))) as executor:
+            futures = [
+                (key, source, executor.submit(_copy_asset, source, dest, link, state[key]['hash']))
+                for key, source, dest in pending
+            ]
+            for key, source, future in futures:
+                try:
+                    mode, state[key]['hash'] = future.result()
+                    results[mode] += 1
+                except Exception as e:
+                    logger.error("❌ Failed to copy asset %s: %s", source, e)
+                    del state[key]
+                    failed += 1
+
+    _save_asset_state(output_dir, state)
 
-def copy_static_assets(template_dir, output_dir, logger):
-    """Copy static assets (CSS, favicons, etc.) to output directory."""
-    # Copy CSS file
-    css_source = template_dir / "style.css"
-    css_dest = Path(output_dir) / "style.css"
-    if css_source.exists():
-        shutil.copy2(css_source, css_dest)
-        logger.info(f"✅ Copied CSS file to: {css_dest}")
-    else:
-        logger.warning(f"CSS file not found: {css_source}")
-    
-    # Copy favicon files
-    favicon_files = [
-        "favicon.ico",
-        "favicon-16x16.png", 
-        "favicon-32x32.png",
-        "apple-touch-icon.png",
-        "android-chrome-192x192.png",
-        "android-chrome-512x512.png"
-    ]
-    
-    for favicon_file in favicon_files:
-        favicon_source = template_dir / favicon_file
-        favicon_dest = Path(output_dir) / favicon_file
-        if favicon_source.exists():
-            shutil.copy2(favicon_source, favicon_dest)
-            logger.info(f"✅ Copied {favicon_file} to: {favicon_dest}")
-        else:
-            logger.warning(f"Favicon file not found: {favicon_source}") 
\ No newline at end of file
+    logger.info(
+        f"✅ Assets: {results['copied']} copied, {results['linked']} linked, "
+        f"{unchanged} unchanged, {failed} failed"
+    )
+    return (results["copied"] + results["linked"], unchanged, failed)
@@ -0,0 +1,121 @@
+"""
+Build manifest functionality for incremental builds.
+
+The build manifest lives inside the output directory and records, for every
+source markdown file, the hash of its contents together with the metadata
+needed to build navigation without parsing the file again. Hashes of the
+template, the configuration and the navigation are stored alongside so that
+a change to any of them invalidates every page.
+"""
+
+import os
+import json
+import hashlib
+
+from src import __version__
+from src.config.default import BUILD_MANIFEST_FILE
+from src.config.markdown import MARKDOWN_EXTENSIONS
+from src.builder.staging import build_state_dir, write_build_state
+from src.parser.backends import select_backend
+
+BUILD_MANIFEST_VERSION = 2
+
+
+def hash_bytes(data):
+    """Return the hex digest used for all build manifest hashes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text):
+    """Hash a string using its UTF-8 encoding."""
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_file(file_path, chunk_size=65536):
+    """Hash the contents of a file without loading it all at once."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_file_cached(file_path, hash_cache):
+    """Hash a file, reusing its digest in hash_cache while its size and mtime are unchanged."""
+    stat = os.stat(file_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = hash_cache.get(file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = hash_file(file_path)
+    hash_cache[file_path] = (signature, digest)
+    return digest
+
+
+def hash_config(**options):
+    """Hash every configuration value that affects rendered output."""
+    config = {
+        "version": __version__,
+        "markdown_extensions": MARKDOWN_EXTENSIONS,
+        "markdown_backend": select_backend().name,
+        "options": options,
+    }
+    return hash_text(json.dumps(config, sort_keys=True, default=str))
+
+
+def hash_navigation(pages_info):
+    """Hash the title and URL of every page.
+
+    Navigation is rendered into every page, so any change to this hash
+    means every page has to be rebuilt.
+    """
+    entries = [[str(page['title']), page['url_path']] for page in pages_info]
+    return hash_text(json.dumps(entries))
+
+
+def hash_content(source_hashes):
+    """Hash the path and contents of every source file.
+
+    Args:
+        source_hashes: Iterable of (relative source path, source hash)
+    """
+    return hash_text(json.dumps(sorted(source_hashes)))
+
+
+def load_build_manifest(output_dir, logger):
+    """Load the build manifest from a previous build.
+
+    Returns:
+        dict: The previous manifest, or None if it is missing or unusable
+    """
+    manifest_path = build_state_dir(output_dir) / BUILD_MANIFEST_FILE
+    if not manifest_path.exists():
+        logger.info("No build manifest found, performing full build")
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable build manifest {manifest_path}: {e}")
+        return None
+
+    if manifest.get("version") != BUILD_MANIFEST_VERSION:
+        logger.info("Build manifest version changed, performing full build")
+        return None
+
+    logger.debug(f"Loaded build manifest with {len(manifest.get('pages', {}))} entries")
+    return manifest
+
+
+def save_build_manifest(output_dir, manifest, logger):
+    """Write the build manifest for the next incremental build.
+
+    Returns:
+        dict: The manifest as written, as load_build_manifest would return it
+    """
+    manifest = dict(manifest, version=BUILD_MANIFEST_VERSION)
+    # Not indented: json only uses its C encoder without indent, which
+    # matters for the manifest of a large site
+    write_build_state(output_dir, BUILD_MANIFEST_FILE, json.dumps(manifest, sort_keys=True))
+    logger.debug(f"Saved build manifest: {build_state_dir(output_dir) / BUILD_MANIFEST_FILE}")
+    return manifest
@@ -0,0 +1,79 @@
+"""
+Frontmatter validation for the static site generator.
+
+The check reads only the YAML header of every markdown file, so validating a
+content tree takes a fraction of the time of a full build.
+"""
+
+from pathlib import Path
+
+from src.config.markdown import MARKDOWN_PATTERN
+from src.parser.markdown import read_frontmatter
+from src.builder.html import resolve_page_paths
+
+# Frontmatter fields that are used as strings while building
+STRING_FIELDS = ("title", "slug", "description")
+
+
+def check_frontmatter(frontmatter):
+    """Return a list of problems that would make a page fail to build."""
+    if not isinstance(frontmatter, dict):
+        return [f"frontmatter must be a mapping, got {type(frontmatter).__name__}"]
+    problems = []
+    for field in STRING_FIELDS:
+        value = frontmatter.get(field)
+        if value is not None and not isinstance(value, str):
+            problems.append(f"'{field}' must be a string, got {type(value).__name__}")
+    return problems
+
+
+def check_site(logger, content_dir, output_dir):
+    """Validate the frontmatter of every markdown file without building.
+
+    Reports unreadable files, malformed or invalid YAML, fields of the wrong
+    type and pages that resolve to the same URL. Pages without a slug are
+    reported as warnings because the build skips them.
+
+    Returns:
+        tuple: (checked_count, error_count) - Number of files checked and errors
+    """
+    content_path = Path(content_dir)
+    if not content_path.exists():
+        logger.error(f"Content directory does not exist: {content_dir}")
+        return (0, 1)
+
+    markdown_files = sorted(content_path.rglob(MARKDOWN_PATTERN))
+    logger.info(f"Checking frontmatter of {len(markdown_files)} markdown files")
+
+    error_count = 0
+    urls = {}
+    for md_file in markdown_files:
+        try:
+            frontmatter = read_frontmatter(md_file, logger, strict=True)
+        except Exception as e:
+            logger.error("❌ %s: %s", md_file, e)
+            error_count += 1
+            continue
+
+        problems = check_frontmatter(frontmatter)
+        if problems:
+            for problem in problems:
+                logger.error("❌ %s: %s", md_file, problem)
+            error_count += 1
+            continue
+
+        url_path, _ = resolve_page_paths(frontmatter, md_file, content_dir, output_dir)
+        if url_path is None:
+            logger.warning("%s: no slug, page will be skipped", md_file)
+            continue
+        if url_path in urls:
+            logger.error("❌ %s: URL %s is already used by %s", md_file, url_path, urls[url_path])
+            error_count += 1
+            continue
+        urls[url_path] = md_file
+
+    if error_count > 0:
+        logger.warning(f"Check found {error_count} invalid files")
+    else:
+        logger.info("All frontmatter is valid")
+    return (len(markdown_files), error_count)
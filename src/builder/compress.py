@@ -0,0 +1,199 @@
+"""
+Gzip precompression of build output for nginx gzip_static.
+
+A .gz file is written next to every compressible output file. The .gz file
+is given the modification time of its source, so later builds can tell
+which compressed files are still current without decompressing them.
+
+Every build also records the size, modification time and hash of each
+compressed source in its build state. A build into a new release compares
+its files with those records and hardlinks the previous release's .gz file
+when the source bytes are unchanged, rather than compressing them again.
+"""
+
+import os
+import gzip
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from src.builder.cache import hash_bytes, hash_file
+from src.builder.staging import build_state_dir, write_build_state
+from src.config.default import (
+    DEFAULT_GZIP_THREADS,
+    GZIP_LEVEL,
+    GZIP_MANIFEST_FILE,
+    GZIP_MIN_SIZE,
+    GZIP_SUFFIXES,
+)
+
+GZIP_SUFFIX = ".gz"
+
+
+def discover_compressible(output_dir):
+    """Return the output files that should have a .gz copy, sorted."""
+    files = []
+    for root, dirs, names in os.walk(output_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in names:
+            if name.startswith(".") or not name.endswith(GZIP_SUFFIXES):
+                continue
+            files.append(Path(root) / name)
+    return sorted(files)
+
+
+def _is_current(source, gz_path):
+    """Check whether gz_path was written from the current version of source."""
+    try:
+        return gz_path.stat().st_mtime_ns == source.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _load_gzip_state(output_dir):
+    """Load the compressed source records written by the previous build."""
+    try:
+        return json.loads((build_state_dir(output_dir) / GZIP_MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _source_hash(source, stat, record):
+    """Return the hash of source, taken from record when its size and modification time match."""
+    if record and record.get('size') == stat.st_size and record.get('mtime_ns') == stat.st_mtime_ns:
+        return record.get('hash')
+    return hash_file(source)
+
+
+def _reuse_previous(source, stat, gz_path, previous_gz, record, level):
+    """Hardlink previous_gz to gz_path when it was compressed from the same bytes as source.
+
+    Returns:
+        str: The hash of source when previous_gz was reused, else None
+    """
+    if not record or record.get('level') != level or record.get('size') != stat.st_size:
+        return None
+    if not previous_gz.exists():
+        return None
+    # A page hardlinked from the previous release matches its record by stat alone
+    source_hash = _source_hash(source, stat, record)
+    if source_hash != record.get('hash'):
+        return None
+    try:
+        if not (gz_path.exists() and os.path.samefile(gz_path, previous_gz)):
+            tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+            os.link(previous_gz, tmp_path)
+            os.replace(tmp_path, gz_path)
+    except OSError:
+        return None
+    return source_hash
+
+
+def _compress_file(source, gz_path, level):
+    """Write the gzip-compressed copy of source to gz_path.
+
+    The file name and timestamp are left out of the gzip header so the
+    output only depends on the contents of source.
+
+    Returns:
+        tuple: (original_size, compressed_size, source_hash)
+    """
+    data = source.read_bytes()
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    tmp_path = gz_path.with_name(gz_path.name + ".tmp")
+    tmp_path.write_bytes(compressed)
+    stat = source.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, gz_path)
+    return len(data), len(compressed), hash_bytes(data)
+
+
+def _remove_orphans(output_dir, logger):
+    """Remove .gz files whose uncompressed source no longer exists."""
+    removed = 0
+    for gz_path in Path(output_dir).rglob("*" + GZIP_SUFFIX):
+        source = gz_path.with_suffix("")
+        # Only .gz files this module could have written; assets such as
+        # archives that end in .gz are left alone
+        if source.name.endswith(GZIP_SUFFIXES) and not source.exists():
+            gz_path.unlink()
+            logger.debug("Removed orphaned compressed file: %s", gz_path)
+            removed += 1
+    return removed
+
+
+def precompress_outputs(output_dir, logger, level=GZIP_LEVEL, threads=DEFAULT_GZIP_THREADS, previous_dir=None):
+    """Write a .gz file next to each compressible file in output_dir.
+
+    Files smaller than GZIP_MIN_SIZE are left uncompressed, and files whose
+    .gz copy is already current, or whose bytes match those the previous
+    build compressed, are skipped. Compression runs on a thread pool; zlib
+    releases the GIL while compressing.
+
+    Args:
+        level: Gzip compression level (1-9)
+        threads: Number of threads used to compress files
+        previous_dir: Output of the previous build, whose .gz files are
+            hardlinked into output_dir for unchanged sources; output_dir
+            itself by default
+
+    Returns:
+        tuple: (compressed, unchanged, failed) - Number of files in each state
+    """
+    output_dir = Path(output_dir)
+    previous_dir = Path(previous_dir) if previous_dir is not None else output_dir
+    previous_state = _load_gzip_state(previous_dir)
+    _remove_orphans(output_dir, logger)
+
+    state = {}
+    pending = []
+    unchanged = 0
+    for source in discover_compressible(output_dir):
+        gz_path = source.with_name(source.name + GZIP_SUFFIX)
+        stat = source.stat()
+        if stat.st_size < GZIP_MIN_SIZE:
+            if gz_path.exists():
+                gz_path.unlink()
+            continue
+        key = source.relative_to(output_dir).as_posix()
+        record = previous_state.get(key)
+        if _is_current(source, gz_path):
+            source_hash = _source_hash(source, stat, record)
+        else:
+            source_hash = _reuse_previous(source, stat, gz_path, previous_dir / (key + GZIP_SUFFIX), record, level)
+        if source_hash is None:
+            pending.append((key, source, gz_path))
+            continue
+        state[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': source_hash, 'level': level}
+        unchanged += 1
+
+    compressed = 0
+    failed = 0
+    original_bytes = 0
+    compressed_bytes = 0
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(threads, len(pending)))) as executor:
+            futures = [
+                (key, source, executor.submit(_compress_file, source, gz_path, level))
+                for key, source, gz_path in pending
+            ]
+            for key, source, future in futures:
+                try:
+                    size, gz_size, source_hash = future.result()
+                    original_bytes += size
+                    compressed_bytes += gz_size
+                    compressed += 1
+                except Exception as e:
+                    logger.error("❌ Failed to compress %s: %s", source, e)
+                    failed += 1
+                    continue
+                stat = source.stat()
+                state[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': source_hash, 'level': level}
+
+    write_build_state(output_dir, GZIP_MANIFEST_FILE, json.dumps(state, indent=2, sort_keys=True))
+
+    logger.info(
+        f"✅ Gzip: {compressed} compressed ({original_bytes} -> {compressed_bytes} bytes), "
+        f"{unchanged} unchanged, {failed} failed"
+    )
+    return (compressed, unchanged, failed)
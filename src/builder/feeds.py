@@ -0,0 +1,209 @@
+"""
+Sitemap and Atom feed generation for the static site generator.
+
+Both files are streamed to disk with an incremental XML writer while the
+pages are written, so memory use does not grow with the size of the site:
+the sitemap holds one open file, and the feed only keeps the most recent
+entries seen so far.
+"""
+
+import os
+import heapq
+from pathlib import Path
+from contextlib import ExitStack
+from datetime import date, datetime, timezone
+from xml.sax.saxutils import XMLGenerator
+
+from src.builder.staging import open_output
+from src.config.default import SITEMAP_FILE, SITEMAP_MAX_URLS, FEED_FILE, FEED_MAX_ENTRIES
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+EPOCH = "1970-01-01T00:00:00Z"
+
+
+def normalize_date(value):
+    """Convert a frontmatter date into an RFC 3339 UTC timestamp.
+
+    Dates without a time are taken as midnight UTC and naive datetimes as
+    UTC. Timestamps in this form sort chronologically as plain strings.
+
+    Returns:
+        str: The timestamp, or None if value is missing or not a date
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if isinstance(value, date):
+        return f"{value.isoformat()}T00:00:00Z"
+    return None
+
+
+def _start(xml, name, attrs=None):
+    """Write an opening tag on a line of its own."""
+    xml.startElement(name, attrs or {})
+    xml.ignorableWhitespace("\n")
+
+
+def _end(xml, name):
+    """Write a closing tag on a line of its own."""
+    xml.endElement(name)
+    xml.ignorableWhitespace("\n")
+
+
+def _element(xml, name, text=None, attrs=None):
+    """Write a complete element, <name>text</name> or <name/>, on one line."""
+    xml.startElement(name, attrs or {})
+    if text is not None:
+        xml.characters(text)
+    _end(xml, name)
+
+
+class SitemapWriter:
+    """Stream page URLs into sitemap.xml.
+
+    URLs are written to sitemap-1.xml, sitemap-2.xml, ... holding at most
+    max_urls each, the limit of the sitemap protocol. On close, a single
+    part is renamed to sitemap.xml; otherwise sitemap.xml becomes a sitemap
+    index listing the parts.
+    """
+
+    def __init__(self, output_dir, site_url, max_urls=SITEMAP_MAX_URLS):
+        self.output_dir = Path(output_dir)
+        self.site_url = site_url.rstrip("/")
+        self.max_urls = max_urls
+        self.parts = 0
+        self.urls = 0
+        self._part = None
+        self._xml = None
+        self._part_urls = 0
+
+    def _part_path(self, number):
+        """Return the path of a numbered sitemap part."""
+        stem, suffix = os.path.splitext(SITEMAP_FILE)
+        return self.output_dir / f"{stem}-{number}{suffix}"
+
+    def _open_part(self):
+        """Start the next sitemap part."""
+        self.parts += 1
+        self._part = ExitStack()
+        f = self._part.enter_context(open_output(self._part_path(self.parts)))
+        self._xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+        self._xml.startDocument()
+        _start(self._xml, "urlset", {"xmlns": SITEMAP_NAMESPACE})
+        self._part_urls = 0
+
+    def _close_part(self):
+        """Finish the current sitemap part, if any."""
+        if self._xml is None:
+            return
+        _end(self._xml, "urlset")
+        self._xml.endDocument()
+        self._part.close()
+        self._part = self._xml = None
+
+    def add(self, url_path, lastmod=None):
+        """Add a page, with its normalized frontmatter date as lastmod if known."""
+        if self._xml is None or self._part_urls >= self.max_urls:
+            self._close_part()
+            self._open_part()
+        _start(self._xml, "url")
+        _element(self._xml, "loc", self.site_url + url_path)
+        if lastmod:
+            _element(self._xml, "lastmod", lastmod)
+        _end(self._xml, "url")
+        self._part_urls += 1
+        self.urls += 1
+
+    def close(self, logger):
+        """Finish the last part and write sitemap.xml."""
+        if self._xml is None and self.parts == 0:
+            # An empty site still gets a valid, empty sitemap
+            self._open_part()
+        self._close_part()
+
+        sitemap_path = self.output_dir / SITEMAP_FILE
+        if self.parts == 1:
+            os.replace(self._part_path(1), sitemap_path)
+        else:
+            with open_output(sitemap_path) as f:
+                xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+                xml.startDocument()
+                _start(xml, "sitemapindex", {"xmlns": SITEMAP_NAMESPACE})
+                for number in range(1, self.parts + 1):
+                    _start(xml, "sitemap")
+                    _element(xml, "loc", f"{self.site_url}/{self._part_path(number).name}")
+                    _end(xml, "sitemap")
+                _end(xml, "sitemapindex")
+                xml.endDocument()
+
+        # Parts left over from a previous, larger build
+        number = self.parts + 1
+        while self._part_path(number).exists():
+            self._part_path(number).unlink()
+            number += 1
+        logger.info(
+            "✅ Generated %s: %d URLs in %d file(s)", sitemap_path, self.urls, self.parts
+        )
+
+
+class AtomFeedWriter:
+    """Collect the most recent dated pages and write them as an Atom feed.
+
+    Only the newest max_entries pages offered are kept, in a heap, so
+    pages can be added in any order as they are written.
+    """
+
+    def __init__(self, output_dir, site_url, title, author, max_entries=FEED_MAX_ENTRIES):
+        self.output_dir = Path(output_dir)
+        self.site_url = site_url.rstrip("/")
+        self.title = title
+        self.author = author
+        self.max_entries = max_entries
+        self._entries = []
+
+    def add(self, url_path, title, updated, summary):
+        """Offer a page; pages without a date are not part of the feed."""
+        if not updated or self.max_entries <= 0:
+            return
+        entry = (updated, url_path, str(title), summary or "")
+        if len(self._entries) < self.max_entries:
+            heapq.heappush(self._entries, entry)
+        elif entry > self._entries[0]:
+            heapq.heapreplace(self._entries, entry)
+
+    def write(self, logger):
+        """Write the feed, newest entries first."""
+        entries = sorted(self._entries, reverse=True)
+        feed_path = self.output_dir / FEED_FILE
+        with open_output(feed_path) as f:
+            xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+            xml.startDocument()
+            _start(xml, "feed", {"xmlns": ATOM_NAMESPACE})
+            _element(xml, "title", self.title)
+            _element(xml, "id", f"{self.site_url}/")
+            _element(xml, "link", attrs={"href": f"{self.site_url}/{FEED_FILE}", "rel": "self"})
+            _element(xml, "link", attrs={"href": f"{self.site_url}/"})
+            # Derived from the entries so an unchanged site gives an identical feed
+            _element(xml, "updated", entries[0][0] if entries else EPOCH)
+            _start(xml, "author")
+            _element(xml, "name", self.author)
+            _end(xml, "author")
+            for updated, url_path, title, summary in entries:
+                url = self.site_url + url_path
+                _start(xml, "entry")
+                _element(xml, "title", title)
+                _element(xml, "link", attrs={"href": url})
+                _element(xml, "id", url)
+                _element(xml, "updated", updated)
+                _element(xml, "summary", summary)
+                _end(xml, "entry")
+            _end(xml, "feed")
+            xml.endDocument()
+        logger.info("✅ Generated %s: %d entries", feed_path, len(entries))
@@ -0,0 +1,178 @@
+"""
+Syntax highlighting of fenced code blocks for the static site generator.
+
+With --highlight, every code block with a language, such as one rendered
+from ```python, is highlighted with Pygments after the body is converted
+from markdown. Blocks are styled by CSS classes from one generated
+stylesheet, HIGHLIGHT_STYLESHEET, which the template links to, rather than
+by inline styles.
+
+Highlighting is slow next to converting markdown, so each block is
+highlighted at most once: results are keyed by a hash of the Pygments
+version, the formatter options, the language and the code, kept in memory for the rest of the
+process and stored as one file per block in HIGHLIGHT_CACHE_DIR. A snippet
+repeated across pages, or unchanged since the last build, is read back
+instead of highlighted again. Render workers share the cache directory
+safely, as every entry is written to a temporary file and renamed into
+place.
+
+Pygments is optional: without it, --highlight logs a warning and code
+blocks are left as they are.
+"""
+
+import os
+import re
+import html
+import json
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+
+from src.builder.cache import hash_text
+from src.config.default import (
+    HIGHLIGHT_CACHE_DIR,
+    HIGHLIGHT_CSS_CLASS,
+    HIGHLIGHT_MEMORY_BLOCKS,
+    HIGHLIGHT_STYLE,
+    HIGHLIGHT_STYLESHEET,
+)
+
+# Code block with a language, as rendered by every markdown backend
+CODE_BLOCK = re.compile(r'<pre><code class="language-([^"\s]+)">(.*?)</code></pre>', re.DOTALL)
+
+
+def highlighting_available():
+    """Return whether Pygments is installed."""
+    return importlib.util.find_spec("pygments") is not None
+
+
+def highlight_identity():
+    """Return a string that changes whenever highlighted output may change."""
+    import pygments
+    return f"pygments {pygments.__version__} {HIGHLIGHT_STYLE} {HIGHLIGHT_CSS_CLASS}"
+
+
+def highlight_stylesheet():
+    """Return the CSS for HIGHLIGHT_STYLE, scoped to highlighted blocks."""
+    from pygments.formatters import HtmlFormatter
+    formatter = HtmlFormatter(style=HIGHLIGHT_STYLE, cssclass=HIGHLIGHT_CSS_CLASS)
+    return formatter.get_style_defs(f".{HIGHLIGHT_CSS_CLASS}") + "\n"
+
+
+def link_stylesheet(template_source):
+    """Link the highlighting stylesheet from the <head> of a template.
+
+    Templates that already link to it are returned unchanged.
+    """
+    link = f'<link rel="stylesheet" href="/{HIGHLIGHT_STYLESHEET}" />'
+    if f"/{HIGHLIGHT_STYLESHEET}" in template_source:
+        return template_source
+    index = template_source.lower().find("</head>")
+    if index == -1:
+        return link + template_source
+    return f"{template_source[:index]}{link}\n{template_source[index:]}"
+
+
+class Highlighter:
+    """Highlights code blocks, each distinct block at most once."""
+
+    def __init__(self, cache_dir=HIGHLIGHT_CACHE_DIR, memory_blocks=HIGHLIGHT_MEMORY_BLOCKS):
+        """Create a highlighter.
+
+        Args:
+            cache_dir: Directory of highlighted blocks kept across builds, or
+                None to keep them in memory only
+            memory_blocks: Number of blocks kept in memory at most
+        """
+        import pygments
+        from pygments.formatters import HtmlFormatter
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.memory_blocks = memory_blocks
+        # Part of every key, so changing an option never serves stale blocks
+        self.formatter_options = {'cssclass': HIGHLIGHT_CSS_CLASS, 'wrapcode': True}
+        self.formatter = HtmlFormatter(**self.formatter_options)
+        self.version = pygments.__version__
+        self.blocks = {}
+        self.highlighted = 0
+
+    def key(self, language, code):
+        """Return the cache key of a code block."""
+        return hash_text(json.dumps([self.version, self.formatter_options, language, code], sort_keys=True))
+
+    def _read(self, key):
+        if self.cache_dir is None:
+            return None
+        try:
+            return (self.cache_dir / f"{key}.html").read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key, block):
+        if self.cache_dir is None:
+            return
+        path = self.cache_dir / f"{key}.html"
+        # Unique per process, as workers may store the same block at once
+        tmp_path = path.with_name(f".{key}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(block, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    def block(self, language, code):
+        """Return the highlighted HTML of a code block, or None for an unknown language.
+
+        Args:
+            language: Language name from the code fence
+            code: The code, unescaped
+        """
+        key = self.key(language, code)
+        if key in self.blocks:
+            return self.blocks[key]
+        block = self._read(key)
+        if block is None:
+            from pygments import highlight
+            from pygments.lexers import get_lexer_by_name
+            from pygments.util import ClassNotFound
+            try:
+                lexer = get_lexer_by_name(language)
+            except ClassNotFound:
+                # Remembered in memory only, so a later Pygments can still highlight it
+                block = ""
+            else:
+                block = highlight(code, lexer, self.formatter).rstrip("\n")
+                self.highlighted += 1
+                self._write(key, block)
+        if len(self.blocks) < self.memory_blocks:
+            self.blocks[key] = block or None
+        return block or None
+
+    def highlight(self, html_body):
+        """Highlight every code block with a language in an HTML body."""
+        def replace(match):
+            block = self.block(match.group(1), html.unescape(match.group(2)))
+            return match.group(0) if block is None else block
+        return CODE_BLOCK.sub(replace, html_body)
+
+
+@lru_cache(maxsize=None)
+def get_highlighter(cache_dir=HIGHLIGHT_CACHE_DIR):
+    """Return this process's highlighter for cache_dir, created on first use.
+
+    Render workers and the main process each keep their own, so the blocks
+    held in memory are reused by every later page of the process.
+    """
+    return Highlighter(cache_dir)
+
+
+def highlight_cache_stats(cache_dir=HIGHLIGHT_CACHE_DIR):
+    """Return the number of cached blocks and their total size in bytes."""
+    paths = list(Path(cache_dir).glob("*.html"))
+    return {'entries': len(paths), 'bytes': sum(path.stat().st_size for path in paths)}
+
+
+def clear_highlight_cache(cache_dir=HIGHLIGHT_CACHE_DIR):
+    """Remove every cached block."""
+    for path in Path(cache_dir).glob("*.html"):
+        path.unlink(missing_ok=True)
@@ -3,165 +3,815 @@ Main site building functionality for the static site generator.
 """
 
 import os
+import logging
 from pathlib import Path
 from datetime import datetime
+from functools import partial
+from contextlib import closing
+from itertools import islice
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-from src.templates.loader import load_template
-from src.parser.markdown import parse_markdown
+from src.templates.loader import load_template, compile_template
+from src.parser.markdown import read_frontmatter, render_markdown_file
 from src.config.markdown import MARKDOWN_PATTERN
-from src.builder.navigation import generate_navigation, generate_navigation_html
+from src.config.default import DEFAULT_LOG_NAME, DEFAULT_JOBS, SITE_URL, SITE_TITLE, SITE_AUTHOR
+from src.config.default import MAX_RENDER_CHUNK_SIZE, RENDER_CHUNKS_PER_WORKER, SEARCH_INDEX_SHARDS
+from src.config.default import DEFAULT_WRITE_THREADS, HIGHLIGHT_CACHE_DIR, HIGHLIGHT_STYLESHEET
+from src.builder.navigation import generate_navigation, build_navigation
 from src.builder.manifest import generate_manifest_json
 from src.builder.assets import copy_static_assets
+from src.builder.compress import precompress_outputs
+from src.builder.feeds import SitemapWriter, AtomFeedWriter, normalize_date
+from src.builder.minify import minify_html, in_raw_element
+from src.builder.highlight import (
+    get_highlighter,
+    highlight_identity,
+    highlight_stylesheet,
+    highlighting_available,
+    link_stylesheet,
+)
+from src.builder.page import PageRecord
+from src.builder.search import SearchIndexBuilder, page_terms
+from src.builder.staging import prepare_staging, swap_into_place, discard_staging, write_output
+from src.builder.output_manifest import write_output_manifest
+from src.builder.shards import ShardRecord, shard_of, discard_shard_record
+from src.builder.writer import PageWriter
 from src.builder.utils import extract_description
+from src.logger.logger import page_status
+from src.parser.backends import DEFAULT_BACKEND, backend_fallback, select_backend
+from src.profiler.profiler import BuildProfiler, NULL_PROFILER
+from src.builder.cache import (
+    hash_content,
+    hash_file,
+    hash_file_cached,
+    hash_text,
+    hash_config,
+    hash_navigation,
+    load_build_manifest,
+    save_build_manifest,
+)
 
 
+def _remove_stale_outputs(output_dir, previous_pages, current_outputs, logger):
+    """Delete pages written by a previous build that no longer have a source."""
+    for entry in previous_pages.values():
+        rel_output = entry.get('output_path')
+        if not rel_output or rel_output in current_outputs:
+            continue
+        stale_path = Path(output_dir) / rel_output
+        if stale_path.exists():
+            stale_path.unlink()
+            logger.info("Removed stale page: %s", stale_path)
+            try:
+                stale_path.parent.rmdir()
+            except OSError:
+                pass
+
+
+def resolve_page_paths(fm, md_file, content_dir, output_dir):
+    """Determine the URL and output path of a page from its frontmatter.
+    
+    Returns:
+        tuple: (url_path, output_path), or (None, None) for pages without a slug
+    """
+    rel_path = Path(md_file).relative_to(content_dir)
+    slug = fm.get("slug")
+    
+    if slug:
+        # If slug is specified in frontmatter, use it
+        slug = slug.lower().replace(" ", "_")
+        if slug.endswith("/"):
+            output_path = Path(output_dir) / slug / "index.html"
+            url_path = f"/{slug}"
+        elif slug == "index":
+            # Special case: slug "index" should create root index.html
+            output_path = Path(output_dir) / "index.html"
+            url_path = "/"
+        else:
+            # Preserve directory structure when using slug
+            dir_path = rel_path.parent
+            if str(dir_path) != ".":
+                # File is in a subdirectory, preserve the directory structure
+                output_path = Path(output_dir) / dir_path / slug / "index.html"
+                url_path = f"/{dir_path}/{slug}"
+            else:
+                # File is in root directory
+                output_path = Path(output_dir) / slug / "index.html"
+                url_path = f"/{slug}"
+        return url_path, output_path
+    
+    # Pages without a slug are not built
+    return None, None
+
+
+def _render_body(source, title, description, cached, logger, profiler, search=False, minify=False,
+                 keep_html=False, highlight=False, highlight_cache=None):
+    """Render the body of a page and work out its meta description.
+    
+    Cached pages carry no frontmatter description, so their frontmatter is
+    read again first.
+    
+    Returns:
+        tuple: As returned by _finish_body
+    """
+    frontmatter = None
+    if cached:
+        frontmatter = read_frontmatter(source, logger, profiler)
+        description = frontmatter.get("description")
+    html_body = render_markdown_file(source, logger, profiler)
+    return _finish_body(
+        source, title, description, html_body, profiler, search, minify, keep_html, highlight, highlight_cache,
+        frontmatter)
+
+
+def _finish_body(source, title, description, html_body, profiler, search=False, minify=False,
+                 keep_html=False, highlight=False, highlight_cache=None, frontmatter=None):
+    """Work out the meta description of a rendered body and prepare it for the page.
+    
+    With search set, the page's search terms are extracted as well. With
+    minify set, the body is minified here, and with highlight set its code
+    blocks are highlighted first, using the blocks cached in highlight_cache,
+    so the work is spread over the render workers.
+    
+    Returns:
+        tuple: (html_body, description, terms, saved, markdown_html) - terms
+        is None unless search is set, saved is the number of bytes
+        minification removed and markdown_html is (frontmatter, body) with
+        the body as converted from markdown, for the render cache, when
+        keep_html is set; frontmatter is None unless it was read again
+    """
+    markdown_html = (frontmatter, html_body) if keep_html else None
+    with profiler.phase("description", str(source)):
+        description = extract_description({'description': description}, html_body)
+    terms = None
+    if search:
+        with profiler.phase("search", str(source)):
+            terms = page_terms(title, html_body)
+    if highlight:
+        with profiler.phase("highlight", str(source)):
+            html_body = get_highlighter(highlight_cache).highlight(html_body)
+    saved = 0
+    if minify:
+        with profiler.phase("minify", str(source)):
+            minified = minify_html(html_body)
+            saved = len(html_body.encode("utf-8")) - len(minified.encode("utf-8"))
+            html_body = minified
+    return html_body, description, terms, saved, markdown_html
+
+
+def _render_chunk(items, profile=False, search=False, minify=False, keep_html=False, highlight=False,
+                  highlight_cache=None):
+    """Render a chunk of pages inside a worker process.
+    
+    Args:
+        items: List of (source, title, description, cached) tuples
+    
+    Returns:
+        tuple: (results, timings) - results holds (html_body, description,
+        terms, saved, markdown_html, error) per page, where error is the
+        message of any failure so the parent can count it, and timings holds
+        the worker's profiler records when profile is set.
+    """
+    logger = logging.getLogger(DEFAULT_LOG_NAME)
+    profiler = BuildProfiler() if profile else NULL_PROFILER
+    results = []
+    for source, title, description, cached in items:
+        try:
+            rendered = _render_body(
+                source, title, description, cached, logger, profiler, search, minify, keep_html,
+                highlight, highlight_cache)
+        except Exception as e:
+            results.append((None, None, None, 0, None, str(e)))
+        else:
+            results.append((*rendered, None))
+    return results, profiler.records() if profile else None
 
 
+def _render_pages(pages, logger, jobs, profiler=NULL_PROFILER, search=False, minify=False, keep_html=False,
+                  highlight=False, highlight_cache=None):
+    """Render page bodies lazily, in worker processes when jobs > 1.
+    
+    Only a bounded number of chunks is handed to the workers ahead of the
+    consumer, so at most a few chunks of rendered bodies are held in memory
+    however large the site is.
+    
+    Yields:
+        tuple: (html_body, description, terms, saved, markdown_html, error)
+        for each page, in the same order as pages
+    """
+    if jobs <= 1 or len(pages) <= 1:
+        for page in pages:
+            try:
+                rendered = _render_body(
+                    page.source, page.title, page.description, page.cached, logger, profiler,
+                    search, minify, keep_html, highlight, highlight_cache)
+            except Exception as e:
+                yield None, None, None, 0, None, e
+            else:
+                yield (*rendered, None)
+        return
+    
+    workers = min(jobs, len(pages))
+    chunksize = min(MAX_RENDER_CHUNK_SIZE, max(1, len(pages) // (workers * 4)))
+    logger.info(f"Rendering {len(pages)} pages with {workers} worker processes")
+    render_chunk = partial(
+        _render_chunk, profile=profiler.enabled, search=search, minify=minify, keep_html=keep_html,
+        highlight=highlight, highlight_cache=highlight_cache
+    )
+    chunks = (
+        [(page.source, page.title, page.description, page.cached) for page in pages[i:i + chunksize]]
+        for i in range(0, len(pages), chunksize)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(
+            executor.submit(render_chunk, chunk)
+            for chunk in islice(chunks, workers * RENDER_CHUNKS_PER_WORKER)
+        )
+        while pending:
+            results, timings = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(render_chunk, chunk))
+            if timings:
+                profiler.merge(timings)
+            yield from results
+
 
-def build_site(logger, content_dir, output_dir, template_file):
+def _record_page(manifest_pages, page, summary=None):
+    """Record a successfully built page in the build manifest."""
+    rel_source = page.rel_source
+    manifest_pages[rel_source] = {
+        'hash': page.source_hash,
+        'title': page.title,
+        'url_path': page.url_path,
+        'output_path': page.rel_output
+    }
+    if page.search is not None:
+        manifest_pages[rel_source]['search'] = page.search
+    if page.date is not None:
+        # Feed entries of unchanged pages are written from the manifest
+        manifest_pages[rel_source]['date'] = page.date
+        manifest_pages[rel_source]['summary'] = summary
+
+
+def _template_key(template_file, highlight):
+    """Return what the compiled template depends on, or None when the file cannot be read."""
+    try:
+        stat = os.stat(template_file)
+    except OSError:
+        return None
+    return (str(template_file), stat.st_size, stat.st_mtime_ns, highlight)
+
+
+def _previous_file(path, output_dir, previous_dir):
+    """Return the file at the same place as path in previous_dir, or None."""
+    if previous_dir is None:
+        return None
+    return Path(previous_dir) / Path(path).relative_to(output_dir)
+
+
+def build_site(logger, content_dir, output_dir, template_file, incremental=False, jobs=DEFAULT_JOBS,
+               profiler=None, link_assets=False, precompress=False, search=False, minify=False,
+               render_cache=None, write_threads=DEFAULT_WRITE_THREADS, staged=True, hash_cache=None,
+               shard=None, highlight=False, highlight_cache=HIGHLIGHT_CACHE_DIR, strict=False, warm=None):
     """Build the static site with comprehensive logging.
     
+    The site is built in a new release directory (see src.builder.staging),
+    which replaces output_dir once the build finishes. Pages that fail to
+    build are left out; a build that fails as a whole, or in which no page
+    builds, leaves the previous output untouched, as does any error with
+    strict set. A published build lists its files in an output manifest and
+    its changes to the previous output in a deploy delta.
+    
+    Args:
+        incremental: Reuse pages from the previous build whose source file,
+            template, configuration and navigation are all unchanged; the
+            previous output is hardlinked into the staging directory so
+            unchanged files are not written again. Full builds hardlink the
+            pages that come out identical to the previous output instead
+        jobs: Number of worker processes used to render markdown bodies
+        profiler: BuildProfiler that records per-phase timings, or None
+        link_assets: Hardlink static assets into the output instead of copying
+        precompress: Write a .gz copy of every compressible output file
+        search: Write a sharded client-side search index to search/
+        minify: Minify every rendered page before it is written
+        render_cache: RenderCache whose frontmatter and HTML bodies are used
+            instead of parsing unchanged sources, and which receives those of
+            the sources parsed by this build, or None
+        write_threads: Number of threads writing pages while the next ones
+            are rendered
+        staged: Build in a staging directory; when False the build writes
+            straight into output_dir, as the dev server does, and a failed
+            build leaves its partial output in place
+        hash_cache: Dict kept across builds by a long-running process, so
+            source files whose size and modification time are unchanged are
+            not hashed again
+        shard: (index, count) to render only the pages of one shard (see
+            src.builder.shards), with a shard record instead of the sitemap,
+            feed, search index and output manifest; not combined with
+            incremental
+        highlight: Highlight fenced code blocks with Pygments, styled by a
+            generated HIGHLIGHT_STYLESHEET linked from the template
+        highlight_cache: Directory of highlighted code blocks kept across
+            builds, or None to keep them for this process only
+        strict: Keep the previous output when any page fails to build
+        warm: WarmBuild kept by a long-running process that rebuilds
+            output_dir in place, holding the manifest, page records, template
+            and navigation of its previous build; its hash_cache is used when
+            hash_cache is None. Ignored by staged builds
+    
+    Returns:
+        tuple: (successful_conversions, error_count) - Number of successful conversions and errors
+    """
+    if profiler is None:
+        profiler = NULL_PROFILER
+    
+    try:
+        if shard is not None:
+            discard_shard_record(output_dir)
+        previous_manifest = None
+        if staged:
+            warm = None
+        if warm is not None and hash_cache is None:
+            hash_cache = warm.hash_cache
+        if incremental and warm is not None and warm.manifest is not None:
+            previous_manifest = warm.manifest
+        elif incremental:
+            previous_manifest = load_build_manifest(output_dir, logger)
+        previous_dir = None
+        if staged:
+            with profiler.phase("staging"):
+                staging_dir = prepare_staging(output_dir, logger, reuse=previous_manifest is not None)
+            if Path(output_dir).is_dir():
+                previous_dir = Path(output_dir)
+        else:
+            staging_dir = Path(output_dir)
+    except Exception as e:
+        logger.error(f"Build failed: {e}")
+        return (0, 1)
+    
+    processed_count, error_count = _build_into(
+        logger, content_dir, staging_dir, template_file, previous_manifest, incremental, jobs,
+        profiler, link_assets, precompress, search, minify, render_cache, write_threads, hash_cache, shard,
+        highlight, highlight_cache, previous_dir, warm
+    )
+    
+    if not staged:
+        return (processed_count, error_count)
+    if error_count > 0 and (strict or processed_count == 0):
+        discard_staging(staging_dir, logger)
+        return (processed_count, error_count)
+    if error_count > 0:
+        logger.warning("Publishing %d pages, leaving out the %d that failed", processed_count, error_count)
+    try:
+        if shard is None:
+            with profiler.phase("outputs"):
+                write_output_manifest(staging_dir, output_dir, logger)
+        with profiler.phase("staging"):
+            swap_into_place(staging_dir, output_dir, logger)
+    except OSError as e:
+        logger.error(f"Failed to replace {output_dir}: {e}")
+        discard_staging(staging_dir, logger)
+        return (processed_count, 1)
+    return (processed_count, error_count)
+
+
+def _build_into(logger, content_dir, output_dir, template_file, previous_manifest, incremental, jobs,
+                profiler, link_assets, precompress, search, minify, render_cache, write_threads, hash_cache,
+                shard, highlight, highlight_cache, previous_dir=None, warm=None):
+    """Build every page of the site into output_dir, the staging directory.
+    
+    Files that come out identical to those in previous_dir, the output being
+    replaced, are hardlinked from it rather than written. With warm, what
+    the previous build kept in memory is used and replaced (see
+    src.builder.warm).
+    
     Returns:
         tuple: (successful_conversions, error_count) - Number of successful conversions and errors
     """
     try:
-        # Clear output directory
-        import shutil
-        if os.path.exists(output_dir):
-            shutil.rmtree(output_dir)
-            logger.info(f"Cleared existing output directory: {output_dir}")
+        previous_pages = previous_manifest.get('pages', {}) if previous_manifest else {}
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         logger.info(f"Created/verified output directory: {output_dir}")
         
         # Load template
-        template = load_template(template_file, logger)
+        if highlight and not highlighting_available():
+            logger.warning("Not highlighting code blocks: Pygments is not installed")
+            highlight = False
+        template_key = _template_key(template_file, highlight) if warm is not None else None
+        if template_key is not None and warm.template is not None and warm.template[0] == template_key:
+            template = warm.template[1]
+        else:
+            template_source = load_template(template_file, logger)
+            if highlight:
+                template_source = link_stylesheet(template_source)
+            template = compile_template(template_source)
+        compiled_template = template
         
         # Copy static assets to output directory
         template_dir = Path(template_file).parent
-        copy_static_assets(template_dir, output_dir, logger)
+        with profiler.phase("assets"):
+            copy_static_assets(template_dir, output_dir, logger, link=link_assets, previous_dir=previous_dir)
         
         # Generate and write manifest.json
-        manifest_content = generate_manifest_json("Jgrove", "Personal website and projects")
-        manifest_path = Path(output_dir) / "manifest.json"
-        manifest_path.write_text(manifest_content, encoding="utf-8")
+        with profiler.phase("manifest"):
+            manifest_content = generate_manifest_json("Jgrove", "Personal website and projects")
+            manifest_path = Path(output_dir) / "manifest.json"
+            write_output(manifest_path, manifest_content, _previous_file(manifest_path, output_dir, previous_dir))
         logger.info(f"✅ Generated manifest.json: {manifest_path}")
         
+        if highlight:
+            stylesheet_path = Path(output_dir) / HIGHLIGHT_STYLESHEET
+            write_output(
+                stylesheet_path, highlight_stylesheet(), _previous_file(stylesheet_path, output_dir, previous_dir))
+            logger.info("✅ Generated highlighting stylesheet: %s", stylesheet_path)
+        
         # Find all markdown files
         content_path = Path(content_dir)
         if not content_path.exists():
             logger.error(f"Content directory does not exist: {content_dir}")
             return (0, 1)  # 0 successful, 1 error (content dir not found)
         
-        markdown_files = list(content_path.rglob(MARKDOWN_PATTERN))
+        with profiler.phase("discovery"):
+            if warm is not None:
+                markdown_files = warm.discover(content_path, MARKDOWN_PATTERN)
+            else:
+                markdown_files = sorted(content_path.rglob(MARKDOWN_PATTERN))
         logger.info(f"Found {len(markdown_files)} markdown files to process")
+        missing_backend = backend_fallback()
+        if missing_backend is not None:
+            logger.warning("Markdown backend %s is not installed, using %s", missing_backend, DEFAULT_BACKEND)
+        logger.info("Converting markdown with %s", select_backend().identity())
         
         if not markdown_files:
             logger.warning("No markdown files found in content directory")
             return (0, 0)  # 0 successful, 0 errors (no files to process)
         
-        # First pass: collect all page information
+        # Work out which files changed since the previous build, and the
+        # render cache entries of their contents
+        source_hashes = {}
+        for md_file in markdown_files:
+            if incremental or render_cache is not None or shard is not None:
+                with profiler.phase("hash", str(md_file)):
+                    if warm is not None and warm.is_unchanged(md_file):
+                        source_hashes[md_file] = warm.hash_cache[md_file][1]
+                    elif hash_cache is None:
+                        source_hashes[md_file] = hash_file(md_file)
+                    else:
+                        source_hashes[md_file] = hash_file_cached(md_file, hash_cache)
+            else:
+                source_hashes[md_file] = None
+        
+        # First pass: collect page metadata from the frontmatter only
         pages_info = []
+        manifest_pages = {}
         error_count = 0
+        # Sources of the pages that failed, for the shard record
+        failed_sources = []
         for md_file in markdown_files:
+            page = warm.pages.get(md_file) if warm is not None else None
+            rel_source = page.rel_source if page is not None else md_file.relative_to(content_dir).as_posix()
             try:
-                # Parse markdown
-                fm, html_body = parse_markdown(md_file, logger)
+                source_hash = source_hashes[md_file]
+                render_key = render_cache.key(source_hash) if render_cache is not None else None
+                cached = previous_pages.get(rel_source)
+                if cached and cached.get('hash') == source_hash:
+                    # Unchanged source: reuse metadata from the manifest
+                    if cached.get('url_path') is None:
+                        manifest_pages[rel_source] = cached
+                        continue
+                    if page is not None and page.source_hash == source_hash:
+                        # The record of the previous build, without re-reading the manifest entry
+                        page.cached = True
+                        page.search = cached.get('search') if search else None
+                        page.render_key = render_key
+                        pages_info.append(page)
+                        continue
+                    pages_info.append(PageRecord(
+                        title=cached['title'],
+                        url_path=cached['url_path'],
+                        output_path=Path(output_dir) / cached['output_path'],
+                        source=md_file,
+                        source_hash=source_hash,
+                        cached=True,
+                        search=cached.get('search') if search else None,
+                        date=cached.get('date'),
+                        render_key=render_key,
+                        rel_source=rel_source,
+                        rel_output=cached['output_path']
+                    ))
+                    continue
+                
+                # Read frontmatter; the body is rendered when the page is written
+                fm = None
+                if render_key is not None:
+                    with profiler.phase("cache", str(md_file)):
+                        fm = render_cache.frontmatter(render_key)
+                if fm is None:
+                    fm = read_frontmatter(md_file, logger, profiler)
+                    if render_key is not None:
+                        render_cache.put_frontmatter(render_key, fm)
                 
                 # Extract metadata
                 title = fm.get("title", md_file.stem)
                 
                 # Determine output path - preserve directory structure
-                rel_path = md_file.relative_to(content_dir)
-                slug = fm.get("slug")
-                
-                if slug:
-                    # If slug is specified in frontmatter, use it
-                    slug = slug.lower().replace(" ", "_")
-                    if slug.endswith("/"):
-                        output_path = Path(output_dir) / slug / "index.html"
-                        url_path = f"/{slug}"
-                    elif slug == "index":
-                        # Special case: slug "index" should create root index.html
-                        output_path = Path(output_dir) / "index.html"
-                        url_path = "/"
-                    else:
-                        # Preserve directory structure when using slug
-                        dir_path = rel_path.parent
-                        print(dir_path)
-                        if str(dir_path) != ".":
-                            # File is in a subdirectory, preserve the directory structure
-                            output_path = Path(output_dir) / dir_path / slug / "index.html"
-                            url_path = f"/{dir_path}/{slug}"
-                        else:
-                            # File is in root directory
-                            output_path = Path(output_dir) / slug / "index.html"
-                            url_path = f"/{slug}"
-                else:
-                    # Generate HTML files directly with same name as markdown files
-                    print(rel_path.stem)
+                url_path, output_path = resolve_page_paths(fm, md_file, content_dir, output_dir)
+                if url_path is None:
                     # For now, skip files without slug - you can add logic here later
+                    logger.debug("Skipping %s: no slug", md_file)
+                    if incremental:
+                        manifest_pages[rel_source] = {'hash': source_hash, 'url_path': None}
                     continue
                 
-                # Extract or generate description
-                description = extract_description(fm, html_body)
-                
-                pages_info.append({
-                    'title': title,
-                    'url_path': url_path,
-                    'output_path': output_path,
-                    'html_body': html_body,
-                    'frontmatter': fm,
-                    'description': description
-                })
+                # Keep only the metadata later passes need, not the frontmatter
+                pages_info.append(PageRecord(
+                    title=title,
+                    url_path=url_path,
+                    output_path=output_path,
+                    source=md_file,
+                    source_hash=source_hash,
+                    description=fm.get("description"),
+                    # Changed pages keep their search document id
+                    search=cached.get('search') if cached and search else None,
+                    date=normalize_date(fm.get("date")),
+                    render_key=render_key,
+                    rel_source=rel_source,
+                    rel_output=output_path.relative_to(output_dir).as_posix()
+                ))
                 
             except Exception as e:
-                logger.error(f"❌ Failed to process {md_file}: {e}")
+                if shard is not None and shard_of(rel_source, shard[1]) != shard[0]:
+                    # Reported by the shard that builds the page
+                    logger.debug("Skipping %s: %s", md_file, e)
+                    continue
+                logger.error("❌ Failed to process %s: %s", md_file, e, extra=page_status("failed"))
                 error_count += 1
+                failed_sources.append(rel_source)
                 continue
         
         # Generate navigation structure
+        with profiler.phase("navigation"):
+            navigation_hash = hash_navigation(pages_info)
+            if warm is not None and warm.navigation is not None and warm.navigation[0] == navigation_hash:
+                navigation, navigation_error = warm.navigation[1], None
+            else:
+                base_pages = generate_navigation(pages_info, logger)
+                try:
+                    navigation = build_navigation(base_pages)
+                    navigation_error = None
+                except Exception as e:
+                    # Reported against every page, as rendering per page used to do
+                    navigation, navigation_error = None, e
+        
+        if minify and any(in_raw_element(template.source, slot) for slot in ("{content}", "{navigation}")):
+            logger.warning("Not minifying: the template places page content inside a <pre>, <code>, "
+                           "<textarea>, <script> or <style> element")
+            minify = False
+        
+        # Decide whether pages reused from the previous build are still valid
+        template_hash = hash_text(template.source)
+        config_hash = hash_config(
+            search=search, search_shards=SEARCH_INDEX_SHARDS, minify=minify,
+            highlight=highlight_identity() if highlight else False
+        )
+        rebuild_all = previous_manifest is None or (
+            previous_manifest.get('template') != template_hash
+            or previous_manifest.get('config') != config_hash
+            or previous_manifest.get('navigation') != navigation_hash
+        )
+        if incremental and previous_manifest is not None:
+            if rebuild_all:
+                logger.info("Template, configuration or navigation changed, rebuilding all pages")
+            current_outputs = {
+                page.rel_output for page in pages_info
+            }
+            _remove_stale_outputs(output_dir, previous_pages, current_outputs, logger)
+        
+        # A shard renders its own pages, with navigation built from all of them
+        shard_record = None
+        if shard is not None:
+            content_hash = hash_content(
+                (md_file.relative_to(content_dir).as_posix(), source_hash)
+                for md_file, source_hash in source_hashes.items()
+            )
+            shard_record = ShardRecord(
+                shard, template_hash, config_hash, navigation_hash, search, precompress, content_hash)
+            positions = {page.source: position for position, page in enumerate(pages_info)}
+            pages_info = [
+                page for page in pages_info
+                if shard_of(page.source.relative_to(content_dir).as_posix(), shard[1]) == shard[0]
+            ]
+            logger.info("Shard %d/%d: building %d of %d pages", shard[0], shard[1], len(pages_info), len(positions))
+        
+        # Bodies are minified by the render workers; the template is minified
+        # once here and each distinct navigation once, when first used
+        template_saved = 0
+        minified_navigation = {}
+        if minify:
+            with profiler.phase("minify"):
+                minified_source = minify_html(template.source)
+                template_saved = len(template.source.encode("utf-8")) - len(minified_source.encode("utf-8"))
+                template = compile_template(minified_source)
+        
+        # Bodies in the render cache are not sent to the render workers
+        cached_bodies = set()
         for page in pages_info:
-            print(page['url_path'])
-            print(page['output_path'])
-            print(page['frontmatter'])
-            print("--------------------------------")
-        base_pages = generate_navigation(pages_info, logger)
+            page.render = not page.cached or rebuild_all or not page.output_path.exists()
+            if page.render and page.render_key is not None:
+                with profiler.phase("cache", str(page.source)):
+                    if render_cache.has_html(page.render_key):
+                        cached_bodies.add(page.render_key)
+        rendered_pages = _render_pages(
+            [page for page in pages_info if page.render and page.render_key not in cached_bodies],
+            logger, jobs, profiler, search, minify, keep_html=render_cache is not None,
+            highlight=highlight, highlight_cache=highlight_cache
+        )
+        search_index = None
+        if search and shard_record is None:
+            # Reuse the previous index unless every page is being rendered anyway
+            previous_search = None if rebuild_all else previous_manifest.get('search')
+            search_index = SearchIndexBuilder(output_dir, previous_search)
+        sitemap = SitemapWriter(output_dir, SITE_URL)
+        feed = AtomFeedWriter(output_dir, SITE_URL, SITE_TITLE, SITE_AUTHOR)
         
-        # Second pass: build all pages with navigation
+        # Second pass: render one page at a time and hand it to the writer
+        # threads. A page only counts as built, and is only added to the
+        # search index, sitemap, feed and manifest, once its file is written;
+        # unchanged pages are queued as well so every page completes in order
         processed_count = 0
-        for page_info in pages_info:
-            logger.info(f"Processing: {page_info['output_path']}")
-            
-            try:
-                # Extract page information
-                title = page_info['title']
-                html_body = page_info['html_body']
-                output_path = page_info['output_path']
-                
-                logger.debug(f"Page title: {title}")
-                logger.debug(f"Output path: {output_path}")
-                
-                # Ensure parent directories exist
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                logger.debug(f"Created directory structure: {output_path.parent}")
+        skipped_count = 0
+        minified_count = 0
+        bytes_saved = 0
+        bytes_written = 0
+        
+        def finish_pages(completed):
+            """Account for pages whose write completed, in the order of pages_info."""
+            nonlocal processed_count, skipped_count, error_count
+            for (page, summary, terms), seconds, error in completed:
+                output_path = page.output_path
+                if not page.render:
+                    logger.debug("Unchanged: %s", output_path, extra=page_status("unchanged"))
+                    _record_page(manifest_pages, page, summary)
+                    if shard_record is not None:
+                        shard_record.add(positions[page.source], page, summary, None)
+                    else:
+                        sitemap.add(page.url_path, page.date)
+                        feed.add(page.url_path, page.title, page.date, summary)
+                    skipped_count += 1
+                    processed_count += 1
+                    continue
                 
-                # Generate navigation HTML for this specific page
-                navigation_html = generate_navigation_html(base_pages, page_info['url_path'])
+                try:
+                    if error is not None:
+                        raise error
+                    profiler.record("write", seconds, str(page.source))
+                    logger.info("✅ Built: %s", output_path, extra=page_status("built"))
+                    processed_count += 1
+                    
+                    if search_index is not None:
+                        page.search = search_index.add(page.url_path, page.title, terms, page.search)
+                    
+                    if shard_record is not None:
+                        shard_record.add(positions[page.source], page, summary, terms)
+                    else:
+                        sitemap.add(page.url_path, page.date)
+                        feed.add(page.url_path, page.title, page.date, summary)
+                    
+                    if incremental:
+                        _record_page(manifest_pages, page, summary)
+                    
+                except Exception as e:
+                    logger.error("❌ Failed to process %s: %s", output_path, e, extra=page_status("failed"))
+                    error_count += 1
+                    failed_sources.append(page.rel_source)
+        
+        # Closed here, so the render workers are shut down by this thread rather than
+        # by whichever thread happens to garbage-collect the suspended generator
+        with PageWriter(write_threads, output_dir=output_dir, previous_dir=previous_dir) as writer, \
+                closing(rendered_pages):
+            for page in pages_info:
+                output_path = page.output_path
+                if not page.render:
+                    summary = previous_pages[page.rel_source].get('summary')
+                    finish_pages(writer.submit(output_path, None, (page, summary, None)))
+                    continue
                 
-                # Generate HTML with navigation and description
-                html = template.replace("{title}", title).replace("{content}", html_body).replace("{navigation}", navigation_html).replace("{description}", page_info['description'])
+                logger.info("Processing: %s", output_path, extra=page_status("processing"))
                 
-                # Write file
-                output_path.write_text(html, encoding="utf-8")
-                logger.info(f"✅ Built: {output_path}")
-                processed_count += 1
+                try:
+                    if page.render_key in cached_bodies:
+                        with profiler.phase("cache", str(page.source)):
+                            fm, html_body = render_cache.html(page.render_key)
+                        html_body, description, terms, body_saved, _ = _finish_body(
+                            page.source, page.title, fm.get("description"), html_body, profiler, search, minify,
+                            highlight=highlight, highlight_cache=highlight_cache
+                        )
+                    else:
+                        html_body, description, terms, body_saved, markdown_html, error = next(rendered_pages)
+                        if error is not None:
+                            raise error if isinstance(error, Exception) else Exception(error)
+                        if page.render_key is not None:
+                            fm, markdown_body = markdown_html
+                            render_cache.put_html(page.render_key, markdown_body, fm)
+                    
+                    # Extract page information
+                    title = page.title
+                    
+                    logger.debug("Page title: %s", title)
+                    logger.debug("Output path: %s", output_path)
+                    key = str(page.source)
+                    
+                    with profiler.phase("render", key):
+                        # Generate navigation HTML for this specific page
+                        if navigation_error is not None:
+                            raise navigation_error
+                        navigation_html = navigation.render(page.url_path)
+                        if minify:
+                            if navigation_html not in minified_navigation:
+                                minified = minify_html(navigation_html)
+                                minified_navigation[navigation_html] = (
+                                    minified,
+                                    len(navigation_html.encode("utf-8")) - len(minified.encode("utf-8"))
+                                )
+                            navigation_html, navigation_saved = minified_navigation[navigation_html]
+                        
+                        # Generate HTML with navigation and description
+                        html = template.render(
+                            title=title,
+                            content=html_body,
+                            navigation=navigation_html,
+                            description=description
+                        )
+                    
+                    if minify:
+                        minified_count += 1
+                        bytes_saved += template_saved + navigation_saved + body_saved
+                        bytes_written += len(html.encode("utf-8"))
+                    
+                except Exception as e:
+                    logger.error("❌ Failed to process %s: %s", output_path, e, extra=page_status("failed"))
+                    error_count += 1
+                    failed_sources.append(page.rel_source)
+                    continue
                 
-            except Exception as e:
-                logger.error(f"❌ Failed to process {page_info['output_path']}: {e}")
-                error_count += 1
-                continue
+                # Write file; the page is finished once the write completes
+                finish_pages(writer.submit(output_path, html, (page, description, terms)))
+            
+            finish_pages(writer.close())
+        
+        if render_cache is not None:
+            logger.info("✅ Render cache: %d bodies reused, %d rendered",
+                        render_cache.hits, processed_count - skipped_count - render_cache.hits)
+        
+        if minified_count:
+            logger.info(
+                "✅ Minified %d pages: %d bytes saved (%.1f%%)",
+                minified_count, bytes_saved, 100 * bytes_saved / (bytes_written + bytes_saved)
+            )
+        
+        with profiler.phase("feeds"):
+            if shard_record is not None:
+                shard_record.write(output_dir, logger, error_count, failed_sources)
+            else:
+                sitemap.close(logger)
+                feed.write(logger)
+        
+        search_state = None
+        if search_index is not None:
+            with profiler.phase("search"):
+                if not search_index.fresh:
+                    # Drop pages that were deleted, lost their slug or were replaced
+                    for rel_source, entry in previous_pages.items():
+                        previous_entry = entry.get('search')
+                        current_entry = manifest_pages.get(rel_source, {}).get('search')
+                        if previous_entry and (current_entry or {}).get('doc') != previous_entry['doc']:
+                            search_index.remove(previous_entry)
+                search_state = search_index.write(logger)
+        
+        manifest = None
+        if incremental:
+            # Pages that failed to build are not recorded so the next build retries them
+            manifest = save_build_manifest(output_dir, {
+                'template': template_hash,
+                'config': config_hash,
+                'navigation': navigation_hash,
+                'search': search_state,
+                'pages': manifest_pages
+            }, logger)
+            logger.info(f"Reused {skipped_count} unchanged pages from the previous build")
+        
+        if precompress:
+            with profiler.phase("compress"):
+                precompress_outputs(output_dir, logger, previous_dir=previous_dir)
+        
+        if warm is not None:
+            warm.finish(
+                manifest, markdown_files, pages_info, (template_key, compiled_template),
+                (navigation_hash, navigation) if navigation_error is None else None
+            )
         
         # Log final summary
         if error_count > 0:
@@ -174,4 +824,6 @@ def build_site(logger, content_dir, output_dir, template_file):
             
     except Exception as e:
         logger.error(f"Build failed: {e}")
+        if warm is not None:
+            warm.reset()
         return (0, 1)  # 0 successful, 1 error (build failed) 
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+HTML minification for rendered pages.
+
+The minifier only ever removes whitespace and comments, in the places where
+browsers would ignore them anyway:
+
+- <pre>, <code>, <textarea>, <script> and <style> elements are copied
+  untouched, apart from whitespace inside their opening tag
+- comments are removed, except conditional comments (<!--[if ...]>)
+- whitespace inside tags collapses to a single space, outside quoted
+  attribute values
+- runs of whitespace in text collapse to a single space, and whitespace
+  next to block-level tags (div, p, li, ...) is dropped
+- whitespace between the tags of <head> is dropped
+
+Whitespace between inline elements (<a>, <span>, ...) is kept as a single
+space, so text never runs together. Only ASCII whitespace is touched; a
+non-breaking space is content. Block-level tags are recognized in lower
+case, as the markdown renderer and the templates write them; whitespace
+around upper-case tags is merely collapsed.
+
+Each rule is a single regular expression substitution over the stretches
+between raw elements, so the work is done by the regex engine rather than
+by a Python loop over tokens.
+"""
+
+import re
+
+# Elements whose contents are copied verbatim
+RAW_TAGS = ("pre", "code", "textarea", "script", "style")
+
+# Elements that start a new line box; whitespace next to them is not rendered
+BLOCK_TAGS = (
+    "!doctype", "!DOCTYPE", "html", "head", "body", "title", "noscript",
+    "address", "article", "aside", "blockquote", "details", "dialog", "dd",
+    "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "li",
+    "main", "nav", "ol", "p", "section", "summary", "table",
+    "caption", "colgroup", "col", "thead", "tbody", "tfoot", "tr", "td",
+    "th", "ul", "br",
+)
+
+SPACE = r"[ \t\n\r\f]"
+BLOCK_TAG = r"</?(?:" + "|".join(BLOCK_TAGS) + r")(?=[ />])[^>]*>"
+
+RAW_PATTERN = re.compile(
+    r"(<(" + "|".join(RAW_TAGS) + r")(?=[\s/>])[^>]*>).*?</\2" + SPACE + r"*>",
+    re.IGNORECASE | re.DOTALL,
+)
+HEAD_PATTERN = re.compile(r"<head(?=[\s>])[^>]*>.*?</head" + SPACE + r"*>", re.IGNORECASE | re.DOTALL)
+COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+# Patterns start with a rare character where possible: the regex engine
+# scans for a literal first character much faster than for a set that
+# includes the space, which occurs every few characters of text.
+LINE_SPACE_PATTERN = re.compile(r"[\t\n\r\f]" + SPACE + r"*")
+SPACES_PATTERN = re.compile(r"  +")
+# Only real tags: a '<' in text is followed by a space or digit, not a name
+TAG_END_PATTERN = re.compile(r"(<[a-zA-Z/!][^<>]*) >")
+BEFORE_BLOCK_PATTERN = re.compile(r" (?=" + BLOCK_TAG + ")")
+AFTER_BLOCK_PATTERN = re.compile(r"(" + BLOCK_TAG + ") ")
+# Quoted attribute values whose whitespace has to be preserved
+QUOTED_SPACE_PATTERN = re.compile(
+    r"=" + SPACE + r"*(?:\"[^\"]*?(?:[\t\n\r\f]|  )[^\"]*\"|'[^']*?(?:[\t\n\r\f]|  )[^']*')"
+)
+# Tags holding whitespace other than single spaces
+LOOSE_TAG_PATTERN = re.compile(r"<[!/]?[a-zA-Z][^>]*?(?:[\t\n\r\f]|  | >)[^>]*>")
+TAG_SPACE_PATTERN = re.compile(r"(\"[^\"]*\"|'[^']*')|" + SPACE + r"+")
+# Whitespace runs in text, that is followed by the next tag before any '>'
+TEXT_SPACE_PATTERN = re.compile(r"(?: {2,}| *[\t\n\r\f]" + SPACE + r"*)(?=[^<>]*(?:<|\Z))")
+
+
+def _collapse_tag(tag):
+    """Collapse whitespace inside a tag, leaving quoted attribute values alone."""
+    tag = TAG_SPACE_PATTERN.sub(lambda m: m.group(1) or " ", tag)
+    if tag.endswith(" >"):
+        tag = tag[:-2] + ">"
+    return tag
+
+
+def _minify_text(html):
+    """Minify a stretch of HTML that holds no raw elements."""
+    html = COMMENT_PATTERN.sub("", html)
+    if QUOTED_SPACE_PATTERN.search(html) is None:
+        # Whitespace runs anywhere, in text or tags, can simply collapse
+        html = LINE_SPACE_PATTERN.sub(" ", html)
+        html = SPACES_PATTERN.sub(" ", html)
+        html = TAG_END_PATTERN.sub(r"\1>", html)
+    else:
+        html = LOOSE_TAG_PATTERN.sub(lambda m: _collapse_tag(m.group()), html)
+        html = TEXT_SPACE_PATTERN.sub(" ", html)
+    html = BEFORE_BLOCK_PATTERN.sub("", html)
+    return AFTER_BLOCK_PATTERN.sub(r"\1", html)
+
+
+def _minify_range(html, start, end, head_start, head_end):
+    """Minify html[start:end], treating the part inside <head> separately."""
+    cuts = sorted({start, end, *(cut for cut in (head_start, head_end) if start < cut < end)})
+    parts = []
+    for part_start, part_end in zip(cuts, cuts[1:]):
+        text = _minify_text(html[part_start:part_end])
+        if head_start <= part_start and part_end <= head_end:
+            # Nothing between the tags of <head> is rendered
+            text = text.replace("> <", "><").strip(" ")
+        parts.append(text)
+    return "".join(parts)
+
+
+def minify_html(html):
+    """Minify an HTML document or fragment without changing how it renders.
+
+    Fragments can be minified separately and joined: at most a single space
+    is left at either end, so text on both sides of a seam never runs
+    together.
+
+    Args:
+        html: Page HTML, or a fragment of it that does not split an element
+
+    Returns:
+        str: The minified HTML
+    """
+    head = HEAD_PATTERN.search(html)
+    head_start, head_end = head.span() if head else (0, 0)
+    out = []
+    position = 0
+    previous = None
+    for match in RAW_PATTERN.finditer(html):
+        name = match.group(2).lower()
+        text = _minify_range(html, position, match.start(), head_start, head_end)
+        if previous == "pre":
+            text = text.lstrip(" ")
+        if name == "pre":
+            text = text.rstrip(" ")
+        out.append(text)
+        opening = match.group(1)
+        out.append(_collapse_tag(opening))
+        out.append(html[match.start() + len(opening):match.end()])
+        position = match.end()
+        previous = name
+    text = _minify_range(html, position, len(html), head_start, head_end)
+    out.append(text.lstrip(" ") if previous == "pre" else text)
+    return "".join(out)
+
+
+def in_raw_element(html, text):
+    """Return whether text occurs inside a <pre>, <code>, ... element of html."""
+    return any(text in match.group() for match in RAW_PATTERN.finditer(html))
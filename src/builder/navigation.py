@@ -29,36 +29,60 @@ def format_display_name(name):
     """Convert underscores to spaces and capitalize each word."""
     return name.replace('_', ' ').title()
 
-def generate_navigation_html(base_pages, current_url):
-    """Generate HTML for the navigation."""
-    base_pages.sort(key=lambda x: x['title'])
-    html = '<nav class="site-navigation">\n'
-
-    html += '<div class="nav-logo"><a href="/">Jgrove</a></div>\n'
-
-    html += '<div class="nav-links">'
+class Navigation:
+    """Navigation markup rendered once per build.
     
-    # Add direct links for base pages first
-    if base_pages:
-        for page in base_pages:
-            is_current = page['url'] == current_url
-            current_class = ' class="current"' if is_current else ''
-            display_title = format_display_name(page["title"])
-            html += f'  <a href="{page["url"]}"{current_class}>{display_title}</a>\n'
+    Link fragments are rendered up front in both their plain and current
+    forms, so rendering the navigation for a page only swaps the fragments
+    belonging to that page's URL.
+    """
     
-        html += f'  <div class="nav-folder">\n'
-        html += f'    <span class="nav-folder-title"></span>\n'
-        html += f'    <div class="nav-folder-dropdown">\n'
-        for page in base_pages:
-            is_current = page['url'] == current_url
-            current_class = ' class="current"' if is_current else ''
-            display_title = format_display_name(page["title"])
-            html += f'      <a href="{page["url"]}"{current_class}>{display_title}</a>\n'
-            
-        html += f'    </div>\n'
-        html += f'  </div>\n'
+    __slots__ = ("_parts", "_current", "_plain")
     
-    html += '</div>\n'
-    html += '</nav>\n'
+    def __init__(self, base_pages):
+        pages = sorted(base_pages, key=lambda x: x['title'])
+        parts = ['<nav class="site-navigation">\n'
+                 '<div class="nav-logo"><a href="/">Jgrove</a></div>\n'
+                 '<div class="nav-links">']
+        # Maps a URL to (index, current fragment) pairs for every link to it
+        current = {}
+        links = [(page['url'], format_display_name(page['title'])) for page in pages]
+        
+        if links:
+            for url, display_title in links:
+                current.setdefault(url, []).append(
+                    (len(parts), f'  <a href="{url}" class="current">{display_title}</a>\n'))
+                parts.append(f'  <a href="{url}">{display_title}</a>\n')
+            parts.append('  <div class="nav-folder">\n'
+                         '    <span class="nav-folder-title"></span>\n'
+                         '    <div class="nav-folder-dropdown">\n')
+            for url, display_title in links:
+                current[url].append(
+                    (len(parts), f'      <a href="{url}" class="current">{display_title}</a>\n'))
+                parts.append(f'      <a href="{url}">{display_title}</a>\n')
+            parts.append('    </div>\n'
+                         '  </div>\n')
+        
+        parts.append('</div>\n'
+                     '</nav>\n')
+        self._parts = parts
+        self._current = current
+        self._plain = "".join(parts)
     
-    return html 
\ No newline at end of file
+    def render(self, current_url):
+        """Return the navigation HTML with links to current_url marked current."""
+        fragments = self._current.get(current_url)
+        if not fragments:
+            return self._plain
+        parts = self._parts.copy()
+        for index, fragment in fragments:
+            parts[index] = fragment
+        return "".join(parts)
+
+def build_navigation(base_pages):
+    """Pre-render the navigation for base_pages once per build."""
+    return Navigation(base_pages)
+
+def generate_navigation_html(base_pages, current_url):
+    """Generate HTML for the navigation."""
+    return build_navigation(base_pages).render(current_url)
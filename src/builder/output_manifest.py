@@ -0,0 +1,119 @@
+"""
+Output manifest and deploy delta for the static site generator.
+
+Before a staged build is swapped into place, every file of the site is
+listed in an output manifest with its size, modification time and content
+hash, and compared with the manifest of the live output. Files whose bytes
+did not change are replaced by the live file itself, so they keep their
+modification time (and inode) however they were produced. The differences
+are written to a deploy delta of added, modified and removed paths, which
+rsync (--files-from) and CDN purges can use instead of the whole tree.
+
+Both are build state, kept outside the published tree (see
+src.builder.staging.build_state_dir). Hidden files in the site, such as
+temporary files, are left out of both.
+"""
+
+import os
+import json
+from pathlib import Path
+
+from src.builder.cache import hash_file
+from src.builder.staging import build_state_dir, write_build_state
+from src.config.default import OUTPUT_MANIFEST_FILE, DEPLOY_DELTA_FILE
+
+
+def discover_outputs(output_dir):
+    """Return the relative POSIX paths of every non-hidden output file, sorted."""
+    files = []
+    for root, dirs, names in os.walk(output_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            if not name.startswith("."):
+                files.append((Path(root) / name).relative_to(output_dir).as_posix())
+    return sorted(files)
+
+
+def load_output_manifest(output_dir):
+    """Load the output manifest of a build, or an empty one."""
+    try:
+        return json.loads((build_state_dir(output_dir) / OUTPUT_MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_recorded(stat, entry):
+    """Check whether a file is still the one an output manifest entry describes."""
+    return entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+
+def _keep_previous(path, previous_path, previous_entry):
+    """Replace path with the identical file of the previous build.
+
+    The previous file is hardlinked into place; where that is not possible
+    the new file is given the previous modification time instead.
+
+    Returns:
+        os.stat_result: The stat of the file now at path
+    """
+    try:
+        previous_stat = previous_path.stat()
+    except FileNotFoundError:
+        return path.stat()
+    if not _is_recorded(previous_stat, previous_entry):
+        return path.stat()
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        os.link(previous_path, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        os.utime(path, ns=(previous_stat.st_atime_ns, previous_stat.st_mtime_ns))
+    return path.stat()
+
+
+def write_output_manifest(staging_dir, output_dir, logger):
+    """Write the output manifest and deploy delta of a staged build.
+
+    Args:
+        staging_dir: Directory holding the new build
+        output_dir: Directory holding the live build it replaces
+
+    Returns:
+        dict: The deploy delta, lists of 'added', 'modified' and 'removed' paths
+    """
+    staging_dir = Path(staging_dir)
+    output_dir = Path(output_dir)
+    previous = load_output_manifest(output_dir)
+
+    manifest = {}
+    delta = {'added': [], 'modified': [], 'removed': []}
+    unchanged = 0
+    for rel_path in discover_outputs(staging_dir):
+        path = staging_dir / rel_path
+        stat = path.stat()
+        previous_entry = previous.get(rel_path)
+        if _is_recorded(stat, previous_entry):
+            # Hardlinked from the live output by an incremental build
+            content_hash = previous_entry['hash']
+        else:
+            content_hash = hash_file(path)
+        if previous_entry is None:
+            delta['added'].append(rel_path)
+        elif previous_entry['hash'] != content_hash:
+            delta['modified'].append(rel_path)
+        else:
+            if not _is_recorded(stat, previous_entry):
+                stat = _keep_previous(path, output_dir / rel_path, previous_entry)
+            unchanged += 1
+        manifest[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}
+    delta['removed'] = sorted(previous.keys() - manifest.keys())
+
+    write_build_state(staging_dir, OUTPUT_MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True))
+    write_build_state(staging_dir, DEPLOY_DELTA_FILE, json.dumps(delta, indent=2))
+    logger.info(
+        "✅ Output: %d files, %d added, %d modified, %d removed, %d unchanged",
+        len(manifest), len(delta['added']), len(delta['modified']), len(delta['removed']), unchanged
+    )
+    return delta
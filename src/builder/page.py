@@ -0,0 +1,62 @@
+"""
+Per-page build records for the static site generator.
+"""
+
+
+class PageRecord:
+    """Compact metadata kept for every page between the two build passes.
+
+    Only what navigation, incremental builds and the final write need is
+    kept; frontmatter and rendered bodies are never stored, so the memory
+    held across a build grows with the number of pages rather than with the
+    size of their content. Fields can also be read with mapping syntax
+    (record['title']) by helpers that accept plain page dicts.
+    """
+
+    __slots__ = (
+        "title",
+        "url_path",
+        "output_path",
+        "source",
+        "rel_source",
+        "rel_output",
+        "source_hash",
+        "description",
+        "cached",
+        "render",
+        "search",
+        "date",
+        "render_key",
+    )
+
+    def __init__(self, title, url_path, output_path, source, source_hash=None,
+                 description=None, cached=False, search=None, date=None, render_key=None,
+                 rel_source=None, rel_output=None):
+        self.title = title
+        self.url_path = url_path
+        self.output_path = output_path
+        self.source = source
+        # Source and output paths as recorded in the build manifest, relative
+        # to the content and output directories
+        self.rel_source = rel_source
+        self.rel_output = rel_output
+        self.source_hash = source_hash
+        # Frontmatter description; not known for cached pages until they are re-read
+        self.description = description
+        self.cached = cached
+        self.render = True
+        # Search index entry ({'doc': id, 'shards': [...]}) from the build manifest
+        self.search = search
+        # Frontmatter date as an RFC 3339 timestamp, for the sitemap and feed
+        self.date = date
+        # Render cache key of the source contents, when a render cache is used
+        self.render_key = render_key
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __repr__(self):
+        return f"PageRecord({self.url_path!r}, {str(self.source)!r})"
@@ -0,0 +1,221 @@
+"""
+Persistent render cache for the static site generator.
+
+Parsing frontmatter and converting markdown is most of the work of a build.
+The render cache keeps the result of both for every source file, its
+frontmatter and HTML body, in an SQLite database outside the output
+directory. Entries are keyed by a hash of the file contents together with
+everything else that affects parsing (MARKDOWN_EXTENSIONS, the markdown
+backend and its version, and the PyYAML version), so unlike the build
+manifest the cache survives clearing dist/ and switching branches: a file
+whose exact contents were rendered before is never parsed again.
+
+Only the build's main process reads and writes the database. Changes are
+committed after every chunk of MAX_RENDER_CHUNK_SIZE writes, so the write
+lock is only held briefly and builds, shards and the daemon can share the
+cache. When the cache is closed the least recently used entries are evicted
+until it fits its size limit.
+"""
+
+import json
+import time
+import pickle
+import sqlite3
+from pathlib import Path
+
+from src.builder.cache import hash_text
+from src.config.default import MAX_RENDER_CHUNK_SIZE, RENDER_CACHE_FILE, RENDER_CACHE_MAX_BYTES
+from src.config.markdown import MARKDOWN_EXTENSIONS
+from src.parser.backends import select_backend
+
+RENDER_CACHE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    frontmatter BLOB NOT NULL,
+    html TEXT,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+
+
+class RenderCache:
+    """Parsed frontmatter and HTML bodies of source files, kept across builds."""
+
+    def __init__(self, logger, path=RENDER_CACHE_FILE, max_bytes=RENDER_CACHE_MAX_BYTES):
+        """Open the cache database, creating it when missing or unusable.
+
+        Args:
+            logger: Logger for cache maintenance messages
+            path: SQLite database file
+            max_bytes: Size of stored entries above which the least recently
+                used ones are evicted when the cache is closed
+        """
+        self.logger = logger
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.uncommitted = 0
+        import yaml
+        self.fingerprint = hash_text(json.dumps(
+            [MARKDOWN_EXTENSIONS, select_backend().identity(), yaml.__version__], default=str
+        ))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.connection = self._open()
+        except sqlite3.DatabaseError as e:
+            logger.warning("Discarding unreadable render cache %s: %s", self.path, e)
+            self.path.unlink(missing_ok=True)
+            self.connection = self._open()
+
+    def _open(self):
+        """Connect to the database and bring its schema up to date."""
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != RENDER_CACHE_VERSION:
+                connection.executescript("DROP TABLE IF EXISTS entries; PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {RENDER_CACHE_VERSION}")
+                connection.commit()
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def _wrote(self):
+        """Commit once a chunk of writes is pending, releasing the write lock."""
+        self.uncommitted += 1
+        if self.uncommitted >= MAX_RENDER_CHUNK_SIZE:
+            self.commit()
+
+    def commit(self):
+        """Commit the pending writes."""
+        self.connection.commit()
+        self.uncommitted = 0
+
+    def key(self, source_hash):
+        """Return the cache key of a source file from the hash of its contents."""
+        return hash_text(self.fingerprint + source_hash)
+
+    def frontmatter(self, key):
+        """Return the cached frontmatter of a source file, or None."""
+        row = self.connection.execute("SELECT frontmatter FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        self._wrote()
+        return pickle.loads(row[0])
+
+    def has_html(self, key):
+        """Return whether the HTML body of a source file is cached."""
+        row = self.connection.execute(
+            "SELECT 1 FROM entries WHERE key = ? AND html IS NOT NULL", (key,)
+        ).fetchone()
+        return row is not None
+
+    def html(self, key):
+        """Return the cached (frontmatter, html) of a source file.
+
+        Returns:
+            tuple: (frontmatter, html), or None when the body is not cached
+        """
+        row = self.connection.execute(
+            "SELECT frontmatter, html FROM entries WHERE key = ? AND html IS NOT NULL", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        self._wrote()
+        return pickle.loads(row[0]), row[1]
+
+    def put_frontmatter(self, key, frontmatter):
+        """Store the parsed frontmatter of a source file."""
+        data = pickle.dumps(frontmatter, protocol=pickle.HIGHEST_PROTOCOL)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO entries (key, frontmatter, html, size, used) VALUES (?, ?, NULL, ?, ?)",
+            (key, data, len(data), time.time())
+        )
+        self._wrote()
+
+    def put_html(self, key, html, frontmatter=None):
+        """Store the HTML body of a source file.
+
+        Args:
+            key: Cache key of the source file
+            html: Body as converted from markdown
+            frontmatter: Parsed frontmatter, stored with the body; may be None
+                when the frontmatter is already cached
+
+        Raises:
+            sqlite3.IntegrityError: If frontmatter is None and not cached
+        """
+        data = None if frontmatter is None else pickle.dumps(frontmatter, protocol=pickle.HIGHEST_PROTOCOL)
+        # WHERE true keeps SQLite from reading ON CONFLICT as part of the SELECT
+        self.connection.execute(
+            """
+            INSERT INTO entries (key, frontmatter, html, size, used)
+            SELECT ?1, frontmatter, ?3, length(frontmatter) + ?4, ?5 FROM (
+                SELECT COALESCE(?2, (SELECT frontmatter FROM entries WHERE key = ?1)) AS frontmatter
+            ) WHERE true
+            ON CONFLICT (key) DO UPDATE SET
+                frontmatter = excluded.frontmatter, html = excluded.html, size = excluded.size, used = excluded.used
+            """,
+            (key, data, html, len(html.encode("utf-8")), time.time())
+        )
+        self._wrote()
+
+    def stats(self):
+        """Return the number of entries, their size and the size of the database file."""
+        entries, stored = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            'entries': entries,
+            'bytes': stored,
+            'max_bytes': self.max_bytes,
+            'file_bytes': self.path.stat().st_size,
+        }
+
+    def clear(self):
+        """Remove every entry and shrink the database file."""
+        self.connection.execute("DELETE FROM entries")
+        self.connection.commit()
+        self.connection.execute("VACUUM")
+
+    def evict(self):
+        """Delete the least recently used entries beyond max_bytes.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        cursor = self.connection.execute(
+            """
+            DELETE FROM entries WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY used DESC, key) AS total FROM entries
+                ) WHERE total > ?
+            )
+            """,
+            (self.max_bytes,)
+        )
+        if cursor.rowcount:
+            self.connection.commit()
+            self.connection.execute("PRAGMA incremental_vacuum")
+        return cursor.rowcount
+
+    def close(self):
+        """Commit this build's entries, evict old ones and close the database."""
+        try:
+            self.commit()
+            evicted = self.evict()
+            if evicted:
+                self.logger.info("Evicted %d entries from the render cache", evicted)
+            self.connection.commit()
+        finally:
+            self.connection.close()
@@ -0,0 +1,215 @@
+"""
+Build-time search index for the static site generator.
+
+Pages are tokenized while they are rendered and collected into an inverted
+index that is written to the output directory as sharded JSON files:
+
+    search/index.json          Index metadata (shard counts, tokenizer settings)
+    search/terms/<n>.json      {term: [doc gap, term frequency, ...]} for the
+                               terms whose FNV-1a hash modulo the shard count is n
+    search/docs/<n>.json       {doc id: [url, title]} for doc ids n * size onwards
+
+Postings are sorted by document id and stored as gaps from the previous id,
+so a browser looking up a query only downloads the term shards of the query
+terms and the document shards of the matches (see templates/search.js).
+
+Every page keeps its integer document id between incremental builds, and
+the build manifest records which term shards each page appears in. Changing
+one page therefore only rewrites the shards its old and new terms live in.
+"""
+
+import re
+import json
+import shutil
+from html import unescape
+from pathlib import Path
+from collections import Counter, defaultdict
+
+from src.builder.staging import write_output
+from src.config.default import (
+    SEARCH_DIR,
+    SEARCH_INDEX_SHARDS,
+    SEARCH_DOC_SHARD_SIZE,
+    SEARCH_MIN_TOKEN_LENGTH,
+    SEARCH_MAX_TOKEN_LENGTH,
+)
+
+SEARCH_INDEX_VERSION = 1
+
+# Letters and digits; the client tokenizes queries with the same rule
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+
+def tokenize(text):
+    """Split text into lowercase search terms."""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if SEARCH_MIN_TOKEN_LENGTH <= len(token) <= SEARCH_MAX_TOKEN_LENGTH
+    ]
+
+
+def page_terms(title, html_body):
+    """Return the term frequencies of a page's title and rendered body."""
+    text = unescape(TAG_PATTERN.sub(" ", html_body))
+    return dict(Counter(tokenize(str(title))) + Counter(tokenize(text)))
+
+
+def term_shard(term, shards):
+    """Return the shard a term is stored in, using 32-bit FNV-1a over UTF-8."""
+    value = FNV_OFFSET
+    for byte in term.encode("utf-8"):
+        value = ((value ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return value % shards
+
+
+def encode_postings(postings):
+    """Flatten (doc, tf) pairs into [gap, tf, ...] sorted by document id."""
+    encoded = []
+    previous = 0
+    for doc, tf in sorted(postings):
+        encoded.append(doc - previous)
+        encoded.append(tf)
+        previous = doc
+    return encoded
+
+
+def decode_postings(encoded):
+    """Expand [gap, tf, ...] back into a list of (doc, tf) pairs."""
+    postings = []
+    doc = 0
+    for i in range(0, len(encoded), 2):
+        doc += encoded[i]
+        postings.append((doc, encoded[i + 1]))
+    return postings
+
+
+class SearchIndexBuilder:
+    """Collect index changes during a build and write the affected shards.
+
+    Changes are buffered per shard and applied in write(), which reads
+    each affected shard once, drops the postings of replaced or removed
+    documents and merges in the new ones. The work done is proportional
+    to the changed pages and the shards they touch, not to the site.
+    """
+
+    def __init__(self, output_dir, previous=None, shards=SEARCH_INDEX_SHARDS):
+        """Start from previous, the 'search' section of the previous build manifest.
+
+        When previous is None, or was written with another shard count, the
+        index is rebuilt from scratch and every page has to be added.
+        """
+        self.search_dir = Path(output_dir) / SEARCH_DIR
+        self.shards = shards
+        self.fresh = previous is None or previous.get('shards') != shards
+        self.next_doc = 0 if self.fresh else previous.get('next_doc', 0)
+        self.documents = 0 if self.fresh else previous.get('documents', 0)
+        self._removed = defaultdict(set)
+        self._added = defaultdict(lambda: defaultdict(list))
+        self._docs = defaultdict(dict)
+
+    def _drop(self, entry):
+        """Schedule the postings and document of a previously indexed page for removal."""
+        doc = entry['doc']
+        for shard in entry['shards']:
+            self._removed[shard].add(doc)
+        self._docs[doc // SEARCH_DOC_SHARD_SIZE][doc] = None
+
+    def add(self, url_path, title, terms, previous_entry=None):
+        """Index a rendered page, replacing its previous version if any.
+
+        Returns:
+            dict: The page's manifest entry, {'doc': id, 'shards': [...]}
+        """
+        if previous_entry is not None and not self.fresh:
+            doc = previous_entry['doc']
+            self._drop(previous_entry)
+        else:
+            doc = self.next_doc
+            self.next_doc += 1
+            self.documents += 1
+        shards = set()
+        for term, tf in terms.items():
+            shard = term_shard(term, self.shards)
+            self._added[shard][term].append((doc, tf))
+            shards.add(shard)
+        self._docs[doc // SEARCH_DOC_SHARD_SIZE][doc] = [url_path, str(title)]
+        return {'doc': doc, 'shards': sorted(shards)}
+
+    def remove(self, entry):
+        """Remove a page that no longer exists from the index."""
+        if not self.fresh:
+            self._drop(entry)
+            self.documents -= 1
+
+    def _load(self, path):
+        """Load a shard file, or an empty shard when it does not exist yet."""
+        if self.fresh or not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save(self, path, data):
+        """Write a shard, deleting it instead when it became empty."""
+        if data:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_output(path, json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")))
+        elif path.exists():
+            path.unlink()
+
+    def _write_term_shard(self, shard):
+        """Apply the buffered changes to one term shard."""
+        path = self.search_dir / "terms" / f"{shard}.json"
+        removed = self._removed.get(shard, ())
+        data = {}
+        for term, encoded in self._load(path).items():
+            postings = decode_postings(encoded)
+            if removed:
+                postings = [posting for posting in postings if posting[0] not in removed]
+            if postings:
+                data[term] = postings
+        for term, postings in self._added.get(shard, {}).items():
+            data.setdefault(term, []).extend(postings)
+        self._save(path, {term: encode_postings(postings) for term, postings in data.items()})
+
+    def _write_doc_shard(self, shard, updates):
+        """Apply the buffered document changes to one document shard."""
+        path = self.search_dir / "docs" / f"{shard}.json"
+        data = self._load(path)
+        for doc, value in updates.items():
+            if value is None:
+                data.pop(str(doc), None)
+            else:
+                data[str(doc)] = value
+        self._save(path, data)
+
+    def write(self, logger):
+        """Write every shard affected by this build and the index metadata.
+
+        Returns:
+            dict: The 'search' section of the build manifest for the next build
+        """
+        if self.fresh and self.search_dir.exists():
+            shutil.rmtree(self.search_dir)
+        affected = set(self._removed) | set(self._added)
+        for shard in sorted(affected):
+            self._write_term_shard(shard)
+        for shard, updates in sorted(self._docs.items()):
+            self._write_doc_shard(shard, updates)
+
+        self._save(self.search_dir / "index.json", {
+            'version': SEARCH_INDEX_VERSION,
+            'shards': self.shards,
+            'doc_shard_size': SEARCH_DOC_SHARD_SIZE,
+            'hash': "fnv1a-32",
+            'min_token_length': SEARCH_MIN_TOKEN_LENGTH,
+            'max_token_length': SEARCH_MAX_TOKEN_LENGTH,
+            'documents': self.documents,
+        })
+        logger.info(
+            "✅ Search index: %d documents, %d of %d term shards written",
+            self.documents, len(affected), self.shards
+        )
+        return {'shards': self.shards, 'next_doc': self.next_doc, 'documents': self.documents}
@@ -0,0 +1,286 @@
+"""
+Sharded builds for the static site generator.
+
+A large site can be built by N machines at once. Every shard build reads
+the frontmatter of all pages, so each shard renders the same navigation,
+but only renders and writes the pages whose source path hashes to its
+shard. Instead of a sitemap, feed and search index, a shard build writes a
+shard record listing the position, URL, title, date, summary and search
+terms of its pages, the sources of the pages that failed to build, and a
+fingerprint of the contents of every source file, so shards built from
+different checkouts are never merged.
+
+The merge step combines the outputs of a complete set of shards into the
+output directory: page files are hardlinked from the shard that wrote
+them, files every shard writes (assets, manifest.json) must be identical,
+and the sitemap, feed and search index are written from the shard records
+in page order. The result is the same site a single build produces, so
+nothing is merged while any shard left out a page that failed.
+"""
+
+import os
+import json
+import shutil
+import filecmp
+from pathlib import Path
+
+from src.builder.cache import hash_text
+from src.builder.compress import precompress_outputs
+from src.builder.feeds import SitemapWriter, AtomFeedWriter
+from src.builder.output_manifest import discover_outputs, write_output_manifest
+from src.builder.search import SearchIndexBuilder
+from src.builder.staging import (
+    build_state_dir,
+    discard_staging,
+    prepare_staging,
+    remove_output,
+    swap_into_place,
+    write_build_state,
+)
+from src.config.default import SHARD_RECORD_FILE, SHARDS_SUFFIX, SITE_URL, SITE_TITLE, SITE_AUTHOR
+
+SHARD_RECORD_VERSION = 3
+
+# Shard record fields that every shard of one build must agree on
+BUILD_FIELDS = ("template", "config", "navigation", "search", "precompress", "content")
+
+
+def parse_shard(text):
+    """Parse "i/N" into (i, N), with shards numbered from 1.
+
+    Raises:
+        ValueError: If text is not of that form or i is not in 1..N
+    """
+    index, separator, count = text.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit():
+        raise ValueError(f"expected i/N, got {text!r}")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {index} is not between 1 and {count}")
+    return index, count
+
+
+def shard_of(rel_source, count):
+    """Return the shard, from 1 to count, that builds a source file.
+
+    Only the path relative to the content directory is hashed, so a page
+    stays in its shard when it is edited.
+    """
+    return int(hash_text(rel_source)[:16], 16) % count + 1
+
+
+def shards_path(output_dir):
+    """Return the directory holding the shard outputs of output_dir."""
+    output_dir = Path(output_dir)
+    return output_dir.with_name(f"{output_dir.name}{SHARDS_SUFFIX}")
+
+
+def shard_output_dir(output_dir, shard):
+    """Return the output directory of one shard of output_dir."""
+    index, count = shard
+    return shards_path(output_dir) / f"{index}-of-{count}"
+
+
+def discard_other_shard_sets(output_dir, count, logger):
+    """Remove the shard outputs of output_dir that were split into another number of shards.
+
+    Run when a shard build starts, so the merge never finds shards of an
+    earlier split next to those of this one.
+    """
+    shards_dir = shards_path(output_dir)
+    if not shards_dir.is_dir():
+        return
+    for path in sorted(shards_dir.iterdir()):
+        if path.name.startswith(".") or path.name.endswith(f"-of-{count}"):
+            continue
+        remove_output(path)
+        logger.info("Removed %s, a shard of another split", path)
+
+
+def discard_shard_record(output_dir):
+    """Remove the shard record of a previous build, so a failed rebuild cannot be merged."""
+    (build_state_dir(output_dir) / SHARD_RECORD_FILE).unlink(missing_ok=True)
+
+
+def load_shard_record(output_dir):
+    """Load the shard record of a shard build, or None."""
+    try:
+        record = json.loads((build_state_dir(output_dir) / SHARD_RECORD_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or record.get('version') != SHARD_RECORD_VERSION:
+        return None
+    return record
+
+
+class ShardRecord:
+    """Pages written by a shard build, for the merge step."""
+
+    def __init__(self, shard, template, config, navigation, search, precompress, content):
+        self.shard = shard
+        self.build = {
+            'template': template,
+            'config': config,
+            'navigation': navigation,
+            'search': search,
+            'precompress': precompress,
+            'content': content,
+        }
+        self.pages = []
+
+    def add(self, position, page, summary, terms):
+        """Record a written page at its position among all pages of the site."""
+        entry = {'position': position, 'url_path': page.url_path, 'title': str(page.title)}
+        if page.date is not None:
+            entry['date'] = page.date
+            entry['summary'] = summary
+        if terms is not None:
+            entry['terms'] = terms
+        self.pages.append(entry)
+
+    def write(self, output_dir, logger, error_count=0, failed=()):
+        """Write the shard record into the build state of the shard's output directory.
+
+        Args:
+            error_count: Number of errors of the shard build
+            failed: Sources of the pages that failed, relative to the content directory
+        """
+        record = {
+            'version': SHARD_RECORD_VERSION, 'shard': list(self.shard), **self.build, 'pages': self.pages,
+            'error_count': error_count, 'failed': sorted(failed),
+        }
+        write_build_state(output_dir, SHARD_RECORD_FILE, json.dumps(record, ensure_ascii=False))
+        logger.info("✅ Shard %d/%d: recorded %d pages", self.shard[0], self.shard[1], len(self.pages))
+
+
+def _check_shards(records, logger):
+    """Check that records are one complete set of shards of the same build.
+
+    Returns:
+        int: Number of problems found
+    """
+    count = records[0][1]['shard'][1]
+    indices = sorted(record['shard'][0] for _, record in records)
+    if indices != list(range(1, count + 1)) or any(record['shard'][1] != count for _, record in records):
+        logger.error("❌ Need shards 1 to %d exactly once, found %s",
+                     count, ", ".join(f"{i}/{n}" for i, n in sorted(record['shard'] for _, record in records)))
+        return 1
+    reference_dir, reference = records[0]
+    errors = 0
+    for shard_dir, record in records[1:]:
+        for field in BUILD_FIELDS:
+            if record.get(field) != reference.get(field):
+                logger.error("❌ %s was built with a different %s than %s", shard_dir, field, reference_dir)
+                errors += 1
+                break
+    return errors
+
+
+def _combine_outputs(shard_dirs, staging_dir, logger):
+    """Hardlink the files of every shard into staging_dir.
+
+    Files written by more than one shard must be identical.
+
+    Returns:
+        tuple: (files, conflicts) - Number of files combined and of files
+        that differ between shards
+    """
+    sources = {}
+    conflicts = 0
+    for shard_dir in shard_dirs:
+        for rel_path in discover_outputs(shard_dir):
+            source = shard_dir / rel_path
+            if rel_path in sources:
+                if not filecmp.cmp(sources[rel_path], source, shallow=False):
+                    logger.error("❌ %s differs between %s and %s", rel_path, sources[rel_path], source)
+                    conflicts += 1
+                continue
+            sources[rel_path] = source
+            target = staging_dir / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+    return len(sources), conflicts
+
+
+def merge_shards(logger, shard_dirs, output_dir):
+    """Merge the outputs of a complete set of shard builds into output_dir.
+
+    The merged site is staged and swapped into place like a normal build,
+    with an output manifest and deploy delta against the previous output.
+    Nothing is changed when a shard is missing or failed, when a shard left
+    out pages that failed to build, when shards were built with different
+    templates, options or pages, or when two shards disagree about a file
+    they both wrote.
+
+    Args:
+        shard_dirs: Output directories of the shard builds
+
+    Returns:
+        tuple: (page_count, error_count) - Number of pages in the merged
+        site and errors
+    """
+    records = []
+    errors = 0
+    for shard_dir in sorted(Path(shard_dir) for shard_dir in shard_dirs):
+        record = load_shard_record(shard_dir)
+        if record is None:
+            logger.error("❌ %s has no shard record: its build failed or has not run", shard_dir)
+            errors += 1
+        else:
+            records.append((shard_dir, record))
+    if not records and not errors:
+        logger.error("No shard outputs to merge")
+        return (0, 1)
+    if errors:
+        return (0, errors)
+    for shard_dir, record in records:
+        if record['error_count']:
+            logger.error("❌ %s was built with %d errors, failed: %s",
+                         shard_dir, record['error_count'], ", ".join(record['failed']) or "unknown")
+            errors += record['error_count']
+    if errors:
+        return (0, errors)
+    errors = _check_shards(records, logger)
+    if errors:
+        return (0, errors)
+
+    build = records[0][1]
+    try:
+        staging_dir = prepare_staging(output_dir, logger)
+    except OSError as e:
+        logger.error(f"Failed to merge shards into {output_dir}: {e}")
+        return (0, 1)
+    try:
+        file_count, conflicts = _combine_outputs([shard_dir for shard_dir, _ in records], staging_dir, logger)
+        if conflicts:
+            discard_staging(staging_dir, logger)
+            return (0, conflicts)
+
+        pages = sorted((page for _, record in records for page in record['pages']), key=lambda page: page['position'])
+        sitemap = SitemapWriter(staging_dir, SITE_URL)
+        feed = AtomFeedWriter(staging_dir, SITE_URL, SITE_TITLE, SITE_AUTHOR)
+        search_index = SearchIndexBuilder(staging_dir) if build['search'] else None
+        for page in pages:
+            sitemap.add(page['url_path'], page.get('date'))
+            feed.add(page['url_path'], page['title'], page.get('date'), page.get('summary'))
+            if search_index is not None:
+                search_index.add(page['url_path'], page['title'], page['terms'])
+        sitemap.close(logger)
+        feed.write(logger)
+        if search_index is not None:
+            search_index.write(logger)
+        if build['precompress']:
+            precompress_outputs(
+                staging_dir, logger, previous_dir=output_dir if Path(output_dir).is_dir() else None)
+
+        write_output_manifest(staging_dir, output_dir, logger)
+        swap_into_place(staging_dir, output_dir, logger)
+    except OSError as e:
+        logger.error(f"Failed to merge shards into {output_dir}: {e}")
+        discard_staging(staging_dir, logger)
+        return (0, 1)
+    logger.info("✅ Merged %d shards into %s: %d pages, %d files", len(records), output_dir, len(pages), file_count)
+    return (len(pages), 0)
@@ -0,0 +1,324 @@
+"""
+Staged output directories for the static site generator.
+
+The output directory is a symlink to the current release, a directory in
+a hidden releases directory beside it (.dist.releases/ for dist/). Builds
+write into a new release, and once the build succeeds the symlink is
+replaced by one to the new release in a single rename. Anything serving
+the output directory therefore sees either the previous site or the new
+one, never a half-written or missing tree.
+
+The previous release is kept until the next successful build, so requests
+still reading from it can finish. Older releases, and those of failed or
+interrupted builds, are removed only once the output directory points at
+the new release. Builds of the same output directory swap and prune one at
+a time, under a lock in the releases directory, and never remove a release
+that another running build is still writing.
+
+Build state, such as the build and output manifests, is never written into
+the published tree. Each release keeps it in a hidden directory beside it
+(see build_state_dir), which .dist.build links to for the current release.
+"""
+
+import os
+import fcntl
+import shutil
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+RELEASES_SUFFIX = ".releases"
+STATE_SUFFIX = ".build"
+# Lock file in the releases directory held while swapping and pruning
+LOCK_FILE = ".lock"
+# Directories used by the rename-based swap of earlier versions
+LEGACY_STAGING_SUFFIX = ".staging"
+LEGACY_PREVIOUS_SUFFIX = ".previous"
+
+
+def releases_path(output_dir):
+    """Return the directory holding the releases of output_dir."""
+    output_dir = Path(output_dir)
+    return output_dir.with_name(f".{output_dir.name}{RELEASES_SUFFIX}")
+
+
+def staging_path(output_dir):
+    """Return a new release directory for a build of output_dir."""
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S.%f")
+    return releases_path(output_dir) / f"{stamp}-{os.getpid()}"
+
+
+def build_state_dir(site_dir):
+    """Return the directory holding the build state of a site directory.
+
+    It sits beside the release output_dir links to (.dist.releases/.<id>.build),
+    or beside site_dir itself when that is a plain directory (.dist.build).
+    """
+    site_dir = Path(os.path.realpath(site_dir))
+    return site_dir.with_name(f".{site_dir.name}{STATE_SUFFIX}")
+
+
+def write_build_state(site_dir, name, text):
+    """Write the build state file name of site_dir (see write_output)."""
+    state_dir = build_state_dir(site_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return write_output(state_dir / name, text)
+
+
+def _recover_legacy(output_dir, logger):
+    """Clean up the staging and previous directories of the rename-based swap.
+
+    A build interrupted between its two renames left the only copy of the
+    site in the previous directory, which is moved back rather than deleted.
+    """
+    output_dir = Path(output_dir)
+    legacy_staging = output_dir.with_name(f".{output_dir.name}{LEGACY_STAGING_SUFFIX}")
+    legacy_previous = output_dir.with_name(f".{output_dir.name}{LEGACY_PREVIOUS_SUFFIX}")
+    if legacy_previous.is_dir():
+        if os.path.lexists(output_dir):
+            shutil.rmtree(legacy_previous)
+        else:
+            os.rename(legacy_previous, output_dir)
+            logger.warning("Restored %s from %s", output_dir, legacy_previous)
+    if legacy_staging.is_dir():
+        shutil.rmtree(legacy_staging)
+
+
+def link_tree(source_dir, dest_dir):
+    """Recreate source_dir at dest_dir with every file hardlinked.
+
+    Files are copied instead when they cannot be linked, for example when
+    the two directories are on different filesystems.
+
+    Returns:
+        tuple: (linked, copied) - Number of files linked and copied
+    """
+    linked = 0
+    copied = 0
+    for root, _, files in os.walk(source_dir):
+        target_root = Path(dest_dir) / Path(root).relative_to(source_dir)
+        target_root.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            source = Path(root) / name
+            try:
+                os.link(source, target_root / name)
+                linked += 1
+            except OSError:
+                shutil.copy2(source, target_root / name)
+                copied += 1
+    return linked, copied
+
+
+def prepare_staging(output_dir, logger, reuse=False):
+    """Create an empty release directory, or one holding links to the current output.
+
+    With reuse set, every file of the current output is hardlinked into the
+    new release, so unchanged files are not written again. Files in the
+    release may therefore share their contents with the live site and must
+    be replaced (see write_output), never modified in place.
+
+    Returns:
+        Path: The new release directory
+    """
+    _recover_legacy(output_dir, logger)
+    staging_dir = staging_path(output_dir)
+    if reuse and Path(output_dir).is_dir():
+        linked, copied = link_tree(output_dir, staging_dir)
+        logger.info(f"Staged previous build in {staging_dir} ({linked} linked, {copied} copied)")
+    else:
+        staging_dir.mkdir(parents=True)
+        logger.info(f"Created release directory: {staging_dir}")
+    return staging_dir
+
+
+def _link_into_place(source, path):
+    """Replace path with a hardlink to source."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        os.link(source, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_output(path, text, previous=None):
+    """Write text to path by replacing the file rather than writing into it.
+
+    The file may be a hardlink shared with the previous build, which must
+    stay untouched until the release is published. A file that already
+    holds exactly text is left alone, so it keeps its modification time.
+    Otherwise, when previous, the same file in the previous build, holds
+    exactly text, it is hardlinked into place instead of written.
+
+    Returns:
+        bool: Whether the file was written
+    """
+    path = Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    if previous is not None:
+        try:
+            if Path(previous).stat().st_size == len(data) and Path(previous).read_bytes() == data:
+                _link_into_place(previous, path)
+                return False
+        except OSError:
+            pass
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+@contextmanager
+def open_output(path):
+    """Open path for streaming binary writes, replacing the file once closed.
+
+    Like write_output, but for files generated incrementally. The file is
+    only replaced when the block completes without an exception.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@contextmanager
+def _releases_lock(output_dir):
+    """Hold an exclusive lock on the releases directory of output_dir."""
+    releases_dir = releases_path(output_dir)
+    releases_dir.mkdir(parents=True, exist_ok=True)
+    with open(releases_dir / LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _is_running_build(name):
+    """Return whether release name was created by another process that is still running."""
+    pid = name.rpartition("-")[2]
+    if not pid.isdigit() or int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _prune_releases(output_dir, keep, logger):
+    """Remove every release of output_dir, and its state, other than those named in keep.
+
+    Releases of builds still running in other processes are kept as well.
+    """
+    removed = 0
+    for entry in releases_path(output_dir).iterdir():
+        name = entry.name
+        if name == LOCK_FILE:
+            continue
+        if name.startswith(".") and name.endswith(STATE_SUFFIX):
+            name = name[1:-len(STATE_SUFFIX)]
+        if name in keep or _is_running_build(name):
+            continue
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+        else:
+            entry.unlink(missing_ok=True)
+    if removed:
+        logger.info("Removed %d old release directories of %s", removed, output_dir)
+
+
+def _replace_symlink(path, target):
+    """Point the symlink path at target in a single rename."""
+    link = path.with_name(f".{path.name}.link")
+    link.unlink(missing_ok=True)
+    os.symlink(os.path.relpath(target, path.parent), link)
+    try:
+        os.replace(link, path)
+    except OSError:
+        link.unlink(missing_ok=True)
+        raise
+
+
+def swap_into_place(staging_dir, output_dir, logger):
+    """Publish the release in staging_dir as output_dir.
+
+    output_dir is replaced by a symlink to staging_dir with os.replace, so it
+    always exists. An output_dir that is still a real directory, from an
+    unstaged build or a version without releases, is first moved into the
+    releases directory with its state; only that first swap leaves a moment
+    without output_dir. The state link is flipped next, and the previous
+    release is kept and older ones are removed once output_dir is known to
+    point at staging_dir. Concurrent builds of output_dir swap one at a time.
+    """
+    output_dir = Path(output_dir)
+    staging_dir = Path(staging_dir)
+    with _releases_lock(output_dir):
+        _swap_into_place(staging_dir, output_dir, logger)
+
+
+def _swap_into_place(staging_dir, output_dir, logger):
+    """Publish staging_dir as output_dir while holding the releases lock."""
+    state_link = output_dir.with_name(f".{output_dir.name}{STATE_SUFFIX}")
+    previous = None
+    if output_dir.is_symlink():
+        previous = Path(os.path.realpath(output_dir))
+    elif output_dir.exists():
+        previous = staging_path(output_dir)
+        os.rename(output_dir, previous)
+        logger.info("Moved %s into %s", output_dir, previous)
+    if state_link.is_dir() and not state_link.is_symlink():
+        if previous is None:
+            shutil.rmtree(state_link)
+        else:
+            os.rename(state_link, build_state_dir(previous))
+
+    try:
+        _replace_symlink(output_dir, staging_dir)
+    except OSError:
+        if previous is not None and not os.path.lexists(output_dir):
+            # Put the moved output back so the site keeps being served
+            os.rename(previous, output_dir)
+        raise
+    logger.info(f"Swapped {staging_dir} into place as {output_dir}")
+
+    if os.path.realpath(output_dir) == os.path.realpath(staging_dir):
+        if build_state_dir(staging_dir).is_dir():
+            _replace_symlink(state_link, build_state_dir(staging_dir))
+        else:
+            state_link.unlink(missing_ok=True)
+        keep = {staging_dir.name}
+        if previous is not None:
+            keep.add(previous.name)
+        _prune_releases(output_dir, keep, logger)
+
+
+def discard_staging(staging_dir, logger):
+    """Remove the release directory of a failed build."""
+    shutil.rmtree(build_state_dir(staging_dir), ignore_errors=True)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    logger.warning(f"Build failed, kept previous output and removed {staging_dir}")
+
+
+def remove_output(output_dir):
+    """Remove output_dir, its build state and every release of it."""
+    output_dir = Path(output_dir)
+    for path in (output_dir, output_dir.with_name(f".{output_dir.name}{STATE_SUFFIX}")):
+        if path.is_symlink():
+            path.unlink()
+        elif path.exists():
+            shutil.rmtree(path)
+    shutil.rmtree(releases_path(output_dir), ignore_errors=True)
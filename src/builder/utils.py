@@ -5,6 +5,59 @@ Utility functions for the static site generator.
 import re
 from html import unescape
 
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SENTENCE_PATTERN = re.compile(r'^[^.!?]*[.!?]')
+# Characters that end every kind of character reference
+REFERENCE_END_PATTERN = re.compile(r'[\t\n\f ]')
+
+# Characters of HTML looked at first when generating a description; the
+# window doubles until it holds enough text
+DESCRIPTION_WINDOW = 1024
+
+
+def _plain_text(html_content):
+    """Strip tags and entities from HTML and collapse its whitespace."""
+    text_content = TAG_PATTERN.sub('', html_content)
+    text_content = unescape(text_content)  # Convert HTML entities
+    return WHITESPACE_PATTERN.sub(' ', text_content).strip()
+
+
+def _leading_text(html_content, max_length):
+    """Return the plain text of a page, or a prefix of it over max_length characters.
+
+    Only as much of the HTML as needed is converted. A window is cut before
+    the first '<' after its last '>', so no tag straddles the cut, and its
+    text is cut before the last '&' unless whitespace ends that reference,
+    so no entity does either. The text of the window is then a prefix of the
+    text of the whole page, and once it is longer than max_length it decides
+    the description on its own.
+
+    Args:
+        html_content: The HTML content of the page
+        max_length: Maximum length of description
+
+    Returns:
+        str: Plain text, complete or at least max_length + 1 characters long
+    """
+    end = max(DESCRIPTION_WINDOW, 4 * max_length)
+    # Truncation slices from the end for max_length < 3, which needs the whole text
+    while max_length >= 3 and end < len(html_content):
+        cut = html_content.find('<', html_content.rfind('>', 0, end) + 1, end)
+        if cut == -1:
+            cut = end
+        if cut:
+            text_content = TAG_PATTERN.sub('', html_content[:cut])
+            entity = text_content.rfind('&')
+            if entity != -1 and not REFERENCE_END_PATTERN.search(text_content, entity):
+                text_content = text_content[:entity]
+            text_content = WHITESPACE_PATTERN.sub(' ', unescape(text_content)).strip()
+            if len(text_content) > max_length:
+                return text_content
+        end *= 2
+    return _plain_text(html_content)
+
+
 def extract_description(frontmatter, html_content, max_length=160):
     """Extract or generate a meta description for a page.
     
@@ -22,20 +75,16 @@ def extract_description(frontmatter, html_content, max_length=160):
         if description and len(description) <= max_length:
             return description
     
-    # If no description in frontmatter, generate one from content
-    # Remove HTML tags and get plain text
-    text_content = re.sub(r'<[^>]+>', '', html_content)
-    text_content = unescape(text_content)  # Convert HTML entities
-    
-    # Clean up whitespace
-    text_content = re.sub(r'\s+', ' ', text_content).strip()
+    # If no description in frontmatter, generate one from the start of the
+    # content, as plain text with its whitespace cleaned up
+    text_content = _leading_text(html_content, max_length)
     
     # Take first sentence or first max_length characters
     if len(text_content) <= max_length:
         return text_content
     
     # Find the first sentence boundary
-    sentence_match = re.search(r'^[^.!?]*[.!?]', text_content)
+    sentence_match = SENTENCE_PATTERN.search(text_content)
     if sentence_match:
         sentence = sentence_match.group(0)
         if len(sentence) <= max_length:
@@ -0,0 +1,77 @@
+"""
+Build state kept in memory between the rebuilds of a long-running process.
+
+Watch mode rebuilds the site in place after every saved file. A WarmBuild
+handed to each of those builds keeps what the previous one worked out: the
+build manifest, the sorted source files and their hashes, the page records,
+the compiled template and the pre-rendered navigation. Told which files
+changed, the next build neither walks the content directory nor stats or
+hashes the other sources, and it re-renders only the changed pages unless
+the template, configuration or navigation changed.
+
+Everything is replaced only when a build finishes, so a build that fails
+as a whole leaves the state of the last good build, and a reset WarmBuild
+makes the next build start from the build manifest on disk.
+"""
+
+from pathlib import Path
+
+
+class WarmBuild:
+    """What one build of a site leaves in memory for its next build."""
+
+    def __init__(self):
+        # Source path -> ((size, mtime_ns), hash), as kept by hash_file_cached
+        self.hash_cache = {}
+        self.reset()
+
+    def reset(self):
+        """Forget everything but the source hashes, which are checked by stat."""
+        self.manifest = None
+        self.markdown_files = None
+        self.pages = {}
+        self.template = None
+        self.navigation = None
+        # Paths reported changed since the last build, or None when unknown
+        self.changed = None
+
+    def mark_changed(self, paths):
+        """Note files added, modified or removed since the last build."""
+        if self.changed is not None:
+            self.changed.update(Path(path) for path in paths)
+
+    def discover(self, content_path, pattern):
+        """Return the sorted source files, walking content_path only when changes are unknown."""
+        if self.markdown_files is None or self.changed is None:
+            return sorted(content_path.rglob(pattern))
+        known = set(self.markdown_files)
+        markdown_files = set(known)
+        for path in self.changed:
+            if content_path in path.parents and path.match(pattern):
+                if path.is_file():
+                    markdown_files.add(path)
+                else:
+                    markdown_files.discard(path)
+        # Edits to existing pages keep the sorted list of the last build
+        return self.markdown_files if markdown_files == known else sorted(markdown_files)
+
+    def is_unchanged(self, path):
+        """Return whether path is known not to have changed since the last build."""
+        return self.changed is not None and path not in self.changed and path in self.hash_cache
+
+    def finish(self, manifest, markdown_files, pages, template, navigation):
+        """Keep the results of a finished build for the next one.
+
+        Args:
+            manifest: Build manifest as saved, or None
+            markdown_files: Sorted source files of the build
+            pages: PageRecords of the pages built or reused
+            template: (key, compiled template)
+            navigation: (navigation hash, Navigation)
+        """
+        self.manifest = manifest
+        self.markdown_files = markdown_files
+        self.pages = {page.source: page for page in pages}
+        self.template = template
+        self.navigation = navigation
+        self.changed = set()
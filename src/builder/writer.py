@@ -0,0 +1,118 @@
+"""
+Threaded page writer for the static site generator.
+
+Writing pages is mostly waiting on the filesystem, which on network and
+container overlay filesystems can take longer than rendering them. The
+PageWriter runs the writes on a small thread pool while the main thread
+renders the next pages. At most max_pending writes are queued, so only that
+many rendered pages are held in memory, and completed writes are handed
+back strictly in the order they were submitted, so everything that depends
+on the order of pages (sitemap, feed, search document ids) comes out
+exactly as with sequential writes.
+"""
+
+import time
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.builder.staging import write_output
+from src.config.default import DEFAULT_WRITE_THREADS, MAX_PENDING_WRITES
+
+
+class PageWriter:
+    """Write output files on a bounded thread pool and complete them in order."""
+
+    def __init__(self, threads=DEFAULT_WRITE_THREADS, max_pending=MAX_PENDING_WRITES, output_dir=None,
+                 previous_dir=None):
+        """Create a writer.
+
+        Args:
+            threads: Number of writer threads
+            max_pending: Number of queued writes at most
+            output_dir: Directory the files are written to
+            previous_dir: Previous build of output_dir; files that come out
+                identical to it are hardlinked from it (see write_output)
+        """
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.previous_dir = Path(previous_dir) if previous_dir is not None else None
+        self.executor = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="page-writer")
+        self.max_pending = max(1, max_pending)
+        self.pending = deque()
+        # Directories already created, shared by the writer threads
+        self.directories = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Writes still queued after a failure are dropped, running ones finish
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        return False
+
+    def _write(self, path, text):
+        """Create the directory of path once and write text to it.
+
+        Returns:
+            float: Seconds spent writing
+        """
+        start = time.perf_counter()
+        parent = path.parent
+        if parent not in self.directories:
+            parent.mkdir(parents=True, exist_ok=True)
+            self.directories.add(parent)
+        previous = None
+        if self.previous_dir is not None:
+            previous = self.previous_dir / Path(path).relative_to(self.output_dir)
+        write_output(path, text, previous)
+        return time.perf_counter() - start
+
+    def _complete(self):
+        """Wait for the oldest queued write.
+
+        Returns:
+            tuple: (item, seconds, error) - error is the exception the write raised, or None
+        """
+        item, future = self.pending.popleft()
+        if future is None:
+            return item, 0.0, None
+        try:
+            return item, future.result(), None
+        except Exception as e:
+            return item, 0.0, e
+
+    def submit(self, path, text, item):
+        """Queue a write and collect the writes that have completed.
+
+        Waits for the oldest write while more than max_pending are queued.
+
+        Args:
+            path: Output file, whose directory is created when needed
+            text: Contents to write, or None to queue item without writing
+                anything so that it keeps its place in the order
+            item: Value handed back when the write completes
+
+        Returns:
+            list: (item, seconds, error) for every write completed so far, in
+            submission order
+        """
+        future = None if text is None else self.executor.submit(self._write, path, text)
+        self.pending.append((item, future))
+        completed = []
+        while self.pending and (
+            len(self.pending) > self.max_pending
+            or self.pending[0][1] is None
+            or self.pending[0][1].done()
+        ):
+            completed.append(self._complete())
+        return completed
+
+    def close(self):
+        """Wait for every queued write.
+
+        Returns:
+            list: (item, seconds, error) for the remaining writes, in submission order
+        """
+        completed = [self._complete() for _ in range(len(self.pending))]
+        self.executor.shutdown(wait=True)
+        return completed
@@ -8,3 +8,84 @@ DEFAULT_LOG_NAME = "static_site_generator"
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_LOG_FILE = None
 
+# Site configuration, used for absolute URLs in the sitemap and feed
+SITE_URL = "https://jgrove.dev"
+SITE_TITLE = "Jgrove"
+SITE_AUTHOR = "Jgrove"
+
+# Incremental build configuration; build state files live in the state
+# directory beside each release (see src.builder.staging.build_state_dir)
+BUILD_MANIFEST_FILE = "build-manifest.json"
+ASSET_MANIFEST_FILE = "asset-manifest.json"
+
+# Output manifest and deploy delta, written next to the build manifest
+OUTPUT_MANIFEST_FILE = "output-manifest.json"
+DEPLOY_DELTA_FILE = "deploy-delta.json"
+
+# Parallel build configuration
+DEFAULT_JOBS = 1
+DEFAULT_ASSET_THREADS = 8
+# Pages per worker task, and tasks queued per worker ahead of the writer
+MAX_RENDER_CHUNK_SIZE = 32
+RENDER_CHUNKS_PER_WORKER = 2
+# Page writer threads, and rendered pages queued for them at most
+DEFAULT_WRITE_THREADS = 4
+MAX_PENDING_WRITES = 32
+
+# Profiling configuration
+DEFAULT_PROFILE_FILE = "build-profile.json"
+DEFAULT_PROFILE_TOP = 10
+
+# Precompression configuration
+GZIP_SUFFIXES = (".html", ".css", ".js", ".json", ".svg", ".xml", ".txt", ".webmanifest")
+GZIP_LEVEL = 9
+GZIP_MIN_SIZE = 256
+DEFAULT_GZIP_THREADS = 8
+# Records of the compressed sources, kept in the build state
+GZIP_MANIFEST_FILE = "gzip-manifest.json"
+
+# Log output configuration
+LOG_FORMATS = ("text", "json")
+DEFAULT_LOG_FORMAT = "text"
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+# Search index configuration
+SEARCH_DIR = "search"
+SEARCH_INDEX_SHARDS = 64
+SEARCH_DOC_SHARD_SIZE = 1000
+SEARCH_MIN_TOKEN_LENGTH = 2
+SEARCH_MAX_TOKEN_LENGTH = 32
+
+# Sitemap and feed configuration
+SITEMAP_FILE = "sitemap.xml"
+SITEMAP_MAX_URLS = 50000
+FEED_FILE = "feed.xml"
+FEED_MAX_ENTRIES = 20
+
+# Render cache configuration
+RENDER_CACHE_FILE = ".cache/render-cache.sqlite3"
+RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Watch mode and development server configuration
+DEV_SERVER_HOST = "127.0.0.1"
+DEV_SERVER_PORT = 8000
+WATCH_POLL_INTERVAL = 0.05
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_HEARTBEAT = 15.0
+
+# Build daemon configuration
+BUILD_DAEMON_SOCKET = ".cache/build-daemon.sock"
+BUILD_DAEMON_CONNECT_TIMEOUT = 1.0
+DAEMON_LOG_NAME = "static_site_generator_daemon"
+
+# Sharded build configuration; shard outputs live in dist.shards/<i>-of-<N>
+SHARDS_SUFFIX = ".shards"
+SHARD_RECORD_FILE = "shard.json"
+
+# Syntax highlighting configuration; highlighted code blocks are cached in
+# HIGHLIGHT_CACHE_DIR and styled by the generated HIGHLIGHT_STYLESHEET
+HIGHLIGHT_CACHE_DIR = ".cache/highlight"
+HIGHLIGHT_STYLE = "default"
+HIGHLIGHT_CSS_CLASS = "highlight"
+HIGHLIGHT_STYLESHEET = "highlight.css"
+HIGHLIGHT_MEMORY_BLOCKS = 10000
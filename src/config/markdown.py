@@ -1,5 +1,10 @@
 # Markdown extensions
 MARKDOWN_EXTENSIONS = ["fenced_code", "tables"]
 
+# Markdown backend converting page bodies to HTML (see src/parser/backends.py):
+# "python-markdown", "markdown-it", "mistune", or "auto" for the fastest one
+# installed. A backend that is not installed falls back to python-markdown.
+MARKDOWN_BACKEND = "python-markdown"
+
 # File patterns
 MARKDOWN_PATTERN = "*.md" 
\ No newline at end of file
@@ -1,29 +1,241 @@
-from src.builder.html import build_site
 from src.config.default import DEFAULT_CONTENT_DIR
 from src.config.default import DEFAULT_OUTPUT_DIR
 from src.config.default import DEFAULT_TEMPLATE_FILE
-from src.logger.logger import setup_logging
+from src.config.default import DEFAULT_JOBS
+from src.config.default import DEFAULT_PROFILE_FILE
+from src.config.default import DEFAULT_PROFILE_TOP
+from src.config.default import DEFAULT_LOG_FORMAT, LOG_FORMATS
+from src.config.default import DEV_SERVER_HOST, DEV_SERVER_PORT
+from src.config.default import BUILD_DAEMON_SOCKET, DAEMON_LOG_NAME
+from src.config.default import HIGHLIGHT_CACHE_DIR
+from src.logger.logger import setup_logging, shutdown_logging
+from src.server.daemon import build_on_daemon, serve_daemon
+import os
+import sys
+import argparse
 import logging
+import threading
+from pathlib import Path
 from datetime import datetime
 
-def generate_site():
-    """Generate the static site with comprehensive logging."""
-    content_dir = DEFAULT_CONTENT_DIR
-    output_dir = DEFAULT_OUTPUT_DIR
-    template_file = DEFAULT_TEMPLATE_FILE
+# The builder, profiler and dev server modules are imported by the commands
+# that use them, so --help and builds handed to the build daemon start
+# without loading them
+
+def parse_args(argv=None):
+    """Parse command line options for a site build."""
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="validate the frontmatter of every page without building the site",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="write a precompressed .gz copy of each HTML, CSS and JSON file for nginx gzip_static",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rebuild pages whose source, template, config or navigation changed",
+    )
+    parser.add_argument(
+        "--highlight",
+        action="store_true",
+        help="highlight fenced code blocks with Pygments, styled by a generated stylesheet",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=f"number of processes used to parse markdown, 0 for one per CPU (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default=DEFAULT_LOG_FORMAT,
+        help=f"console and log file format, json writes one JSON object per line (default: {DEFAULT_LOG_FORMAT})",
+    )
+    parser.add_argument(
+        "--log-queue",
+        action="store_true",
+        help="write log output from a background thread so logging never blocks the build",
+    )
+    parser.add_argument(
+        "--link-assets",
+        action="store_true",
+        help="hardlink static assets into the output directory instead of copying them",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="strip comments and collapsible whitespace from rendered pages",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="neither read nor update the render cache of parsed markdown and highlighted code",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help=f"build in this process even when a build daemon listens on {BUILD_DAEMON_SOCKET}",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"record per-phase and per-file timings in {DEFAULT_PROFILE_FILE} next to the output directory",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="write a sharded client-side search index to the search/ directory of the output",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard_argument,
+        metavar="I/N",
+        help="render only shard I of N, into dist.shards/I-of-N, for the merge command to combine",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="keep the previous output when any page fails to build, instead of publishing the pages that built",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="report progress counters on the console instead of one line per page",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        metavar="N",
+        help=f"number of slowest files listed in the build profile (default: {DEFAULT_PROFILE_TOP})",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    cache_parser = subparsers.add_parser("cache", help="report on or empty the render cache")
+    cache_parser.add_argument("action", choices=("stats", "clear"))
+    watch_parser = subparsers.add_parser(
+        "watch", help="serve the site locally and rebuild it, with live reload, whenever a source changes"
+    )
+    watch_parser.add_argument(
+        "--host", default=DEV_SERVER_HOST, help=f"address the dev server listens on (default: {DEV_SERVER_HOST})"
+    )
+    watch_parser.add_argument(
+        "--port", type=int, default=DEV_SERVER_PORT, help=f"port the dev server listens on (default: {DEV_SERVER_PORT})"
+    )
+    subparsers.add_parser(
+        "merge", help="combine the outputs of a complete set of --shard builds into the output directory"
+    )
+    subparsers.add_parser(
+        "daemon", help=f"keep a process with the generator loaded and run builds handed to it on {BUILD_DAEMON_SOCKET}"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be zero or a positive integer")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.shard is not None and args.incremental:
+        parser.error("--shard builds are always full builds and cannot be combined with --incremental")
+    return args
 
-    logger = setup_logging(log_level=logging.INFO)
+def shard_argument(text):
+    """Parse the value of --shard for argparse."""
+    from src.builder.shards import parse_shard
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
 
+def check_content(logger, content_dir, output_dir):
+    """Validate all frontmatter and return the process exit status."""
+    from src.builder.check import check_site
+    start_time = datetime.now()
+    checked_count, error_count = check_site(logger, content_dir, output_dir)
+    duration = datetime.now() - start_time
+    logger.info(f"Checked {checked_count} files in {duration}, {error_count} errors")
+    return 1 if error_count else 0
+
+def cache_command(logger, action):
+    """Report on or clear the render and highlight caches and return the process exit status."""
+    from src.builder.highlight import clear_highlight_cache, highlight_cache_stats
+    from src.builder.render_cache import RenderCache
+    render_cache = RenderCache(logger)
+    try:
+        if action == "clear":
+            render_cache.clear()
+            logger.info(f"Cleared render cache: {render_cache.path}")
+            clear_highlight_cache()
+            logger.info(f"Cleared highlight cache: {HIGHLIGHT_CACHE_DIR}")
+            return 0
+        stats = render_cache.stats()
+    finally:
+        render_cache.close()
+    logger.info(f"Render cache: {render_cache.path}")
+    logger.info(f"Entries: {stats['entries']}")
+    logger.info(f"Stored: {stats['bytes'] / 2**20:.2f} MiB of {stats['max_bytes'] / 2**20:.0f} MiB")
+    logger.info(f"Database file: {stats['file_bytes'] / 2**20:.2f} MiB")
+    highlight_stats = highlight_cache_stats()
+    logger.info(f"Highlight cache: {HIGHLIGHT_CACHE_DIR}")
+    logger.info(f"Code blocks: {highlight_stats['entries']} ({highlight_stats['bytes'] / 2**20:.2f} MiB)")
+    return 0
+
+def merge_content(logger, output_dir):
+    """Merge the outputs of every shard build and return the process exit status."""
+    from src.builder.shards import merge_shards, shards_path
+    shards_dir = shards_path(output_dir)
+    shard_dirs = sorted(
+        path for path in shards_dir.iterdir() if path.is_dir() and not path.name.startswith(".")
+    ) if shards_dir.is_dir() else []
+    page_count, error_count = merge_shards(logger, shard_dirs, output_dir)
+    if error_count:
+        logger.error(f"Merge failed with {error_count} errors, {output_dir} was left unchanged")
+        return 1
+    return 0
+
+def build_content(logger, args, content_dir, output_dir, template_file):
+    """Build the site and return the process exit status."""
+    from src.builder.html import build_site
+    from src.builder.render_cache import RenderCache
+    from src.builder.shards import discard_other_shard_sets, shard_output_dir
+    from src.profiler.profiler import BuildProfiler
+    if args.shard is not None:
+        discard_other_shard_sets(output_dir, args.shard[1], logger)
+        output_dir = shard_output_dir(output_dir, args.shard)
     start_time = datetime.now()
     logger.info("Starting static site build")
     logger.info(f"Content directory: {content_dir}")
     logger.info(f"Output directory: {output_dir}")
+    logger.info(f"Parser processes: {args.jobs}")
+    profiler = BuildProfiler() if args.profile else None
+    render_cache = None if args.no_cache else RenderCache(logger)
 
-    successful_conversions, error_count = build_site(logger, content_dir, output_dir, template_file)
+    try:
+        successful_conversions, error_count = build_site(
+            logger, content_dir, output_dir, template_file, incremental=args.incremental, jobs=args.jobs,
+            profiler=profiler, link_assets=args.link_assets, precompress=args.gzip,
+            search=args.search, minify=args.minify, render_cache=render_cache, shard=args.shard,
+            highlight=args.highlight, highlight_cache=None if args.no_cache else HIGHLIGHT_CACHE_DIR,
+            strict=args.strict
+        )
+    finally:
+        if render_cache is not None:
+            render_cache.close()
 
     end_time = datetime.now()
     duration = end_time - start_time
 
+    if profiler is not None:
+        profile_path = Path(output_dir).resolve().parent / DEFAULT_PROFILE_FILE
+        profiler.write(profile_path, duration.total_seconds(), args.profile_top)
+        logger.info(f"Wrote build profile: {profile_path}")
+        for entry in profiler.slowest(args.profile_top):
+            logger.info(f"Slow page: {entry['file']} ({entry['seconds'] * 1000:.1f} ms)")
+
     logger.info(f"Static site build completed in {duration}")
 
     logger.info("=" * 50)
@@ -33,4 +245,130 @@ def generate_site():
     logger.info(f"Output directory: {output_dir}")
     logger.info(f"Successful conversions: {successful_conversions}")
     logger.info(f"Errors encountered: {error_count}")
-    logger.info("=" * 50)
\ No newline at end of file
+    logger.info("=" * 50)
+    if error_count > 0 and (args.strict or successful_conversions == 0):
+        logger.error(f"Build failed, {output_dir} was left unchanged")
+        return 1
+    if error_count > 0:
+        logger.error(f"Build finished with {error_count} errors, the pages that failed are missing from {output_dir}")
+        return 1
+    return 0
+
+def watch_content(logger, args, content_dir, output_dir, template_file):
+    """Serve the site and rebuild it on every change until interrupted.
+
+    After one full build, rebuilds are incremental and write straight into
+    output_dir: staging and swapping the whole tree would cost more than
+    rebuilding the one page that changed. The render cache and a WarmBuild
+    are kept between rebuilds, so each rebuild only re-reads the files the
+    watcher reported and re-renders their pages.
+
+    Returns:
+        int: Process exit status
+    """
+    from src.builder.html import build_site
+    from src.builder.render_cache import RenderCache
+    from src.builder.warm import WarmBuild
+    from src.server.dev import start_dev_server, stop_dev_server, watch_site
+    from src.server.watch import SourceWatcher
+    render_cache = None if args.no_cache else RenderCache(logger)
+    warm = WarmBuild()
+    options = dict(
+        jobs=args.jobs, link_assets=args.link_assets, precompress=args.gzip, search=args.search,
+        minify=args.minify, render_cache=render_cache, highlight=args.highlight,
+        highlight_cache=None if args.no_cache else HIGHLIGHT_CACHE_DIR
+    )
+    watcher = SourceWatcher([content_dir, Path(template_file).parent])
+    try:
+        successful_conversions, error_count = build_site(
+            logger, content_dir, output_dir, template_file, incremental=True, **options
+        )
+        logger.info(f"Initial build: {successful_conversions} pages, {error_count} errors")
+        server = start_dev_server(output_dir, logger, host=args.host, port=args.port)
+    except Exception:
+        if render_cache is not None:
+            render_cache.close()
+        raise
+    host, port = server.server_address[:2]
+    logger.info(f"Serving {output_dir} at http://{host}:{port}/ (Ctrl+C to stop)")
+
+    def rebuild(changed):
+        warm.mark_changed(changed)
+        return build_site(
+            logger, content_dir, output_dir, template_file, incremental=True, staged=False, warm=warm, **options
+        )
+
+    try:
+        # Fill the warm state now rather than on the first saved file
+        rebuild([])
+        watch_site(logger, rebuild, watcher, server.live_reload, threading.Event())
+    except KeyboardInterrupt:
+        logger.info("Stopping dev server")
+    finally:
+        stop_dev_server(server)
+        if render_cache is not None:
+            render_cache.close()
+    return 0
+
+def run_command(logger, args):
+    """Run the command selected by args and return the process exit status."""
+    content_dir = DEFAULT_CONTENT_DIR
+    output_dir = DEFAULT_OUTPUT_DIR
+    template_file = DEFAULT_TEMPLATE_FILE
+
+    try:
+        if args.command == "cache":
+            return cache_command(logger, args.action)
+        if args.command == "watch":
+            return watch_content(logger, args, content_dir, output_dir, template_file)
+        if args.command == "merge":
+            return merge_content(logger, output_dir)
+        if args.check:
+            return check_content(logger, content_dir, output_dir)
+        return build_content(logger, args, content_dir, output_dir, template_file)
+    finally:
+        # Flush records still queued for the background logging thread
+        shutdown_logging(logger)
+
+def run_daemon_build(argv, stream):
+    """Run a command handed to the build daemon, logging to stream."""
+    args = parse_args(argv)
+    logger = setup_logging(
+        log_level=logging.INFO, queued=args.log_queue, log_format=args.log_format, summary=args.summary,
+        stream=stream
+    )
+    return run_command(logger, args)
+
+def daemon_command(args):
+    """Load everything a build needs, then serve builds until interrupted."""
+    # Imported once here, so no build handed to the daemon pays for them
+    import src.builder.check
+    import src.builder.html
+    import src.builder.render_cache
+    from src.parser.markdown import get_converter, get_yaml_loader
+    get_converter()
+    get_yaml_loader()
+    logger = setup_logging(log_level=logging.INFO, log_format=args.log_format, name=DAEMON_LOG_NAME)
+    return serve_daemon(logger, run_daemon_build)
+
+def generate_site(argv=None):
+    """Generate the static site with comprehensive logging.
+
+    Builds and checks are handed to the build daemon when one is running.
+
+    Returns:
+        int: Process exit status, 1 when the build failed and the previous
+        output was kept
+    """
+    args = parse_args(argv)
+    if args.command == "daemon":
+        return daemon_command(args)
+    if args.command is None and not args.no_daemon:
+        status = build_on_daemon(sys.argv[1:] if argv is None else argv)
+        if status is not None:
+            return status
+
+    logger = setup_logging(
+        log_level=logging.INFO, queued=args.log_queue, log_format=args.log_format, summary=args.summary
+    )
+    return run_command(logger, args)
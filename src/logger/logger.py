@@ -3,38 +3,178 @@ Logging configuration for the static site generator.
 """
 
 import sys
+import json
+import time
+import queue
+import atexit
 import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
-from src.config.default import DEFAULT_LOG_NAME
+from src.config.default import DEFAULT_LOG_NAME, DEFAULT_LOG_FORMAT, DEFAULT_PROGRESS_INTERVAL
 
-def setup_logging(log_level=logging.INFO, log_file=None):
-    """Setup logging configuration with both console and file handlers."""
+# Record attribute set (through extra=) on the per-page build lines
+PAGE_STATUS = "page_status"
+
+# Queue listeners started by setup_logging, by logger name
+_listeners = {}
+
+
+def page_status(status):
+    """Return the extra= mapping that marks a log call as a per-page line."""
+    return {PAGE_STATUS: status}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format each record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        status = getattr(record, PAGE_STATUS, None)
+        if status is not None:
+            entry['page_status'] = status
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SummaryFilter(logging.Filter):
+    """Replace per-page console lines with periodic progress counters.
+
+    Per-page records are counted by status and dropped, except warnings and
+    errors, which are always shown. At most once per interval a per-page
+    record is rewritten into a progress line instead, and shutdown_logging
+    prints the final counters through flush.
+    """
+
+    def __init__(self, interval=DEFAULT_PROGRESS_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self.counts = {}
+        self._reported = {}
+        self._last_report = time.monotonic()
+
+    def _progress(self):
+        self._reported = dict(self.counts)
+        return ", ".join(f"{count} {name}" for name, count in sorted(self.counts.items()))
+
+    def filter(self, record):
+        status = getattr(record, PAGE_STATUS, None)
+        if status is None:
+            return True
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        if now - self._last_report < self.interval:
+            return False
+        self._last_report = now
+        record.msg = "Progress: %s"
+        record.args = (self._progress(),)
+        return True
+
+    def flush(self, handler, name=DEFAULT_LOG_NAME):
+        """Emit the final counters through handler, unless already reported.
+
+        Args:
+            handler: Handler this filter is attached to
+            name: Logger name of the summary record
+        """
+        if self.counts == self._reported:
+            return
+        record = logging.LogRecord(name, logging.INFO, __file__, 0, "Summary: %s", (self._progress(),), None)
+        handler.handle(record)
+
+
+def shutdown_logging(logger=None):
+    """Stop the queue listener of logger, flushing every queued record.
+
+    Console handlers in summary mode then print their final counters, so
+    builds shorter than the progress interval still end with a summary.
+    """
+    name = logger.name if logger is not None else DEFAULT_LOG_NAME
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        handlers = listener.handlers
+    else:
+        handlers = logging.getLogger(name).handlers
+    for handler in handlers:
+        for summary in handler.filters:
+            if isinstance(summary, SummaryFilter):
+                summary.flush(handler, name)
+
+
+def setup_logging(log_level=logging.INFO, log_file=None, queued=False,
+                  log_format=DEFAULT_LOG_FORMAT, summary=False, stream=None, name=DEFAULT_LOG_NAME):
+    """Setup logging configuration with both console and file handlers.
+
+    Args:
+        queued: Hand records to a background thread through a queue, so
+            logging calls never wait on the console or the log file; call
+            shutdown_logging to flush the queue before exiting
+        log_format: "text" for plain lines or "json" for JSON lines
+        summary: Show progress counters on the console instead of one line
+            per page
+        stream: Console stream, sys.stdout by default
+        name: Name of the logger to configure
+    """
     # Create logger
-    logger = logging.getLogger(DEFAULT_LOG_NAME)
+    logger = logging.getLogger(name)
     logger.setLevel(log_level)
     
     # Clear any existing handlers
+    shutdown_logging(logger)
     logger.handlers.clear()
     
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    simple_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
+    if log_format == "json":
+        detailed_formatter = simple_formatter = JsonLinesFormatter()
+    else:
+        detailed_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        simple_formatter = logging.Formatter(
+            '%(levelname)s: %(message)s'
+        )
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(sys.stdout if stream is None else stream)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(simple_formatter)
-    logger.addHandler(console_handler)
+    if summary:
+        console_handler.addFilter(SummaryFilter())
+    handlers = [console_handler]
     
     # File handler (optional)
     if log_file:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if queued:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[logger.name] = listener
+        logger.addHandler(QueueHandler(log_queue))
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     
-    return logger 
\ No newline at end of file
+    return logger
+
+
+def _stop_listeners():
+    """Flush queued records of any logger still running at interpreter exit."""
+    for name in list(_listeners):
+        shutdown_logging(logging.getLogger(name))
+
+
+atexit.register(_stop_listeners)
@@ -0,0 +1,137 @@
+"""
+Markdown backends for the static site generator.
+
+A backend converts a markdown body to HTML. Python-Markdown is the default
+and the reference every other backend is compared against (see
+benchmarks/compare_backends.py). The other backends are optional: they are
+only used when MARKDOWN_BACKEND in src/config/markdown.py selects them and
+their package is installed. With MARKDOWN_BACKEND = "auto" the fastest
+installed backend is used.
+
+Each backend module is imported when its first converter is created, so
+selecting a backend costs nothing until a page is rendered.
+"""
+
+import importlib
+import importlib.util
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from src.config.markdown import MARKDOWN_BACKEND, MARKDOWN_EXTENSIONS
+
+DEFAULT_BACKEND = "python-markdown"
+
+
+class MarkdownBackend(ABC):
+    """Base class of the markdown backends; one instance per thread.
+
+    Subclasses set name and module, create their converter in __init__
+    and implement render; a backend without render cannot be created.
+    """
+
+    # Name used in MARKDOWN_BACKEND
+    name = None
+    # Top-level module of the package implementing the backend
+    module = None
+
+    @classmethod
+    def available(cls):
+        """Return whether the backend's package is installed."""
+        return importlib.util.find_spec(cls.module) is not None
+
+    @classmethod
+    def version(cls):
+        """Return the installed version of the backend's package."""
+        return getattr(importlib.import_module(cls.module), "__version__", "unknown")
+
+    @classmethod
+    def identity(cls):
+        """Return a string that changes whenever the backend's output may change."""
+        return f"{cls.name} {cls.version()}"
+
+    @abstractmethod
+    def render(self, body):
+        """Convert a markdown body to HTML."""
+
+
+class PythonMarkdownBackend(MarkdownBackend):
+    """Python-Markdown with MARKDOWN_EXTENSIONS, the reference backend."""
+
+    name = "python-markdown"
+    module = "markdown"
+
+    def __init__(self):
+        import markdown
+        self.converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+
+    def render(self, body):
+        # Reset so no state such as reference links leaks between pages
+        return self.converter.reset().convert(body)
+
+
+class MarkdownItBackend(MarkdownBackend):
+    """markdown-it-py: CommonMark with raw HTML and tables."""
+
+    name = "markdown-it"
+    module = "markdown_it"
+
+    def __init__(self):
+        from markdown_it import MarkdownIt
+        self.converter = MarkdownIt("commonmark", {"html": True}).enable("table")
+
+    def render(self, body):
+        # Python-Markdown ends the document without a newline
+        return self.converter.render(body).rstrip("\n")
+
+
+class MistuneBackend(MarkdownBackend):
+    """mistune 3 with raw HTML and tables."""
+
+    name = "mistune"
+    module = "mistune"
+
+    def __init__(self):
+        import mistune
+        self.converter = mistune.create_markdown(escape=False, plugins=["table"])
+
+    def render(self, body):
+        return self.converter(body).rstrip("\n")
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PythonMarkdownBackend, MarkdownItBackend, MistuneBackend)
+}
+
+# Tried in this order by MARKDOWN_BACKEND = "auto", fastest first
+AUTO_ORDER = ("mistune", "markdown-it", "python-markdown")
+
+
+def available_backends():
+    """Return the names of the installed backends."""
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+@lru_cache(maxsize=None)
+def select_backend(name=None):
+    """Return the backend class to use for name, MARKDOWN_BACKEND by default.
+
+    A configured backend that is not installed falls back to Python-Markdown;
+    the build warns about it (see backend_fallback).
+
+    Raises:
+        ValueError: If name is neither "auto" nor a known backend
+    """
+    name = name or MARKDOWN_BACKEND
+    if name == "auto":
+        return next(BACKENDS[candidate] for candidate in AUTO_ORDER if BACKENDS[candidate].available())
+    if name not in BACKENDS:
+        raise ValueError(f"unknown markdown backend {name!r}, expected auto or one of {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]
+    return backend if backend.available() else BACKENDS[DEFAULT_BACKEND]
+
+
+def backend_fallback(name=None):
+    """Return the configured backend name when it is not installed, else None."""
+    name = name or MARKDOWN_BACKEND
+    return None if name == "auto" or select_backend(name).name == name else name
@@ -1,45 +1,177 @@
 """
 Markdown parsing functionality for the static site generator.
+
+markdown and yaml are imported on first use rather than with this module,
+so commands that never parse a page (--help, cache, handing a build to the
+build daemon) do not pay for importing them and their extensions.
 """
 
-import yaml
-import markdown
+import threading
 from pathlib import Path
-from src.config.markdown import MARKDOWN_EXTENSIONS
+from src.parser.backends import select_backend
+from src.profiler.profiler import NULL_PROFILER
+
+# Frontmatter delimiter and the size of reads while scanning for it
+FRONTMATTER_DELIMITER = "---"
+FRONTMATTER_CHUNK_SIZE = 4096
+
+# One converter of the configured backend per thread (and so per worker
+# process), reused across documents instead of reloading the extensions for
+# every file
+_converters = threading.local()
+
+def get_converter():
+    """Return this thread's markdown backend, creating it on first use."""
+    converter = getattr(_converters, "markdown", None)
+    if converter is None:
+        converter = select_backend()()
+        _converters.markdown = converter
+    return converter
+
+def render_markdown(body):
+    """Convert a markdown body to HTML with the pooled converter.
+
+    The backend takes care that no state such as reference links leaks
+    from one page into the next.
+    """
+    return get_converter().render(body)
+
+def split_frontmatter(text):
+    """Split file text into its YAML frontmatter and markdown body.
+
+    Returns:
+        tuple: (frontmatter_text, body) - frontmatter_text is None when the
+        file has no frontmatter, and False when the opening delimiter is
+        never closed (the whole text is then the body)
+    """
+    if not text.startswith(FRONTMATTER_DELIMITER):
+        return None, text
+    parts = text.split(FRONTMATTER_DELIMITER, 2)
+    if len(parts) < 3:
+        return False, text
+    _, fm, body = parts
+    return fm, body
+
+def get_yaml_loader():
+    """Return the libyaml-backed safe loader when PyYAML was built with it."""
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def load_frontmatter(fm, logger, strict=False):
+    """Parse frontmatter text with the fastest available safe YAML loader.
+
+    Invalid YAML is logged and treated as empty frontmatter, unless strict
+    is set, in which case the yaml.YAMLError is raised.
+    """
+    import yaml
+    try:
+        frontmatter = yaml.load(fm, Loader=get_yaml_loader())
+        logger.debug("Parsed frontmatter: %s", frontmatter)
+        return frontmatter
+    except yaml.YAMLError as e:
+        if strict:
+            raise
+        logger.warning("Failed to parse YAML frontmatter: %s", e)
+        return {}
+
+def read_frontmatter_text(file_path):
+    """Read a file only as far as the end of its frontmatter.
+
+    The file is streamed in chunks until the closing delimiter is found, so
+    the markdown body is never read.
 
-def parse_markdown(file_path, logger):
-    """Parse markdown file with YAML frontmatter and logging."""
-    logger.debug(f"Parsing markdown file: {file_path}")
+    Returns:
+        The frontmatter text, None when the file has no frontmatter, or
+        False when the opening delimiter is never closed
+    """
+    with open(file_path, encoding="utf-8") as f:
+        if f.read(len(FRONTMATTER_DELIMITER)) != FRONTMATTER_DELIMITER:
+            return None
+        buffer = ""
+        while True:
+            chunk = f.read(FRONTMATTER_CHUNK_SIZE)
+            if not chunk:
+                return False
+            # Resume the search where a delimiter split across chunks could start
+            start = max(0, len(buffer) - len(FRONTMATTER_DELIMITER) + 1)
+            buffer += chunk
+            end = buffer.find(FRONTMATTER_DELIMITER, start)
+            if end != -1:
+                return buffer[:end]
+
+def read_frontmatter(file_path, logger, profiler=NULL_PROFILER, strict=False):
+    """Read only the YAML frontmatter of a markdown file.
+
+    Produces the same frontmatter as parse_markdown without reading or
+    rendering the body. With strict set, malformed frontmatter raises
+    ValueError and invalid YAML raises yaml.YAMLError instead of being
+    logged and treated as empty.
+    """
+    key = str(file_path)
+    with profiler.phase("read", key):
+        fm = read_frontmatter_text(file_path)
+
+    if fm is None:
+        logger.debug("No YAML frontmatter found in %s", file_path)
+        return {}
+    if fm is False:
+        if strict:
+            raise ValueError("Malformed YAML frontmatter: missing closing delimiter")
+        logger.warning("Malformed YAML frontmatter, treating as regular markdown")
+        return {}
+
+    with profiler.phase("yaml", key):
+        return load_frontmatter(fm, logger, strict)
+
+def render_markdown_file(file_path, logger, profiler=NULL_PROFILER):
+    """Render the markdown body of a file to HTML without parsing its frontmatter."""
+    key = str(file_path)
+    try:
+        with profiler.phase("read", key):
+            text = Path(file_path).read_text(encoding="utf-8")
+        _, body = split_frontmatter(text)
+        with profiler.phase("markdown", key):
+            html_body = render_markdown(body)
+        logger.debug("Converted markdown to HTML (%d characters)", len(html_body))
+        return html_body
+    except Exception as e:
+        logger.error("Failed to render markdown file %s: %s", file_path, e)
+        raise
+
+def parse_markdown(file_path, logger, profiler=NULL_PROFILER):
+    """Parse markdown file with YAML frontmatter and logging.
+    
+    Time spent reading, parsing YAML and converting markdown is recorded
+    against str(file_path) in profiler.
+    """
+    logger.debug("Parsing markdown file: %s", file_path)
+    key = str(file_path)
     
     try:
-        text = Path(file_path).read_text(encoding="utf-8")
-        logger.debug(f"Read {len(text)} characters from {file_path}")
+        with profiler.phase("read", key):
+            text = Path(file_path).read_text(encoding="utf-8")
+        logger.debug("Read %d characters from %s", len(text), file_path)
         
         # Extract YAML frontmatter if present
-        if text.startswith("---"):
-            logger.debug("YAML frontmatter detected")
-            parts = text.split("---", 2)
-            if len(parts) >= 3:
-                _, fm, body = parts
-                try:
-                    frontmatter = yaml.safe_load(fm)
-                    logger.debug(f"Parsed frontmatter: {frontmatter}")
-                except yaml.YAMLError as e:
-                    logger.warning(f"Failed to parse YAML frontmatter: {e}")
-                    frontmatter = {}
-            else:
-                logger.warning("Malformed YAML frontmatter, treating as regular markdown")
-                frontmatter, body = {}, text
-        else:
+        fm, body = split_frontmatter(text)
+        if fm is None:
             logger.debug("No YAML frontmatter found")
-            frontmatter, body = {}, text
+            frontmatter = {}
+        elif fm is False:
+            logger.warning("Malformed YAML frontmatter, treating as regular markdown")
+            frontmatter = {}
+        else:
+            logger.debug("YAML frontmatter detected")
+            with profiler.phase("yaml", key):
+                frontmatter = load_frontmatter(fm, logger)
         
         # Convert markdown to HTML
-        html_body = markdown.markdown(body, extensions=MARKDOWN_EXTENSIONS)
-        logger.debug(f"Converted markdown to HTML ({len(html_body)} characters)")
+        with profiler.phase("markdown", key):
+            html_body = render_markdown(body)
+        logger.debug("Converted markdown to HTML (%d characters)", len(html_body))
         
         return frontmatter, html_body
         
     except Exception as e:
-        logger.error(f"Failed to parse markdown file {file_path}: {e}")
-        raise 
\ No newline at end of file
+        logger.error("Failed to parse markdown file %s: %s", file_path, e)
+        raise
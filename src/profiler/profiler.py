@@ -0,0 +1,118 @@
+"""
+Build profiling for the static site generator.
+
+A BuildProfiler accumulates wall time per build phase, both in total and per
+source file, and writes the result as a machine-readable build profile.
+When profiling is disabled build code receives NULL_PROFILER, whose phase()
+returns a shared no-op context manager so instrumentation costs next to
+nothing.
+"""
+
+import json
+import time
+from pathlib import Path
+from contextlib import nullcontext
+from collections import defaultdict
+
+
+class _PhaseTimer:
+    """Context manager that records the time spent in one phase."""
+    
+    __slots__ = ("profiler", "name", "key", "start")
+    
+    def __init__(self, profiler, name, key):
+        self.profiler = profiler
+        self.name = name
+        self.key = key
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter() - self.start, self.key)
+        return False
+
+
+class BuildProfiler:
+    """Collect cumulative and per-file timings for each build phase."""
+    
+    enabled = True
+    
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.files = defaultdict(lambda: defaultdict(float))
+    
+    def phase(self, name, key=None):
+        """Time a block of work as part of phase name, optionally for a file key."""
+        return _PhaseTimer(self, name, key)
+    
+    def record(self, name, seconds, key=None):
+        """Add seconds to phase name, and to the file key when given."""
+        self.totals[name] += seconds
+        self.counts[name] += 1
+        if key is not None:
+            self.files[key][name] += seconds
+    
+    def records(self):
+        """Return every per-file timing as (phase, seconds, key) tuples.
+        
+        Used to send timings from worker processes back to the parent.
+        """
+        return [
+            (name, seconds, key)
+            for key, phases in self.files.items()
+            for name, seconds in phases.items()
+        ]
+    
+    def merge(self, records):
+        """Add timings returned by records() from another profiler."""
+        for name, seconds, key in records:
+            self.record(name, seconds, key)
+    
+    def slowest(self, top):
+        """Return the top slowest files by total time across all phases."""
+        totals = [(sum(phases.values()), key) for key, phases in self.files.items()]
+        totals.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"file": key, "seconds": seconds, "phases": dict(self.files[key])}
+            for seconds, key in totals[:top]
+        ]
+    
+    def to_dict(self, total_seconds=None, top=10):
+        """Return the profile as a JSON-serialisable dictionary."""
+        return {
+            "total_seconds": total_seconds,
+            "phases": {
+                name: {"seconds": self.totals[name], "count": self.counts[name]}
+                for name in sorted(self.totals, key=self.totals.get, reverse=True)
+            },
+            "slowest_files": self.slowest(top),
+            "files": {key: dict(phases) for key, phases in sorted(self.files.items())},
+        }
+    
+    def write(self, profile_path, total_seconds=None, top=10):
+        """Write the profile to profile_path as JSON."""
+        Path(profile_path).write_text(
+            json.dumps(self.to_dict(total_seconds, top), indent=2), encoding="utf-8"
+        )
+
+
+class NullProfiler:
+    """Profiler used when profiling is disabled; records nothing."""
+    
+    enabled = False
+    _context = nullcontext()
+    
+    def phase(self, name, key=None):
+        return self._context
+    
+    def record(self, name, seconds, key=None):
+        pass
+    
+    def merge(self, records):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,207 @@
+"""
+Build daemon for the static site generator.
+
+Starting the interpreter and importing markdown, its extensions and yaml
+can take longer than building a small site. `python main.py daemon` keeps
+one process running with all of that loaded, and main.py hands it builds
+over a Unix socket in .cache/. The daemon runs each build with the client's
+arguments and streams its console output back, which the client prints
+before exiting with the build's status, so a build through the daemon looks
+exactly like one run in process. Without a daemon listening, main.py builds
+in process as before.
+
+Builds run one at a time in the daemon's working directory. A client in
+another directory is declined, and so is every client once a source file of
+the generator has changed since the daemon started, as the daemon would
+otherwise build with stale code; declined builds run in process.
+
+This module only imports the standard library, so handing a build over
+stays cheap.
+"""
+
+import os
+import sys
+import json
+import socket
+import socketserver
+from pathlib import Path
+
+from src.config.default import BUILD_DAEMON_SOCKET, BUILD_DAEMON_CONNECT_TIMEOUT
+
+SOURCE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def source_signature():
+    """Return {path: mtime_ns} of every Python file of the generator."""
+    return {str(path): path.stat().st_mtime_ns for path in sorted(SOURCE_ROOT.rglob("*.py"))}
+
+
+class ClientStream:
+    """Text stream sending console output to the client as JSON lines."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+        self.connected = True
+
+    def send(self, message):
+        """Send one message, noting rather than raising when the client has gone."""
+        if not self.connected:
+            return
+        try:
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+        except OSError:
+            # The build still finishes and updates the output for the next client
+            self.connected = False
+
+    def write(self, text):
+        self.send({'output': text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    """Run the build described by one JSON request line."""
+
+    def handle(self):
+        daemon = self.server
+        stream = ClientStream(self.wfile)
+        try:
+            request = json.loads(self.rfile.readline())
+            argv = [str(arg) for arg in request['argv']]
+        except (ValueError, KeyError, TypeError):
+            daemon.logger.warning("Ignoring malformed build request")
+            return
+
+        reason = daemon.decline_reason(request)
+        if reason is not None:
+            daemon.logger.warning("Declined build: %s", reason)
+            stream.send({'exit': None, 'reason': reason})
+            return
+
+        daemon.logger.info("Building: %s", " ".join(argv) or "(defaults)")
+        try:
+            status = daemon.run_build(argv, stream)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            daemon.logger.exception("Build failed in the daemon")
+            stream.write(f"ERROR: Build daemon failed: {e}\n")
+            status = 1
+        stream.send({'exit': status})
+        daemon.logger.info("Build finished with status %d", status)
+
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Unix socket server running one build per connection."""
+
+    def __init__(self, run_build, logger, path=BUILD_DAEMON_SOCKET):
+        """Listen on path.
+
+        Args:
+            run_build: Callable taking (argv, stream), running the command
+                with its console output written to stream and returning its
+                exit status
+            logger: Logger for the daemon's own messages
+            path: Socket file, only accessible to the current user
+        """
+        self.run_build = run_build
+        self.logger = logger
+        self.directory = os.path.realpath(os.getcwd())
+        self.sources = source_signature()
+        self.stale = False
+        super().__init__(str(path), BuildRequestHandler)
+        os.chmod(path, 0o600)
+
+    def decline_reason(self, request):
+        """Return why a request cannot be built here, or None."""
+        if os.path.realpath(str(request.get('cwd', ""))) != self.directory:
+            return f"the daemon builds {self.directory}"
+        if source_signature() != self.sources:
+            self.stale = True
+            return "the generator changed since the daemon started, restart it"
+        return None
+
+
+def daemon_is_running(path=BUILD_DAEMON_SOCKET):
+    """Return whether a daemon accepts connections on path."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(BUILD_DAEMON_CONNECT_TIMEOUT)
+        try:
+            client.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def serve_daemon(logger, run_build, path=BUILD_DAEMON_SOCKET):
+    """Serve builds on path until interrupted or the generator changes.
+
+    Returns:
+        int: Process exit status, 1 when another daemon already listens on path
+    """
+    path = Path(path)
+    if daemon_is_running(path):
+        logger.error("A build daemon is already listening on %s", path)
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Left behind by a daemon that did not shut down cleanly
+    path.unlink(missing_ok=True)
+
+    daemon = BuildDaemon(run_build, logger, path)
+    logger.info("✅ Build daemon for %s listening on %s (Ctrl+C to stop)", daemon.directory, path)
+    try:
+        while not daemon.stale:
+            daemon.handle_request()
+        logger.warning("Stopping build daemon: the generator changed since it started")
+    except KeyboardInterrupt:
+        logger.info("Stopping build daemon")
+    finally:
+        daemon.server_close()
+        path.unlink(missing_ok=True)
+    return 0
+
+
+def build_on_daemon(argv, path=BUILD_DAEMON_SOCKET):
+    """Hand a command to the build daemon and print its console output.
+
+    Args:
+        argv: Command line arguments, as given to main.py
+        path: Socket file of the daemon
+
+    Returns:
+        int: Exit status of the build, or None when no daemon ran it and it
+        must be built in process
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(BUILD_DAEMON_CONNECT_TIMEOUT)
+        try:
+            client.connect(str(path))
+        except OSError:
+            return None
+        client.settimeout(None)
+        client.sendall(json.dumps({'argv': list(argv), 'cwd': os.getcwd()}).encode("utf-8") + b"\n")
+        with client.makefile("rb") as replies:
+            for line in replies:
+                message = json.loads(line)
+                if 'output' in message:
+                    sys.stdout.write(message['output'])
+                    sys.stdout.flush()
+                elif message.get('exit') is None:
+                    print(f"Build daemon declined the build ({message.get('reason')}), building in process",
+                          file=sys.stderr)
+                    return None
+                else:
+                    return message['exit']
+    except (OSError, ValueError):
+        pass
+    finally:
+        client.close()
+    print("Lost the connection to the build daemon, building in process", file=sys.stderr)
+    return None
@@ -0,0 +1,174 @@
+"""
+Local development server with live reload for watch mode.
+
+The output directory is served by the standard library's threaded HTTP
+server. HTML responses get a short script that subscribes to server-sent
+events on LIVE_RELOAD_PATH, and every page open in a browser reloads when a
+rebuild completes. The script is added to responses only, so the files in
+the output directory stay exactly as a normal build writes them.
+"""
+
+import io
+import os
+import time
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config.default import (
+    DEV_SERVER_HOST,
+    DEV_SERVER_PORT,
+    LIVE_RELOAD_HEARTBEAT,
+    LIVE_RELOAD_PATH,
+    WATCH_POLL_INTERVAL,
+)
+
+LIVE_RELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = function () {{ location.reload(); }};</script>'
+).encode("utf-8")
+
+
+class LiveReload:
+    """Wake every waiting event stream when a rebuild completes."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.closed = False
+
+    def notify(self):
+        """Tell every connected browser to reload."""
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        """Wait until a rebuild after generation completes, or timeout passes.
+
+        Returns:
+            int: The current generation
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation or self.closed, timeout)
+            return self.generation
+
+    def close(self):
+        """Release every waiting event stream."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+def inject_live_reload(html):
+    """Insert the live reload script before </body>, or append it."""
+    end = html.lower().rfind(b"</body>")
+    if end == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:end] + LIVE_RELOAD_SCRIPT + html[end:]
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Serve the output directory, uncached, with live reload in every page."""
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            self.stream_reloads()
+        else:
+            super().do_GET()
+
+    def end_headers(self):
+        # Never let the browser reuse a page from before the latest rebuild
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if not path.endswith(".html") or not os.path.isfile(path):
+            return super().send_head()
+        try:
+            with open(path, "rb") as f:
+                body = inject_live_reload(f.read())
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Copied to the client by do_GET only, like the files of the base class
+        return io.BytesIO(body)
+
+    def stream_reloads(self):
+        """Hold the connection open and send an event after every rebuild."""
+        live_reload = self.server.live_reload
+        generation = live_reload.generation
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            while not live_reload.closed:
+                current = live_reload.wait(generation, LIVE_RELOAD_HEARTBEAT)
+                if current != generation:
+                    self.wfile.write(b"data: reload\n\n")
+                    generation = current
+                else:
+                    # Comment line, so dropped connections are noticed
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        self.server.logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def start_dev_server(output_dir, logger, host=DEV_SERVER_HOST, port=DEV_SERVER_PORT):
+    """Serve output_dir over HTTP from a background thread.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its live_reload attribute
+        is the LiveReload to notify after each rebuild
+    """
+    server = ThreadingHTTPServer((host, port), partial(DevRequestHandler, directory=str(output_dir)))
+    server.live_reload = LiveReload()
+    server.logger = logger
+    threading.Thread(target=server.serve_forever, name="dev-server", daemon=True).start()
+    return server
+
+
+def stop_dev_server(server):
+    """Close every event stream and stop the server."""
+    server.live_reload.close()
+    server.shutdown()
+    server.server_close()
+
+
+def watch_site(logger, rebuild, watcher, live_reload, stop, interval=WATCH_POLL_INTERVAL):
+    """Rebuild whenever a watched file changes, until stop is set.
+
+    Args:
+        rebuild: Callable taking the changed paths, running an incremental
+            build and returning (successful_conversions, error_count)
+        watcher: SourceWatcher over the content and template directories
+        live_reload: LiveReload notified after every successful rebuild
+        stop: threading.Event that ends the loop
+        interval: Seconds between scans for changes
+    """
+    while not stop.wait(interval):
+        changed = watcher.changes()
+        if not changed:
+            continue
+        names = ", ".join(str(path) for path in changed[:5])
+        if len(changed) > 5:
+            names += f" and {len(changed) - 5} more"
+        logger.info("Changed: %s", names)
+        start = time.perf_counter()
+        processed_count, error_count = rebuild(changed)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if error_count:
+            logger.warning("Rebuild finished with %d errors in %.0f ms, not reloading", error_count, elapsed_ms)
+            continue
+        logger.info("✅ Rebuilt %d pages in %.0f ms", processed_count, elapsed_ms)
+        live_reload.notify()
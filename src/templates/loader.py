@@ -2,8 +2,51 @@
 Template loading functionality for the static site generator.
 """
 
+import re
 from pathlib import Path
 
+# Placeholders substituted into the page template
+TEMPLATE_PLACEHOLDERS = ("title", "content", "navigation", "description")
+
+
+class CompiledTemplate:
+    """A template split once into static segments and placeholder slots.
+    
+    Rendering fills every slot in a single pass, so each page is assembled
+    with one join and placeholder text inside substituted values (for
+    example a post that mentions ``{navigation}``) is left untouched.
+    """
+    
+    __slots__ = ("source", "_parts", "_slots")
+    
+    def __init__(self, source, placeholders=TEMPLATE_PLACEHOLDERS):
+        self.source = source
+        pattern = re.compile(r"\{(" + "|".join(map(re.escape, placeholders)) + r")\}")
+        # re.split with a capturing group alternates static text and slot names
+        self._parts = pattern.split(source)
+        self._slots = tuple((index, self._parts[index]) for index in range(1, len(self._parts), 2))
+    
+    @property
+    def placeholders(self):
+        """Names of the slots in the order they appear in the template."""
+        return [name for _, name in self._slots]
+    
+    def render(self, **values):
+        """Render the template with a value for every placeholder.
+        
+        Raises:
+            KeyError: If a placeholder used by the template has no value
+        """
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+
+def compile_template(template_content, placeholders=TEMPLATE_PLACEHOLDERS):
+    """Compile template text into a CompiledTemplate."""
+    return CompiledTemplate(template_content, placeholders)
+
 
 def load_template(template_file, logger):
     """Load the HTML template with logging."""
@@ -0,0 +1,92 @@
+/*
+ * Client-side search over the sharded index written by `python main.py --search`.
+ *
+ *   siteSearch("distributed caching").then((results) => ...)
+ *
+ * resolves to [{url, title, score}, ...] for the pages containing every
+ * query term, best matches first. Only the term shards of the query terms
+ * and the document shards of the returned matches are downloaded, and
+ * every shard is fetched at most once per page load.
+ */
+(() => {
+  "use strict";
+
+  const BASE = "/search/";
+  const shards = new Map();
+
+  function fetchJson(path) {
+    if (!shards.has(path)) {
+      // Shards without any entries are not written, so a 404 is an empty shard
+      shards.set(path, fetch(BASE + path).then((response) => (response.ok ? response.json() : {})));
+    }
+    return shards.get(path);
+  }
+
+  // Must match tokenize() in src/builder/search.py
+  function tokenize(text, index) {
+    const tokens = text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+    return [...new Set(tokens)].filter((token) => {
+      const length = Array.from(token).length;
+      return length >= index.min_token_length && length <= index.max_token_length;
+    });
+  }
+
+  // Must match term_shard() in src/builder/search.py: 32-bit FNV-1a over UTF-8
+  function termShard(term, count) {
+    let hash = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(term)) {
+      hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+    }
+    return hash % count;
+  }
+
+  // Postings are [doc gap, term frequency, ...] sorted by document id
+  function decode(encoded) {
+    const postings = new Map();
+    let doc = 0;
+    for (let i = 0; i < encoded.length; i += 2) {
+      doc += encoded[i];
+      postings.set(doc, encoded[i + 1]);
+    }
+    return postings;
+  }
+
+  async function siteSearch(query, limit = 10) {
+    const index = await fetchJson("index.json");
+    const terms = tokenize(query, index);
+    if (!terms.length) {
+      return [];
+    }
+
+    const lists = await Promise.all(
+      terms.map(async (term) => {
+        const shard = await fetchJson(`terms/${termShard(term, index.shards)}.json`);
+        return decode(shard[term] || []);
+      })
+    );
+
+    // Keep documents that contain every term, scored by total term frequency
+    let scores = lists[0];
+    for (const postings of lists.slice(1)) {
+      const matched = new Map();
+      for (const [doc, tf] of postings) {
+        if (scores.has(doc)) {
+          matched.set(doc, scores.get(doc) + tf);
+        }
+      }
+      scores = matched;
+    }
+
+    const ranked = [...scores].sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, limit);
+    const results = await Promise.all(
+      ranked.map(async ([doc, score]) => {
+        const docs = await fetchJson(`docs/${Math.floor(doc / index.doc_shard_size)}.json`);
+        const entry = docs[doc];
+        return entry && { url: entry[0], title: entry[1], score };
+      })
+    );
+    return results.filter(Boolean);
+  }
+
+  window.siteSearch = siteSearch;
+})();
@@ -0,0 +1,94 @@
+"""
+Unit tests for the builder assets module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.builder.assets import copy_static_assets, discover_assets
+
+
+class TestStaticAssets(unittest.TestCase):
+    """Test cases for static asset discovery and copying."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_dir = Path(self.temp_dir, "templates")
+        self.output_dir = Path(self.temp_dir, "dist")
+        (self.template_dir / "img").mkdir(parents=True)
+        (self.template_dir / "base.html").write_text("{content}", encoding="utf-8")
+        (self.template_dir / "style.css").write_text("body {}", encoding="utf-8")
+        (self.template_dir / "favicon.ico").write_bytes(b"\x00\x01")
+        (self.template_dir / "img" / "logo.svg").write_text("<svg/>", encoding="utf-8")
+        (self.template_dir / ".hidden").write_text("x", encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_discover_assets_walks_template_dir(self):
+        """Test that every non-template, non-hidden file is discovered."""
+        assets = [path.as_posix() for path in discover_assets(self.template_dir)]
+        self.assertEqual(assets, ["favicon.ico", "img/logo.svg", "style.css"])
+
+    def test_copies_all_assets(self):
+        """Test that the first build copies every asset."""
+        self.assertEqual(copy_static_assets(self.template_dir, self.output_dir, self.logger), (3, 0, 0))
+        self.assertEqual((self.output_dir / "img" / "logo.svg").read_text(encoding="utf-8"), "<svg/>")
+        self.assertFalse((self.output_dir / "base.html").exists())
+        self.logger.info.assert_called_once()
+
+    def test_skips_unchanged_assets(self):
+        """Test that a second build copies nothing."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        self.assertEqual(copy_static_assets(self.template_dir, self.output_dir, self.logger), (0, 3, 0))
+
+    def test_touched_but_identical_asset_is_skipped(self):
+        """Test that an mtime change with identical contents is detected by hash."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        os.utime(self.template_dir / "style.css", ns=(1, 1))
+        self.assertEqual(copy_static_assets(self.template_dir, self.output_dir, self.logger), (0, 3, 0))
+
+    def test_changed_asset_is_copied(self):
+        """Test that a changed asset is copied again."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        (self.template_dir / "style.css").write_text("body { color: red; }", encoding="utf-8")
+        self.assertEqual(copy_static_assets(self.template_dir, self.output_dir, self.logger), (1, 2, 0))
+        self.assertEqual((self.output_dir / "style.css").read_text(encoding="utf-8"), "body { color: red; }")
+
+    def test_removed_asset_is_deleted(self):
+        """Test that assets removed from the template directory are removed from the output."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        (self.template_dir / "favicon.ico").unlink()
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        self.assertFalse((self.output_dir / "favicon.ico").exists())
+
+    def test_unchanged_assets_are_linked_from_previous_output(self):
+        """Test that a build into a fresh directory reuses the previous build's assets."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger)
+        release = Path(self.temp_dir, "release")
+        (self.template_dir / "style.css").write_text("body { color: red; }", encoding="utf-8")
+        result = copy_static_assets(self.template_dir, release, self.logger, previous_dir=self.output_dir)
+        self.assertEqual(result, (1, 2, 0))
+        self.assertTrue(os.path.samefile(self.output_dir / "img" / "logo.svg", release / "img" / "logo.svg"))
+        self.assertFalse(os.path.samefile(self.output_dir / "style.css", release / "style.css"))
+        self.assertEqual((self.output_dir / "style.css").read_text(encoding="utf-8"), "body {}")
+        # The next build compares against the records of the fresh directory
+        self.assertEqual(
+            copy_static_assets(self.template_dir, Path(self.temp_dir, "next"), self.logger, previous_dir=release),
+            (0, 3, 0))
+
+    def test_hardlinks_assets(self):
+        """Test that assets are hardlinked when requested."""
+        copy_static_assets(self.template_dir, self.output_dir, self.logger, link=True)
+        self.assertTrue(os.path.samefile(self.template_dir / "style.css", self.output_dir / "style.css"))
+
+
+if __name__ == '__main__':
+    unittest.main()
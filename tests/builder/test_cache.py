@@ -0,0 +1,162 @@
+"""
+Unit tests for the builder cache module and incremental builds.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder.cache import (
+    hash_text,
+    hash_file,
+    hash_file_cached,
+    hash_navigation,
+    load_build_manifest,
+    save_build_manifest,
+)
+from src.builder.html import build_site
+from src.builder.staging import build_state_dir, write_build_state
+from src.config.default import BUILD_MANIFEST_FILE
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+class TestBuildManifest(unittest.TestCase):
+    """Test cases for the build manifest helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hash_file_matches_hash_text(self):
+        """Test that hashing a file and its text give the same digest."""
+        path = Path(self.temp_dir) / "page.md"
+        path.write_text("# Hello", encoding="utf-8")
+        self.assertEqual(hash_file(path), hash_text("# Hello"))
+
+    def test_hash_file_cached_rehashes_changed_files(self):
+        """Test that a cached digest is reused only while size and mtime match."""
+        path = Path(self.temp_dir) / "page.md"
+        path.write_text("# Hello", encoding="utf-8")
+        hash_cache = {}
+        self.assertEqual(hash_file_cached(path, hash_cache), hash_text("# Hello"))
+        with patch("src.builder.cache.hash_file") as hash_mock:
+            self.assertEqual(hash_file_cached(path, hash_cache), hash_text("# Hello"))
+            hash_mock.assert_not_called()
+        path.write_text("# Changed", encoding="utf-8")
+        os.utime(path, ns=(0, 1))
+        self.assertEqual(hash_file_cached(path, hash_cache), hash_text("# Changed"))
+
+    def test_hash_navigation_changes_with_title(self):
+        """Test that renaming a page changes the navigation hash."""
+        before = hash_navigation([{'title': 'Tech', 'url_path': '/tech'}])
+        after = hash_navigation([{'title': 'Technology', 'url_path': '/tech'}])
+        self.assertNotEqual(before, after)
+
+    def test_load_missing_manifest(self):
+        """Test that a missing manifest loads as None."""
+        self.assertIsNone(load_build_manifest(self.output_dir, self.logger))
+
+    def test_save_and_load_roundtrip(self):
+        """Test that a saved manifest can be loaded again."""
+        save_build_manifest(self.output_dir, {'pages': {'a.md': {'hash': 'x'}}}, self.logger)
+        manifest = load_build_manifest(self.output_dir, self.logger)
+        self.assertEqual(manifest['pages'], {'a.md': {'hash': 'x'}})
+
+    def test_load_corrupt_manifest(self):
+        """Test that a corrupt manifest is ignored with a warning."""
+        write_build_state(self.output_dir, BUILD_MANIFEST_FILE, "{not json")
+        self.assertIsNone(load_build_manifest(self.output_dir, self.logger))
+        self.logger.warning.assert_called()
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    """Test cases for incremental builds in build_site."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        os.makedirs(self.content_dir)
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        self.write_page("tech.md", "Tech", "tech", "Tech body")
+        self.write_page("life.md", "Life", "life", "Life body")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, name, title, slug, body):
+        """Write a markdown page with frontmatter into the content directory."""
+        text = f"---\ntitle: {title}\nslug: {slug}\n---\n\n{body}\n"
+        Path(self.content_dir, name).write_text(text, encoding="utf-8")
+
+    def build(self):
+        """Run an incremental build and return its result."""
+        with patch('builtins.print'):
+            return build_site(self.logger, self.content_dir, self.output_dir,
+                              self.template_file, incremental=True)
+
+    def test_second_build_skips_parsing(self):
+        """Test that unchanged pages are not parsed again."""
+        self.assertEqual(self.build(), (2, 0))
+        with patch('src.builder.html.read_frontmatter') as mock_read, \
+                patch('src.builder.html.render_markdown_file') as mock_render:
+            self.assertEqual(self.build(), (2, 0))
+            mock_read.assert_not_called()
+            mock_render.assert_not_called()
+
+    def test_changed_page_is_rebuilt(self):
+        """Test that only the changed page is parsed again."""
+        self.build()
+        self.write_page("tech.md", "Tech", "tech", "New tech body")
+        self.build()
+        html = Path(self.output_dir, "tech", "index.html").read_text(encoding="utf-8")
+        self.assertIn("New tech body", html)
+
+    def test_title_change_rebuilds_every_page(self):
+        """Test that a navigation change rebuilds pages whose source is unchanged."""
+        self.build()
+        self.write_page("tech.md", "Technology", "tech", "Tech body")
+        self.build()
+        html = Path(self.output_dir, "life", "index.html").read_text(encoding="utf-8")
+        self.assertIn("Technology", html)
+
+    def test_template_change_rebuilds_every_page(self):
+        """Test that a template change rebuilds every page."""
+        self.build()
+        Path(self.template_file).write_text("<main>{content}</main>" + TEMPLATE, encoding="utf-8")
+        self.build()
+        html = Path(self.output_dir, "life", "index.html").read_text(encoding="utf-8")
+        self.assertTrue(html.startswith("<main>"))
+
+    def test_removed_page_output_is_deleted(self):
+        """Test that outputs of deleted sources are removed."""
+        self.build()
+        os.remove(os.path.join(self.content_dir, "life.md"))
+        self.assertEqual(self.build(), (1, 0))
+        self.assertFalse(Path(self.output_dir, "life", "index.html").exists())
+
+    def test_manifest_records_pages(self):
+        """Test that the manifest records every built page."""
+        self.build()
+        manifest = json.loads((build_state_dir(self.output_dir) / BUILD_MANIFEST_FILE).read_text(encoding="utf-8"))
+        self.assertEqual(set(manifest['pages']), {"tech.md", "life.md"})
+        self.assertEqual(manifest['pages']['tech.md']['output_path'], "tech/index.html")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the builder check module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.builder.check import check_site, check_frontmatter
+
+
+class TestCheckSite(unittest.TestCase):
+    """Test cases for frontmatter validation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        os.makedirs(self.content_dir)
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name, text):
+        """Write a markdown file into the content directory."""
+        with open(os.path.join(self.content_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def check(self):
+        """Run check_site on the content directory."""
+        with patch('builtins.print'):
+            return check_site(self.logger, self.content_dir, os.path.join(self.temp_dir, "dist"))
+
+    def test_valid_content(self):
+        """Test that valid frontmatter produces no errors."""
+        self.write("a.md", "---\ntitle: A\nslug: a\n---\nbody")
+        self.write("b.md", "---\ntitle: B\nslug: b\n---\nbody")
+        self.assertEqual(self.check(), (2, 0))
+        self.logger.error.assert_not_called()
+
+    def test_invalid_yaml_and_unclosed_frontmatter(self):
+        """Test that invalid YAML and unclosed frontmatter are errors."""
+        self.write("a.md", "---\ntitle: [broken\n---\nbody")
+        self.write("b.md", "---\ntitle: B\n")
+        self.assertEqual(self.check(), (2, 2))
+
+    def test_duplicate_urls(self):
+        """Test that two pages with the same URL are reported."""
+        self.write("a.md", "---\ntitle: A\nslug: same\n---\nbody")
+        self.write("b.md", "---\ntitle: B\nslug: same\n---\nbody")
+        self.assertEqual(self.check(), (2, 1))
+
+    def test_missing_slug_is_a_warning(self):
+        """Test that a page without a slug is only a warning."""
+        self.write("a.md", "---\ntitle: A\n---\nbody")
+        self.assertEqual(self.check(), (1, 0))
+        self.logger.warning.assert_called()
+
+    def test_check_frontmatter_types(self):
+        """Test field type validation."""
+        self.assertEqual(check_frontmatter({"title": "A", "slug": "a"}), [])
+        self.assertEqual(len(check_frontmatter({"title": 2024, "slug": ["a"]})), 2)
+        self.assertEqual(len(check_frontmatter(["not", "a", "mapping"])), 1)
+
+    def test_missing_content_dir(self):
+        """Test that a missing content directory is an error."""
+        result = check_site(self.logger, os.path.join(self.temp_dir, "missing"), self.temp_dir)
+        self.assertEqual(result, (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
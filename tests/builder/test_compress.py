@@ -0,0 +1,99 @@
+"""
+Unit tests for the builder compress module.
+"""
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.builder.compress import precompress_outputs, discover_compressible
+
+PAGE = "<html><body>" + "<p>Hello world</p>" * 50 + "</body></html>"
+
+
+class TestPrecompress(unittest.TestCase):
+    """Test cases for gzip precompression of build output."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "dist"
+        (self.output_dir / "tech").mkdir(parents=True)
+        (self.output_dir / "index.html").write_text(PAGE, encoding="utf-8")
+        (self.output_dir / "tech" / "index.html").write_text(PAGE, encoding="utf-8")
+        (self.output_dir / "manifest.json").write_text("{}", encoding="utf-8")
+        (self.output_dir / "favicon.png").write_bytes(b"\x89PNG" * 100)
+        (self.output_dir / ".build-manifest.json").write_text("{}" * 200, encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_discover_compressible(self):
+        """Test that only compressible, non-hidden files are selected."""
+        files = [path.relative_to(self.output_dir).as_posix()
+                 for path in discover_compressible(self.output_dir)]
+        self.assertEqual(files, ["index.html", "manifest.json", "tech/index.html"])
+
+    def test_writes_gzip_next_to_outputs(self):
+        """Test that .gz files decompress to the original contents."""
+        self.assertEqual(precompress_outputs(self.output_dir, self.logger), (2, 0, 0))
+        gz_path = self.output_dir / "tech" / "index.html.gz"
+        self.assertEqual(gzip.decompress(gz_path.read_bytes()).decode("utf-8"), PAGE)
+        # Files below the minimum size are served uncompressed
+        self.assertFalse((self.output_dir / "manifest.json.gz").exists())
+
+    def test_output_is_deterministic(self):
+        """Test that compressing the same contents twice gives identical bytes."""
+        precompress_outputs(self.output_dir, self.logger)
+        self.assertEqual(
+            (self.output_dir / "index.html.gz").read_bytes(),
+            (self.output_dir / "tech" / "index.html.gz").read_bytes(),
+        )
+
+    def test_skips_current_files(self):
+        """Test that a second run compresses nothing."""
+        precompress_outputs(self.output_dir, self.logger)
+        self.assertEqual(precompress_outputs(self.output_dir, self.logger), (0, 2, 0))
+
+    def test_recompresses_changed_files(self):
+        """Test that a rewritten output is compressed again."""
+        precompress_outputs(self.output_dir, self.logger)
+        page = self.output_dir / "index.html"
+        page.write_text(PAGE + "<!-- changed -->", encoding="utf-8")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(precompress_outputs(self.output_dir, self.logger), (1, 1, 0))
+        self.assertTrue(gzip.decompress((self.output_dir / "index.html.gz").read_bytes()).endswith(b"changed -->"))
+
+    def test_reuses_previous_gzip_for_same_bytes(self):
+        """Test that a new release links the previous .gz of every rewritten but identical file."""
+        precompress_outputs(self.output_dir, self.logger)
+        release = self.temp_dir / "release"
+        (release / "tech").mkdir(parents=True)
+        (release / "index.html").write_text(PAGE, encoding="utf-8")
+        (release / "tech" / "index.html").write_text(PAGE + "<!-- changed -->", encoding="utf-8")
+        self.assertEqual(precompress_outputs(release, self.logger, previous_dir=self.output_dir), (1, 1, 0))
+        self.assertTrue(os.path.samefile(release / "index.html.gz", self.output_dir / "index.html.gz"))
+        self.assertTrue(gzip.decompress((release / "tech" / "index.html.gz").read_bytes()).endswith(b"changed -->"))
+        self.assertEqual(gzip.decompress((self.output_dir / "tech" / "index.html.gz").read_bytes()).decode(), PAGE)
+
+    def test_removes_orphaned_gzip_files(self):
+        """Test that .gz files of deleted outputs are removed."""
+        precompress_outputs(self.output_dir, self.logger)
+        shutil.rmtree(self.output_dir / "tech")
+        (self.output_dir / "archive.tar.gz").write_bytes(b"data")
+        (self.output_dir / "tech").mkdir()
+        (self.output_dir / "tech" / "old.html.gz").write_bytes(b"data")
+        precompress_outputs(self.output_dir, self.logger)
+        self.assertFalse((self.output_dir / "tech" / "old.html.gz").exists())
+        self.assertTrue((self.output_dir / "archive.tar.gz").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for the builder feeds module and the sitemap and feed of a build.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from xml.etree import ElementTree
+
+from src.builder.html import build_site
+from src.builder.feeds import AtomFeedWriter, SitemapWriter, normalize_date
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def sitemap_locs(path):
+    """Return the <loc> values of a sitemap or sitemap index."""
+    return [loc.text for loc in ElementTree.parse(path).getroot().iter(f"{SITEMAP}loc")]
+
+
+class TestNormalizeDate(unittest.TestCase):
+    """Test cases for frontmatter date normalization."""
+
+    def test_dates_and_datetimes(self):
+        """Test that dates, naive and aware datetimes become UTC timestamps."""
+        self.assertEqual(normalize_date(date(2025, 8, 28)), "2025-08-28T00:00:00Z")
+        self.assertEqual(normalize_date(datetime(2025, 8, 28, 9, 30)), "2025-08-28T09:30:00Z")
+        aware = datetime(2025, 8, 28, 9, 30, tzinfo=timezone(timedelta(hours=2)))
+        self.assertEqual(normalize_date(aware), "2025-08-28T07:30:00Z")
+
+    def test_strings_and_invalid_values(self):
+        """Test that ISO strings are parsed and anything else is ignored."""
+        self.assertEqual(normalize_date("2025-08-28"), "2025-08-28T00:00:00Z")
+        self.assertIsNone(normalize_date("last week"))
+        self.assertIsNone(normalize_date(None))
+        self.assertIsNone(normalize_date(20250828))
+
+
+class TestSitemapWriter(unittest.TestCase):
+    """Test cases for streaming sitemaps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_single_sitemap(self):
+        """Test that a small site gets one sitemap.xml with absolute URLs."""
+        sitemap = SitemapWriter(self.output_dir, "https://example.com/")
+        sitemap.add("/", "2025-08-26T00:00:00Z")
+        sitemap.add("/tech")
+        sitemap.close(self.logger)
+
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["sitemap.xml"])
+        self.assertEqual(sitemap_locs(self.output_dir / "sitemap.xml"),
+                         ["https://example.com/", "https://example.com/tech"])
+        root = ElementTree.parse(self.output_dir / "sitemap.xml").getroot()
+        self.assertEqual([node.text for node in root.iter(f"{SITEMAP}lastmod")], ["2025-08-26T00:00:00Z"])
+
+    def test_split_into_sitemap_index(self):
+        """Test that URLs beyond max_urls go to further parts listed in an index."""
+        sitemap = SitemapWriter(self.output_dir, "https://example.com", max_urls=2)
+        for i in range(5):
+            sitemap.add(f"/post{i}")
+        sitemap.close(self.logger)
+
+        self.assertEqual(sitemap_locs(self.output_dir / "sitemap.xml"), [
+            f"https://example.com/sitemap-{n}.xml" for n in (1, 2, 3)
+        ])
+        self.assertEqual(sitemap_locs(self.output_dir / "sitemap-3.xml"), ["https://example.com/post4"])
+
+    def test_removes_leftover_parts(self):
+        """Test that parts of a previous, larger sitemap are deleted."""
+        for n in (1, 2, 3):
+            (self.output_dir / f"sitemap-{n}.xml").write_text("old", encoding="utf-8")
+        sitemap = SitemapWriter(self.output_dir, "https://example.com")
+        sitemap.add("/")
+        sitemap.close(self.logger)
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ["sitemap.xml"])
+
+
+class TestAtomFeedWriter(unittest.TestCase):
+    """Test cases for the Atom feed."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_keeps_newest_entries(self):
+        """Test that only the newest dated pages are written, newest first."""
+        feed = AtomFeedWriter(self.output_dir, "https://example.com", "Site", "Author", max_entries=2)
+        feed.add("/b", "B", "2025-02-01T00:00:00Z", "Second")
+        feed.add("/undated", "Undated", None, "Skipped")
+        feed.add("/c", "C & D", "2025-03-01T00:00:00Z", "Third <b>")
+        feed.add("/a", "A", "2025-01-01T00:00:00Z", "First")
+        feed.write(self.logger)
+
+        root = ElementTree.parse(self.output_dir / "feed.xml").getroot()
+        self.assertEqual(root.find(f"{ATOM}updated").text, "2025-03-01T00:00:00Z")
+        entries = root.findall(f"{ATOM}entry")
+        self.assertEqual([entry.find(f"{ATOM}title").text for entry in entries], ["C & D", "B"])
+        self.assertEqual(entries[0].find(f"{ATOM}summary").text, "Third <b>")
+        self.assertEqual(entries[0].find(f"{ATOM}link").get("href"), "https://example.com/c")
+
+
+class TestFeedBuild(unittest.TestCase):
+    """Test cases for the sitemap and feed written by build_site."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        os.makedirs(self.content_dir)
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        self.write_page("old.md", "Old", "old", "2024-01-01", "The old post.")
+        self.write_page("new.md", "New", "new", "2025-06-01", "The new post.")
+        Path(self.content_dir, "about.md").write_text(
+            "---\ntitle: About\nslug: about\n---\n\nNo date here.\n", encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, name, title, slug, page_date, body):
+        """Write a dated markdown page into the content directory."""
+        text = f"---\ntitle: {title}\nslug: {slug}\ndate: {page_date}\n---\n\n{body}\n"
+        Path(self.content_dir, name).write_text(text, encoding="utf-8")
+
+    def feed_entries(self):
+        """Return (title, summary) for every entry of the built feed."""
+        root = ElementTree.parse(Path(self.output_dir, "feed.xml")).getroot()
+        return [(entry.find(f"{ATOM}title").text, entry.find(f"{ATOM}summary").text)
+                for entry in root.findall(f"{ATOM}entry")]
+
+    def test_build_writes_sitemap_and_feed(self):
+        """Test that every page is in the sitemap and dated pages in the feed."""
+        self.assertEqual(build_site(self.logger, self.content_dir, self.output_dir, self.template_file), (3, 0))
+        locs = sitemap_locs(Path(self.output_dir, "sitemap.xml"))
+        self.assertEqual(sorted(loc.rsplit("/", 1)[1] for loc in locs), ["about", "new", "old"])
+        self.assertEqual(self.feed_entries(), [("New", "The new post."), ("Old", "The old post.")])
+
+    def test_incremental_build_keeps_feed_summaries(self):
+        """Test that unchanged pages keep their feed entries from the manifest."""
+        build_site(self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True)
+        self.write_page("old.md", "Old", "old", "2024-01-01", "The edited post.")
+        build_site(self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True)
+        self.logger.info.assert_any_call("Reused 2 unchanged pages from the previous build")
+        self.assertEqual(self.feed_entries(), [("New", "The new post."), ("Old", "The edited post.")])
+
+if __name__ == '__main__':
+    unittest.main()
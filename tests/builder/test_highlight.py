@@ -0,0 +1,153 @@
+"""
+Unit tests for the builder highlight module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder.html import build_site
+from src.builder.highlight import (
+    Highlighter,
+    clear_highlight_cache,
+    highlight_cache_stats,
+    highlight_stylesheet,
+    link_stylesheet,
+)
+
+BODY = (
+    '<p>Intro</p>\n'
+    '<pre><code class="language-python">print(&quot;&lt;hi&gt;&quot; &amp; 1)\n</code></pre>\n'
+    '<pre><code>no language\n</code></pre>\n'
+    '<pre><code class="language-nosuchlanguage">x = 1\n</code></pre>'
+)
+
+
+class TestHighlighter(unittest.TestCase):
+    """Test cases for highlighting and caching code blocks."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache_dir = Path(tempfile.mkdtemp()) / "highlight"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.cache_dir.parent, ignore_errors=True)
+
+    def test_only_blocks_with_known_language_are_highlighted(self):
+        """Test that code blocks get Pygments classes and other blocks are untouched."""
+        html = Highlighter(self.cache_dir).highlight(BODY)
+        self.assertEqual(html.count('<div class="highlight">'), 1)
+        self.assertIn('<span class="nb">print</span>', html)
+        # Unescaped for Pygments and escaped again exactly once
+        self.assertIn("&lt;hi&gt;", html)
+        self.assertNotIn("&amp;lt;", html)
+        self.assertIn("<pre><code>no language\n</code></pre>", html)
+        self.assertIn('<pre><code class="language-nosuchlanguage">x = 1\n</code></pre>', html)
+        self.assertTrue(html.startswith("<p>Intro</p>\n"))
+
+    def test_repeated_block_is_highlighted_once(self):
+        """Test that a snippet repeated across pages is highlighted only the first time."""
+        highlighter = Highlighter(None)
+        first = highlighter.highlight(BODY)
+        for _ in range(5):
+            self.assertEqual(highlighter.highlight(BODY), first)
+        self.assertEqual(highlighter.highlighted, 1)
+
+    def test_blocks_are_reused_across_builds(self):
+        """Test that a new process reads highlighted blocks back from the cache directory."""
+        first = Highlighter(self.cache_dir).highlight(BODY)
+        self.assertEqual(highlight_cache_stats(self.cache_dir)['entries'], 1)
+
+        later = Highlighter(self.cache_dir)
+        with patch("pygments.highlight", side_effect=AssertionError("highlighted again")):
+            self.assertEqual(later.highlight(BODY), first)
+        self.assertEqual(later.highlighted, 0)
+
+        clear_highlight_cache(self.cache_dir)
+        self.assertEqual(highlight_cache_stats(self.cache_dir)['entries'], 0)
+
+    def test_formatter_options_are_part_of_the_key(self):
+        """Test that blocks cached with other formatter options are highlighted again."""
+        first = Highlighter(self.cache_dir).highlight(BODY)
+        with patch("src.builder.highlight.HIGHLIGHT_CSS_CLASS", "code"):
+            later = Highlighter(self.cache_dir)
+            html = later.highlight(BODY)
+        self.assertEqual(later.highlighted, 1)
+        self.assertIn('<div class="code">', html)
+        self.assertNotEqual(html, first)
+
+    def test_no_cache_directory(self):
+        """Test that without a cache directory blocks are kept in memory only."""
+        Highlighter(None).highlight(BODY)
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_link_stylesheet(self):
+        """Test that the stylesheet is linked once, from the head."""
+        source = "<html><head><title>{title}</title></head><body>{content}</body></html>"
+        linked = link_stylesheet(source)
+        self.assertIn('<link rel="stylesheet" href="/highlight.css" />\n</head>', linked)
+        self.assertEqual(link_stylesheet(linked), linked)
+        self.assertIn(".highlight .k", highlight_stylesheet())
+
+
+class TestHighlightedBuild(unittest.TestCase):
+    """Test cases for building a site with highlighting."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.cache_dir = os.path.join(self.temp_dir, "highlight")
+        self.template_file = os.path.join(self.temp_dir, "templates", "base.html")
+        os.makedirs(self.content_dir)
+        os.makedirs(os.path.dirname(self.template_file))
+        Path(self.template_file).write_text(
+            "<html><head><title>{title}</title></head><body>{content}</body></html>", encoding="utf-8")
+        for name in ("one", "two"):
+            Path(self.content_dir, f"{name}.md").write_text(
+                f"---\ntitle: {name}\nslug: {name}\n---\n\n```python\nx = 1\n```\n", encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def build(self, **options):
+        """Build the site into the output directory."""
+        return build_site(
+            self.logger, self.content_dir, self.output_dir, self.template_file,
+            highlight_cache=self.cache_dir, **options
+        )
+
+    def test_pages_link_generated_stylesheet(self):
+        """Test that pages are highlighted and styled from one stylesheet, not inline styles."""
+        self.assertEqual(self.build(highlight=True), (2, 0))
+        page = Path(self.output_dir, "one", "index.html").read_text(encoding="utf-8")
+        self.assertIn('<div class="highlight">', page)
+        self.assertIn('href="/highlight.css"', page)
+        self.assertNotIn("style=", page)
+        self.assertEqual(Path(self.output_dir, "highlight.css").read_text(encoding="utf-8"), highlight_stylesheet())
+
+    def test_toggling_highlight_rebuilds_pages(self):
+        """Test that an incremental build rebuilds every page when highlighting is switched on."""
+        self.build(incremental=True)
+        page = Path(self.output_dir, "one", "index.html")
+        self.assertNotIn("highlight", page.read_text(encoding="utf-8"))
+        self.build(incremental=True, highlight=True)
+        self.assertIn('<div class="highlight">', page.read_text(encoding="utf-8"))
+
+    def test_without_pygments(self):
+        """Test that a build without Pygments warns and leaves code blocks as they are."""
+        with patch("src.builder.html.highlighting_available", return_value=False):
+            self.assertEqual(self.build(highlight=True), (2, 0))
+        self.assertFalse(Path(self.output_dir, "highlight.css").exists())
+        self.assertIn("Pygments", str(self.logger.warning.call_args_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
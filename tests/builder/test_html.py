@@ -2,7 +2,9 @@
 Unit tests for the builder html module.
 """
 
+import logging
 import unittest
+import tracemalloc
 from unittest.mock import patch, MagicMock
 import os
 import tempfile
@@ -17,9 +19,9 @@ class TestHTMLBuilder(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures."""
-        import shutil
-        # Clean up temp directory and all its contents
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        from src.builder.staging import remove_output
+        # Clean up temp directory, which builds replace with a release link
+        remove_output(self.temp_dir)
 
     def test_html_builder_import(self):
         """Test that the HTML builder module can be imported."""
@@ -103,8 +105,10 @@ class TestHTMLBuilder(unittest.TestCase):
         with patch('src.builder.html.load_template') as mock_load_template:
             mock_load_template.return_value = "<html><title>{title}</title><body>{content}</body></html>"
             
-            with patch('src.builder.html.parse_markdown') as mock_parse_markdown:
-                mock_parse_markdown.return_value = ({"title": "Test Page"}, "<h1>Hello World</h1><p>This is a test.</p>")
+            with patch('src.builder.html.read_frontmatter') as mock_read_frontmatter, \
+                    patch('src.builder.html.render_markdown_file') as mock_render_markdown_file:
+                mock_read_frontmatter.return_value = {"title": "Test Page"}
+                mock_render_markdown_file.return_value = "<h1>Hello World</h1><p>This is a test.</p>"
                 
                 result = build_site(mock_logger, content_dir, self.temp_dir, "templates/base.html")
                 
@@ -136,12 +140,14 @@ class TestHTMLBuilder(unittest.TestCase):
         with patch('src.builder.html.load_template') as mock_load_template:
             mock_load_template.return_value = "<html><title>{title}</title><body>{content}</body></html>"
             
-            with patch('src.builder.html.parse_markdown') as mock_parse_markdown:
+            with patch('src.builder.html.read_frontmatter') as mock_read_frontmatter, \
+                    patch('src.builder.html.render_markdown_file') as mock_render_markdown_file:
                 # First file succeeds, second file fails
-                mock_parse_markdown.side_effect = [
-                    ({"title": "Test Page 1"}, "<h1>Hello World 1</h1>"),
+                mock_read_frontmatter.side_effect = [
+                    {"title": "Test Page 1"},
                     Exception("Parse error")
                 ]
+                mock_render_markdown_file.return_value = "<h1>Hello World 1</h1>"
                 
                 result = build_site(mock_logger, content_dir, self.temp_dir, "templates/base.html")
                 
@@ -150,6 +156,144 @@ class TestHTMLBuilder(unittest.TestCase):
                 self.assertEqual(error_count, 1)
                 mock_logger.error.assert_called()
 
+    def _write_pages(self, content_dir, count):
+        """Write numbered markdown pages with slugs into content_dir."""
+        os.makedirs(content_dir, exist_ok=True)
+        for i in range(count):
+            with open(os.path.join(content_dir, f"page{i}.md"), 'w', encoding='utf-8') as f:
+                f.write(f"---\ntitle: Page {i}\nslug: page{i}\n---\n\n# Page {i}\n\nBody {i}.")
+
+    def _read_outputs(self, output_dir):
+        """Return a mapping of relative path to contents for every built page."""
+        outputs = {}
+        for root, _, files in os.walk(output_dir):
+            for name in files:
+                if name.endswith(".html"):
+                    path = os.path.join(root, name)
+                    with open(path, encoding='utf-8') as f:
+                        outputs[os.path.relpath(path, output_dir)] = f.read()
+        return outputs
+
+    def test_build_site_parallel_matches_serial(self):
+        """Test that parsing with several processes produces identical pages."""
+        from src.builder.html import build_site
+
+        content_dir = os.path.join(self.temp_dir, "content")
+        self._write_pages(content_dir, 12)
+        serial_dir = os.path.join(self.temp_dir, "serial")
+        parallel_dir = os.path.join(self.temp_dir, "parallel")
+
+        with patch('builtins.print'):
+            serial = build_site(MagicMock(), content_dir, serial_dir, "templates/base.html", jobs=1)
+            parallel = build_site(MagicMock(), content_dir, parallel_dir, "templates/base.html", jobs=3)
+
+        self.assertEqual(serial, (12, 0))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(self._read_outputs(parallel_dir), self._read_outputs(serial_dir))
+
+    def test_build_site_parallel_counts_errors(self):
+        """Test that files failing in worker processes are counted as errors."""
+        from src.builder.html import build_site
+
+        content_dir = os.path.join(self.temp_dir, "content")
+        self._write_pages(content_dir, 4)
+        with open(os.path.join(content_dir, "broken.md"), 'wb') as f:
+            f.write(b"---\ntitle: Broken\nslug: broken\n---\n\xff\xfe invalid utf-8")
+
+        mock_logger = MagicMock()
+        with patch('builtins.print'):
+            result = build_site(mock_logger, content_dir, os.path.join(self.temp_dir, "dist"),
+                                "templates/base.html", jobs=2)
+
+        self.assertEqual(result, (4, 1))
+        mock_logger.error.assert_called()
+
+    def test_build_site_does_not_print(self):
+        """Test that building reports through the logger only."""
+        from src.builder.html import build_site
+
+        content_dir = os.path.join(self.temp_dir, "content")
+        self._write_pages(content_dir, 2)
+        with patch('builtins.print') as mock_print:
+            result = build_site(MagicMock(), content_dir, os.path.join(self.temp_dir, "dist"),
+                                "templates/base.html")
+
+        self.assertEqual(result, (2, 0))
+        mock_print.assert_not_called()
+
+    def test_build_site_parallel_bounded_chunks(self):
+        """Test that pages stay in order when rendered in many small worker chunks."""
+        from src.builder.html import build_site
+
+        content_dir = os.path.join(self.temp_dir, "content")
+        self._write_pages(content_dir, 9)
+        serial_dir = os.path.join(self.temp_dir, "serial")
+        parallel_dir = os.path.join(self.temp_dir, "parallel")
+
+        with patch('builtins.print'), patch('src.builder.html.MAX_RENDER_CHUNK_SIZE', 1):
+            serial = build_site(MagicMock(), content_dir, serial_dir, "templates/base.html", jobs=1)
+            parallel = build_site(MagicMock(), content_dir, parallel_dir, "templates/base.html", jobs=2)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(self._read_outputs(parallel_dir), self._read_outputs(serial_dir))
+
+
+class TestStreamingBuild(unittest.TestCase):
+    """Memory regression tests for the streaming build."""
+
+    PARAGRAPH = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod. " * 1000
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        with open(self.template_file, "w", encoding="utf-8") as f:
+            f.write("<html><title>{title}</title>{navigation}{description}<body>{content}</body></html>")
+        self.logger = logging.getLogger("static_site_generator.tests.streaming")
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.propagate = False
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _peak_build_memory(self, pages, name=None):
+        """Build a corpus of large pages and return (peak traced bytes, output bytes)."""
+        from pathlib import Path
+        from src.builder.html import build_site
+        name = name or str(pages)
+        content_dir = os.path.join(self.temp_dir, f"content-{name}")
+        output_dir = os.path.join(self.temp_dir, f"dist-{name}")
+        # Pages live in a section so they do not appear in the navigation
+        section = os.path.join(content_dir, "posts")
+        os.makedirs(section)
+        for i in range(pages):
+            with open(os.path.join(section, f"post-{i}.md"), "w", encoding="utf-8") as f:
+                f.write(f"---\ntitle: Post {i}\nslug: post-{i}\n---\n\n{self.PARAGRAPH}\n")
+        # A plain function: a Mock would keep every printed argument alive
+        with patch('builtins.print', lambda *args, **kwargs: None):
+            tracemalloc.start()
+            try:
+                result = build_site(self.logger, content_dir, output_dir, self.template_file)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertEqual(result, (pages, 0))
+        output_bytes = sum(path.stat().st_size for path in Path(output_dir).rglob("*.html"))
+        return peak, output_bytes
+
+    def test_peak_memory_does_not_grow_with_rendered_size(self):
+        """Test that rendered bodies are released as pages are written."""
+        # Warm up so one-off allocations (converter, caches, growth of the
+        # interpreter's interned string table) are not measured
+        self._peak_build_memory(25, "warmup")
+        small_peak, small_output = self._peak_build_memory(5)
+        large_peak, large_output = self._peak_build_memory(25)
+        # Holding every body until the end would grow the peak by at least
+        # the extra output size; the streaming build only keeps a small record
+        self.assertLess(large_peak - small_peak, (large_output - small_output) / 4)
+
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for the builder minify module and minified builds.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import ANY, MagicMock
+
+from src.builder.html import build_site
+from src.builder.minify import in_raw_element, minify_html
+
+TEMPLATE_FILE = "templates/base.html"
+
+
+class TestMinifyHTML(unittest.TestCase):
+    """Test cases for minify_html."""
+
+    def test_collapses_text_and_drops_space_around_blocks(self):
+        """Test that whitespace collapses and disappears next to block tags."""
+        html = "<div>\n  <p>Some   text\n  over lines</p>\n  <ul>\n    <li>One</li>\n  </ul>\n</div>"
+        self.assertEqual(minify_html(html), "<div><p>Some text over lines</p><ul><li>One</li></ul></div>")
+
+    def test_keeps_space_between_inline_elements(self):
+        """Test that inline elements keep a separating space."""
+        html = "<p>\n  <a href='/a'>A</a>\n  <a href='/b'>B</a> and <b>bold</b>\n</p>"
+        self.assertEqual(minify_html(html), "<p><a href='/a'>A</a> <a href='/b'>B</a> and <b>bold</b></p>")
+
+    def test_raw_elements_untouched(self):
+        """Test that pre, code, textarea, script and style contents are kept."""
+        for html in (
+            "<pre>  indented\n    code  </pre>",
+            "<p>Run <code>a  =  1</code> now</p>",
+            "<textarea>\n  keep\n</textarea>",
+            "<script>if (a  <  b) {\n  x();\n}</script>",
+            "<style>p  {\n  color: red;\n}</style>",
+        ):
+            self.assertEqual(minify_html(html), html)
+
+    def test_hidden_elements_do_not_join_text(self):
+        """Test that a script between words does not remove their space."""
+        self.assertEqual(minify_html("one <script>x()</script> two"), "one <script>x()</script> two")
+
+    def test_comments(self):
+        """Test that comments are removed except conditional comments."""
+        html = "<p>a <!-- note --> b</p><!--[if IE]><p>old</p><![endif]-->"
+        self.assertEqual(minify_html(html), "<p>a b</p><!--[if IE]><p>old</p><![endif]-->")
+
+    def test_tags_and_attribute_values(self):
+        """Test that tags collapse while quoted values keep their whitespace."""
+        html = '<a\n   href="/x"\n   title="two  spaces"\n>link</a>'
+        self.assertEqual(minify_html(html), '<a href="/x" title="two  spaces">link</a>')
+        self.assertEqual(minify_html('<img\n  src="/a.png"\n  alt="A" />'), '<img src="/a.png" alt="A" />')
+
+    def test_replaced_elements_keep_surrounding_space(self):
+        """Test that the space around inline media, which is rendered, is kept."""
+        for tag in ("video", "audio", "iframe", "canvas"):
+            html = f'<p>Watch <{tag} src="a"></{tag}> now</p>'
+            self.assertEqual(minify_html(html), html)
+
+    def test_angle_brackets_in_text_are_not_tags(self):
+        """Test that a '<' and '>' in text do not make the space before '>' part of a tag."""
+        self.assertEqual(minify_html("<p>1 < 2  and  3 > 2</p>"), "<p>1 < 2 and 3 > 2</p>")
+        self.assertEqual(minify_html("<p>a >  b</p>"), "<p>a > b</p>")
+
+    def test_non_breaking_space_is_content(self):
+        """Test that only ASCII whitespace is collapsed."""
+        self.assertEqual(minify_html("<p>a\u00a0 b</p>"), "<p>a\u00a0 b</p>")
+
+    def test_head_whitespace_removed(self):
+        """Test that whitespace between head elements is dropped."""
+        html = "<html>\n<head>\n  <meta charset='utf-8' />\n  <link rel='icon' href='/i' />\n</head>\n</html>"
+        self.assertEqual(minify_html(html), "<html><head><meta charset='utf-8' /><link rel='icon' href='/i' /></head></html>")
+
+    def test_fragments_join_like_whole_page(self):
+        """Test that minifying template and body separately matches the whole page."""
+        template = Path(TEMPLATE_FILE).read_text(encoding="utf-8")
+        body = "<h1>Title</h1>\n<p>Text with <a href='/x'>a link</a>.</p>\n<pre><code>x  =  1\n</code></pre>\n"
+        whole = minify_html(template.replace("{content}", body))
+        pieces = minify_html(template).replace("{content}", minify_html(body))
+        self.assertEqual(pieces, whole)
+
+    def test_in_raw_element(self):
+        """Test detecting placeholders inside raw elements."""
+        self.assertTrue(in_raw_element("<pre>{content}</pre>", "{content}"))
+        self.assertFalse(in_raw_element("<main>{content}</main>", "{content}"))
+
+
+class TestMinifiedBuild(unittest.TestCase):
+    """Test cases for build_site with minify set."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        os.makedirs(self.content_dir)
+        for i in range(6):
+            Path(self.content_dir, f"page{i}.md").write_text(
+                f"---\ntitle: Page {i}\nslug: page{i}\n---\n\n# Page {i}\n\nSome *text*\nover lines.\n\n"
+                "```\nx  =  1\n```\n", encoding="utf-8")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def build(self, name, **options):
+        """Build the content into a named output directory and return the logger."""
+        logger = MagicMock()
+        output_dir = os.path.join(self.temp_dir, name)
+        self.assertEqual(build_site(logger, self.content_dir, output_dir, TEMPLATE_FILE, **options), (6, 0))
+        return logger
+
+    def read(self, name, page):
+        """Read a built page."""
+        return Path(self.temp_dir, name, page, "index.html").read_text(encoding="utf-8")
+
+    def test_minified_pages_match_minified_full_pages(self):
+        """Test that pieces minified separately give the same pages as minifying whole pages."""
+        self.build("plain")
+        logger = self.build("minified", minify=True)
+        for i in range(6):
+            self.assertEqual(self.read("minified", f"page{i}"), minify_html(self.read("plain", f"page{i}")))
+        self.assertIn("<pre><code>x  =  1\n</code></pre>", self.read("minified", "page0"))
+
+        saved = sum(
+            len(self.read("plain", f"page{i}").encode("utf-8")) - len(self.read("minified", f"page{i}").encode("utf-8"))
+            for i in range(6)
+        )
+        logger.info.assert_any_call("✅ Minified %d pages: %d bytes saved (%.1f%%)", 6, saved, ANY)
+
+    def test_parallel_minified_build_matches_serial(self):
+        """Test that bodies minified in worker processes give identical pages."""
+        self.build("serial", minify=True)
+        self.build("parallel", minify=True, jobs=2)
+        for i in range(6):
+            self.assertEqual(self.read("parallel", f"page{i}"), self.read("serial", f"page{i}"))
+
+    def test_content_inside_raw_template_element_is_not_minified(self):
+        """Test that a template wrapping content in <pre> disables minification."""
+        template_file = os.path.join(self.temp_dir, "pre.html")
+        Path(template_file).write_text("<html><body>{navigation}<pre>{content}</pre></body></html>", encoding="utf-8")
+        logger = MagicMock()
+        output_dir = os.path.join(self.temp_dir, "dist")
+        build_site(logger, self.content_dir, output_dir, template_file, minify=True)
+        logger.warning.assert_any_call(ANY)
+        self.assertIn("Some <em>text</em>\nover lines.", Path(output_dir, "page0", "index.html").read_text(encoding="utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the builder navigation module.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+from src.builder.navigation import (
+    generate_navigation,
+    generate_navigation_html,
+    build_navigation,
+    format_display_name,
+)
+
+
+def reference_navigation_html(base_pages, current_url):
+    """The per-page navigation renderer the Navigation object replaced."""
+    base_pages = sorted(base_pages, key=lambda x: x['title'])
+    html = '<nav class="site-navigation">\n'
+    html += '<div class="nav-logo"><a href="/">Jgrove</a></div>\n'
+    html += '<div class="nav-links">'
+    if base_pages:
+        for page in base_pages:
+            current_class = ' class="current"' if page['url'] == current_url else ''
+            html += f'  <a href="{page["url"]}"{current_class}>{format_display_name(page["title"])}</a>\n'
+        html += '  <div class="nav-folder">\n'
+        html += '    <span class="nav-folder-title"></span>\n'
+        html += '    <div class="nav-folder-dropdown">\n'
+        for page in base_pages:
+            current_class = ' class="current"' if page['url'] == current_url else ''
+            html += f'      <a href="{page["url"]}"{current_class}>{format_display_name(page["title"])}</a>\n'
+        html += '    </div>\n'
+        html += '  </div>\n'
+    html += '</div>\n'
+    html += '</nav>\n'
+    return html
+
+
+class TestNavigation(unittest.TestCase):
+    """Test cases for navigation generation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        pages_info = [
+            {'title': 'tech', 'url_path': '/tech'},
+            {'title': 'Home', 'url_path': '/'},
+            {'title': 'life_and_running', 'url_path': '/life'},
+            {'title': 'Nested', 'url_path': '/tech/nested'},
+            {'title': 'Alias', 'url_path': '/tech'},
+        ]
+        self.base_pages = generate_navigation(pages_info, MagicMock())
+
+    def test_generate_navigation_keeps_base_pages_only(self):
+        """Test that nested pages are left out of the navigation."""
+        self.assertEqual([page['url'] for page in self.base_pages], ['/tech', '/', '/life', '/tech'])
+
+    def test_render_matches_reference_for_every_url(self):
+        """Test that pre-rendered navigation is byte-identical to per-page rendering."""
+        navigation = build_navigation(self.base_pages)
+        for url in ['/', '/tech', '/life', '/tech/nested', '/missing']:
+            self.assertEqual(navigation.render(url), reference_navigation_html(self.base_pages, url))
+
+    def test_render_marks_every_link_to_current_url(self):
+        """Test that duplicate links to the current page are all marked."""
+        html = build_navigation(self.base_pages).render('/tech')
+        self.assertEqual(html.count(' class="current"'), 4)
+
+    def test_render_empty_navigation(self):
+        """Test navigation with no base pages."""
+        self.assertEqual(build_navigation([]).render('/'), reference_navigation_html([], '/'))
+
+    def test_generate_navigation_html_wrapper(self):
+        """Test that generate_navigation_html still renders a single page."""
+        self.assertEqual(generate_navigation_html(self.base_pages, '/life'),
+                         reference_navigation_html(self.base_pages, '/life'))
+
+
+if __name__ == '__main__':
+    unittest.main()
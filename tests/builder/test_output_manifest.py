@@ -0,0 +1,153 @@
+"""
+Unit tests for the builder output manifest module and deploy deltas.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.builder.html import build_site
+from src.builder.output_manifest import discover_outputs, load_output_manifest, write_output_manifest
+from src.builder.cache import hash_text
+from src.builder.staging import build_state_dir
+from src.config.default import DEPLOY_DELTA_FILE
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+class TestWriteOutputManifest(unittest.TestCase):
+    """Test cases for comparing a staged build with the live output."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "dist"
+        self.staging_dir = self.temp_dir / "release"
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, root, files):
+        """Write a tree of text files."""
+        for rel_path, text in files.items():
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def test_hidden_files_are_left_out(self):
+        """Test that build state files are not part of the manifest."""
+        self.write(self.staging_dir, {"index.html": "home", ".build-manifest.json": "{}", ".git/HEAD": "x"})
+        self.assertEqual(discover_outputs(self.staging_dir), ["index.html"])
+
+    def test_manifest_and_delta(self):
+        """Test that files are recorded with their hash and compared with the live manifest."""
+        self.write(self.output_dir, {"a.html": "same", "b.html": "old", "gone.html": "x"})
+        write_output_manifest(self.output_dir, self.temp_dir / "none", self.logger)
+        self.write(self.staging_dir, {"a.html": "same", "b.html": "new", "c/index.html": "added"})
+
+        delta = write_output_manifest(self.staging_dir, self.output_dir, self.logger)
+        self.assertEqual(delta, {'added': ["c/index.html"], 'modified': ["b.html"], 'removed': ["gone.html"]})
+        manifest = load_output_manifest(self.staging_dir)
+        self.assertEqual(sorted(manifest), ["a.html", "b.html", "c/index.html"])
+        self.assertEqual(manifest["b.html"]['hash'], hash_text("new"))
+        self.assertEqual(manifest["b.html"]['size'], 3)
+        self.assertEqual(
+            json.loads((build_state_dir(self.staging_dir) / DEPLOY_DELTA_FILE).read_text(encoding="utf-8")), delta)
+        self.assertEqual(os.listdir(self.staging_dir / "c"), ["index.html"])
+        self.assertEqual(sorted(os.listdir(self.staging_dir)), ["a.html", "b.html", "c"])
+
+    def test_identical_file_keeps_previous_file(self):
+        """Test that a rewritten file with unchanged bytes is replaced by the live file."""
+        self.write(self.output_dir, {"a.html": "same"})
+        write_output_manifest(self.output_dir, self.temp_dir / "none", self.logger)
+        live = (self.output_dir / "a.html").stat()
+        self.write(self.staging_dir, {"a.html": "same"})
+
+        write_output_manifest(self.staging_dir, self.output_dir, self.logger)
+        staged = (self.staging_dir / "a.html").stat()
+        self.assertEqual((staged.st_ino, staged.st_mtime_ns), (live.st_ino, live.st_mtime_ns))
+        self.assertEqual(load_output_manifest(self.staging_dir)["a.html"]['mtime_ns'], live.st_mtime_ns)
+
+
+class TestDeployDeltaBuild(unittest.TestCase):
+    """Test cases for the output manifest and deploy delta of build_site."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "templates", "base.html")
+        os.makedirs(self.content_dir)
+        os.makedirs(os.path.dirname(self.template_file))
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        for i in range(3):
+            self.write_page(i, f"Body {i}.")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, i, body):
+        """Write a markdown page into the content directory."""
+        Path(self.content_dir, f"page{i}.md").write_text(
+            f"---\ntitle: Page {i}\nslug: page{i}\n---\n\n{body}\n", encoding="utf-8")
+
+    def build(self, pages=3, **options):
+        """Build the site and return its deploy delta."""
+        result = build_site(self.logger, self.content_dir, self.output_dir, self.template_file, **options)
+        self.assertEqual(result, (pages, 0))
+        return json.loads(Path(self.temp_dir, ".dist.build", DEPLOY_DELTA_FILE).read_text(encoding="utf-8"))
+
+    def mtimes(self):
+        """Return the modification time of every output file."""
+        return {rel_path: Path(self.output_dir, rel_path).stat().st_mtime_ns
+                for rel_path in discover_outputs(self.output_dir)}
+
+    def test_first_build_adds_everything(self):
+        """Test that without a previous manifest every file is added."""
+        delta = self.build()
+        self.assertIn("page0/index.html", delta['added'])
+        self.assertIn("sitemap.xml", delta['added'])
+        self.assertEqual(delta['added'], discover_outputs(self.output_dir))
+
+    def test_full_rebuild_keeps_unchanged_files(self):
+        """Test that a full build reports only the edited page and keeps every other mtime."""
+        self.build()
+        before = self.mtimes()
+        self.write_page(1, "Edited.")
+        delta = self.build()
+        self.assertEqual(delta, {'added': [], 'modified': ["page1/index.html"], 'removed': []})
+        after = self.mtimes()
+        self.assertNotEqual(after.pop("page1/index.html"), before.pop("page1/index.html"))
+        self.assertEqual(after, before)
+
+    def test_incremental_build_reports_removed_pages(self):
+        """Test that deleting a page lists its output as removed."""
+        self.build(incremental=True)
+        os.remove(os.path.join(self.content_dir, "page2.md"))
+        delta = self.build(pages=2, incremental=True)
+        self.assertIn("page2/index.html", delta['removed'])
+        self.assertEqual(delta['added'], [])
+
+    def test_build_state_is_not_published(self):
+        """Test that manifests stay out of the served tree and move with the release."""
+        self.build(incremental=True, link_assets=True)
+        published = [path.name for path in Path(self.output_dir).rglob("*") if path.name.startswith(".")]
+        self.assertEqual(published, [])
+        self.assertTrue(os.path.samefile(Path(self.temp_dir, ".dist.build"), build_state_dir(self.output_dir)))
+        self.assertEqual(
+            sorted(os.listdir(build_state_dir(self.output_dir))),
+            ["asset-manifest.json", "build-manifest.json", "deploy-delta.json", "output-manifest.json"]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
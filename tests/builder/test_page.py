@@ -0,0 +1,39 @@
+"""
+Unit tests for the builder page module.
+"""
+
+import unittest
+from pathlib import Path
+
+from src.builder.page import PageRecord
+
+
+class TestPageRecord(unittest.TestCase):
+    """Test cases for the per-page build record."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.record = PageRecord("Tech", "/tech", Path("dist/tech/index.html"), Path("content/tech.md"))
+
+    def test_record_has_no_instance_dict(self):
+        """Test that records use slots and cannot grow extra fields."""
+        self.assertFalse(hasattr(self.record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.record.html_body = "<p>body</p>"
+
+    def test_mapping_access(self):
+        """Test that fields can be read like a page dict."""
+        self.assertEqual(self.record['title'], "Tech")
+        self.assertEqual(self.record['url_path'], "/tech")
+        with self.assertRaises(KeyError):
+            self.record['frontmatter']
+
+    def test_defaults(self):
+        """Test the defaults of optional fields."""
+        self.assertIsNone(self.record.description)
+        self.assertFalse(self.record.cached)
+        self.assertTrue(self.record.render)
+
+
+if __name__ == '__main__':
+    unittest.main()
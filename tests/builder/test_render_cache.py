@@ -0,0 +1,233 @@
+"""
+Unit tests for the builder render cache module and cached builds.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+from itertools import count
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder import html
+from src.builder.cache import hash_file
+from src.builder.html import build_site
+from src.builder.render_cache import RenderCache
+from src.builder.staging import remove_output
+from src.config.default import MAX_RENDER_CHUNK_SIZE
+
+TEMPLATE = ('<html><title>{title}</title><meta name="description" content="{description}">'
+            '<nav>{navigation}</nav><body>{content}</body></html>')
+
+
+class TestRenderCache(unittest.TestCase):
+    """Test cases for storing and evicting render cache entries."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir, "cache", "render.sqlite3")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_entries_persist_across_opens(self):
+        """Test that frontmatter and HTML are read back by a later build."""
+        cache = RenderCache(self.logger, self.path)
+        key = cache.key("abc")
+        cache.put_frontmatter(key, {'title': "Post", 'date': date(2025, 1, 2)})
+        self.assertFalse(cache.has_html(key))
+        cache.put_html(key, "<p>Body</p>")
+        cache.close()
+
+        cache = RenderCache(self.logger, self.path)
+        self.assertEqual(cache.frontmatter(key), {'title': "Post", 'date': date(2025, 1, 2)})
+        self.assertEqual(cache.html(key), ({'title': "Post", 'date': date(2025, 1, 2)}, "<p>Body</p>"))
+        self.assertIsNone(cache.html(cache.key("other")))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_html_is_stored_without_cached_frontmatter(self):
+        """Test that a body is cached for a key with no frontmatter entry yet."""
+        cache = RenderCache(self.logger, self.path)
+        cache.put_html("a", "<p>A</p>", {'title': "A"})
+        self.assertEqual(cache.html("a"), ({'title': "A"}, "<p>A</p>"))
+        cache.put_html("a", "<p>Again</p>")
+        self.assertEqual(cache.html("a"), ({'title': "A"}, "<p>Again</p>"))
+        with self.assertRaises(sqlite3.IntegrityError):
+            cache.put_html("b", "<p>B</p>")
+        cache.close()
+
+    def test_writes_are_committed_per_chunk(self):
+        """Test that another connection can write while a build is filling the cache."""
+        cache = RenderCache(self.logger, self.path)
+        for i in range(MAX_RENDER_CHUNK_SIZE):
+            cache.put_frontmatter(f"page{i}", {})
+        other = RenderCache(self.logger, self.path)
+        other.connection.execute("PRAGMA busy_timeout = 0")
+        other.put_frontmatter("other", {})
+        other.close()
+        self.assertEqual(cache.stats()['entries'], MAX_RENDER_CHUNK_SIZE + 1)
+        cache.close()
+
+    def test_key_depends_on_markdown_extensions(self):
+        """Test that changing the markdown extensions invalidates every entry."""
+        cache = RenderCache(self.logger, self.path)
+        with patch("src.builder.render_cache.MARKDOWN_EXTENSIONS", ["extra"]):
+            other = RenderCache(self.logger, self.path)
+        self.assertNotEqual(cache.key("abc"), other.key("abc"))
+        other.close()
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that closing the cache keeps the most recently used entries within max_bytes."""
+        with patch("src.builder.render_cache.time.time", side_effect=count()):
+            cache = RenderCache(self.logger, self.path, max_bytes=2500)
+            for name in ("a", "b", "c"):
+                cache.put_frontmatter(name, {})
+                cache.put_html(name, "x" * 1000)
+            cache.frontmatter("a")
+            cache.close()
+
+        cache = RenderCache(self.logger, self.path)
+        self.assertEqual([cache.has_html(name) for name in ("a", "b", "c")], [True, False, True])
+        cache.close()
+        self.logger.info.assert_any_call("Evicted %d entries from the render cache", 1)
+
+    def test_stats_and_clear(self):
+        """Test that stats count entries and clear removes them."""
+        cache = RenderCache(self.logger, self.path)
+        cache.put_frontmatter("a", {'title': "A"})
+        cache.put_html("a", "<p>A</p>")
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertGreater(stats['bytes'], len("<p>A</p>"))
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+        cache.close()
+
+    def test_unreadable_database_is_replaced(self):
+        """Test that a corrupt cache file is discarded instead of failing the build."""
+        self.path.parent.mkdir(parents=True)
+        self.path.write_bytes(b"not a database" * 100)
+        cache = RenderCache(self.logger, self.path)
+        self.assertEqual(cache.stats()['entries'], 0)
+        cache.close()
+        self.logger.warning.assert_called_once()
+
+    def test_schema_version_change_empties_cache(self):
+        """Test that entries written by another cache version are dropped."""
+        cache = RenderCache(self.logger, self.path)
+        cache.put_frontmatter("a", {})
+        cache.close()
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("PRAGMA user_version = 0")
+        cache = RenderCache(self.logger, self.path)
+        self.assertIsNone(cache.frontmatter("a"))
+        cache.close()
+
+
+class TestCachedBuild(unittest.TestCase):
+    """Test cases for build_site with a render cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        self.cache_path = os.path.join(self.temp_dir, ".cache", "render.sqlite3")
+        os.makedirs(self.content_dir)
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        for i in range(4):
+            self.write_page(i, f"Body of page {i}.")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, i, body):
+        """Write a markdown page into the content directory."""
+        Path(self.content_dir, f"page{i}.md").write_text(
+            f"---\ntitle: Page {i}\nslug: page{i}\ndescription: About {i}\n---\n\n{body}\n", encoding="utf-8")
+
+    def build(self, **options):
+        """Build the site with a freshly opened render cache and return the output pages."""
+        render_cache = RenderCache(self.logger, self.cache_path)
+        try:
+            result = build_site(self.logger, self.content_dir, self.output_dir, self.template_file,
+                                render_cache=render_cache, **options)
+        finally:
+            render_cache.close()
+        self.assertEqual(result, (4, 0))
+        return {
+            path.relative_to(self.output_dir).as_posix(): path.read_text(encoding="utf-8")
+            for path in Path(self.output_dir).rglob("index.html")
+        }
+
+    def test_cached_build_skips_parsing(self):
+        """Test that a build into an empty output reads nothing but the cache."""
+        first = self.build()
+        remove_output(self.output_dir)
+        with patch.object(html, "read_frontmatter", wraps=html.read_frontmatter) as read_frontmatter, \
+                patch.object(html, "render_markdown_file", wraps=html.render_markdown_file) as render_file:
+            second = self.build()
+        read_frontmatter.assert_not_called()
+        render_file.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertIn('<meta name="description" content="About 0">', second["page0/index.html"])
+        self.logger.info.assert_any_call("✅ Render cache: %d bodies reused, %d rendered", 4, 0)
+
+    def test_changed_source_is_parsed_again(self):
+        """Test that only the edited page misses the cache."""
+        self.build()
+        self.write_page(2, "Edited body.")
+        with patch.object(html, "render_markdown_file", wraps=html.render_markdown_file) as render_file:
+            pages = self.build()
+        self.assertEqual([call.args[0].name for call in render_file.call_args_list], ["page2.md"])
+        self.assertIn("<p>Edited body.</p>", pages["page2/index.html"])
+
+    def test_template_change_reuses_cached_bodies(self):
+        """Test that pages reused from the build manifest are rebuilt from the cache."""
+        self.build(incremental=True)
+        Path(self.template_file).write_text(TEMPLATE.replace("<nav>", "<nav class='site'>"), encoding="utf-8")
+        with patch.object(html, "read_frontmatter", wraps=html.read_frontmatter) as read_frontmatter, \
+                patch.object(html, "render_markdown_file", wraps=html.render_markdown_file) as render_file:
+            pages = self.build(incremental=True)
+        read_frontmatter.assert_not_called()
+        render_file.assert_not_called()
+        self.assertIn('content="About 1"><nav class=\'site\'>', pages["page1/index.html"])
+
+    def test_reused_pages_rendered_again_are_cached(self):
+        """Test that manifest-reused pages rendered for a template change store their bodies."""
+        self.build(incremental=True)
+        shutil.rmtree(os.path.dirname(self.cache_path))
+        Path(self.template_file).write_text(TEMPLATE.replace("<nav>", "<nav class='site'>"), encoding="utf-8")
+        self.build(incremental=True)
+        render_cache = RenderCache(self.logger, self.cache_path)
+        try:
+            self.assertEqual(render_cache.stats()['entries'], 4)
+            fm, body = render_cache.html(render_cache.key(hash_file(Path(self.content_dir, "page1.md"))))
+        finally:
+            render_cache.close()
+        self.assertEqual((fm['description'], body), ("About 1", "<p>Body of page 1.</p>"))
+
+    def test_parallel_and_minified_builds_share_the_cache(self):
+        """Test that bodies rendered by workers are cached unminified and reused by any build."""
+        self.build(jobs=2, minify=True)
+        minified = self.build(jobs=2, minify=True)
+        plain = self.build()
+        self.logger.info.assert_any_call("✅ Render cache: %d bodies reused, %d rendered", 4, 0)
+        shutil.rmtree(os.path.dirname(self.cache_path))
+        self.assertEqual(self.build(), plain)
+        self.assertEqual(self.build(jobs=2, minify=True), minified)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Unit tests for the builder search module and search index builds.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.builder.html import build_site
+from src.builder.search import (
+    SearchIndexBuilder,
+    decode_postings,
+    encode_postings,
+    page_terms,
+    term_shard,
+    tokenize,
+)
+from src.config.default import SEARCH_INDEX_SHARDS
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+def read_index(output_dir):
+    """Load every term and document shard into {term: {doc: tf}} and {doc: [url, title]}."""
+    search_dir = Path(output_dir, "search")
+    terms = {}
+    for path in (search_dir / "terms").glob("*.json"):
+        for term, encoded in json.loads(path.read_text(encoding="utf-8")).items():
+            terms[term] = dict(decode_postings(encoded))
+    docs = {}
+    for path in (search_dir / "docs").glob("*.json"):
+        docs.update({int(doc): entry for doc, entry in json.loads(path.read_text(encoding="utf-8")).items()})
+    return terms, docs
+
+
+class TestSearchHelpers(unittest.TestCase):
+    """Test cases for tokenizing, hashing and posting encoding."""
+
+    def test_tokenize(self):
+        """Test that text is lowercased and split on non-word characters."""
+        self.assertEqual(tokenize("Hello, World! a snake_case café"), ["hello", "world", "snake", "case", "café"])
+
+    def test_page_terms(self):
+        """Test that tags are stripped, entities decoded and the title counted."""
+        terms = page_terms("Caching", "<h1>Caching</h1><p>Tom &amp; Jerry <a href='/x'>caching</a></p>")
+        self.assertEqual(terms, {"caching": 3, "tom": 1, "jerry": 1})
+
+    def test_term_shard_matches_client_hash(self):
+        """Test the shard of known terms, as computed by templates/search.js."""
+        self.assertEqual([term_shard(term, 64) for term in ["hello", "world", "café"]], [43, 19, 9])
+
+    def test_postings_roundtrip(self):
+        """Test that postings are sorted and gap encoded."""
+        encoded = encode_postings([(7, 1), (2, 3), (10, 2)])
+        self.assertEqual(encoded, [2, 3, 5, 1, 3, 2])
+        self.assertEqual(decode_postings(encoded), [(2, 3), (7, 1), (10, 2)])
+
+
+class TestSearchIndexBuilder(unittest.TestCase):
+    """Test cases for writing and updating the sharded index."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_fresh_index(self):
+        """Test that added pages get consecutive ids and postings."""
+        builder = SearchIndexBuilder(self.output_dir)
+        first = builder.add("/tech", "Tech", {"python": 2, "cache": 1})
+        second = builder.add("/life", "Life", {"python": 1})
+        state = builder.write(self.logger)
+
+        terms, docs = read_index(self.output_dir)
+        self.assertEqual((first['doc'], second['doc']), (0, 1))
+        self.assertEqual(terms["python"], {0: 2, 1: 1})
+        self.assertEqual(docs, {0: ["/tech", "Tech"], 1: ["/life", "Life"]})
+        self.assertEqual(state, {'shards': SEARCH_INDEX_SHARDS, 'next_doc': 2, 'documents': 2})
+
+    def test_update_and_remove(self):
+        """Test that replacing and removing pages only touches their shards."""
+        builder = SearchIndexBuilder(self.output_dir)
+        tech = builder.add("/tech", "Tech", {"python": 2, "cache": 1})
+        life = builder.add("/life", "Life", {"python": 1, "garden": 1})
+        state = builder.write(self.logger)
+
+        builder = SearchIndexBuilder(self.output_dir, state)
+        builder.add("/tech", "Tech", {"rust": 1}, previous_entry=tech)
+        builder.remove(life)
+        state = builder.write(self.logger)
+
+        terms, docs = read_index(self.output_dir)
+        self.assertEqual(terms, {"rust": {0: 1}})
+        self.assertEqual(docs, {0: ["/tech", "Tech"]})
+        self.assertEqual(state['documents'], 1)
+
+
+class TestSearchBuild(unittest.TestCase):
+    """Test cases for search indexes written by build_site."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        os.makedirs(self.content_dir)
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        for i in range(20):
+            self.write_page(f"post{i}.md", f"Post {i}", f"post{i}", f"Shared words and unique{i} text.")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, name, title, slug, body):
+        """Write a markdown page with frontmatter into the content directory."""
+        text = f"---\ntitle: {title}\nslug: {slug}\n---\n\n{body}\n"
+        Path(self.content_dir, name).write_text(text, encoding="utf-8")
+
+    def build(self, **options):
+        """Run a build with the search index enabled and return its result."""
+        return build_site(self.logger, self.content_dir, self.output_dir, self.template_file,
+                          search=True, **options)
+
+    def shard_inodes(self):
+        """Return the inode of every term shard."""
+        terms_dir = Path(self.output_dir, "search", "terms")
+        return {path.name: path.stat().st_ino for path in terms_dir.glob("*.json")}
+
+    def test_build_writes_index(self):
+        """Test that every page is indexed with its URL and title."""
+        self.assertEqual(self.build(), (20, 0))
+        terms, docs = read_index(self.output_dir)
+        self.assertEqual(len(terms["shared"]), 20)
+        self.assertEqual(sorted(entry[0] for entry in docs.values()),
+                         sorted(f"/post{i}" for i in range(20)))
+
+    def test_parallel_build_matches_serial(self):
+        """Test that terms extracted in worker processes give the same index."""
+        self.build()
+        serial = read_index(self.output_dir)
+        self.build(jobs=2)
+        self.assertEqual(read_index(self.output_dir), serial)
+
+    def test_incremental_change_rewrites_only_affected_shards(self):
+        """Test that changing one page only rewrites the shards of its old and new terms."""
+        self.build(incremental=True)
+        before = self.shard_inodes()
+        _, docs = read_index(self.output_dir)
+        doc = next(doc for doc, entry in docs.items() if entry[0] == "/post3")
+        self.write_page("post3.md", "Post 3", "post3", "Shared words and brandnew text.")
+        self.build(incremental=True)
+        after = self.shard_inodes()
+
+        changed = {name for name in set(before) | set(after) if before.get(name) != after.get(name)}
+        terms = {"post", "shared", "words", "and", "text", "unique3", "brandnew"}
+        expected = {f"{term_shard(term, SEARCH_INDEX_SHARDS)}.json" for term in terms}
+        # Shards whose contents come out identical are not rewritten at all
+        self.assertLessEqual(changed, expected)
+        self.assertLessEqual({f"{term_shard(term, SEARCH_INDEX_SHARDS)}.json" for term in ("unique3", "brandnew")},
+                             changed)
+        self.assertLess(len(changed), len(before))
+        terms, _ = read_index(self.output_dir)
+        self.assertNotIn("unique3", terms)
+        # The page keeps its document id
+        self.assertEqual(terms["brandnew"], {doc: 1})
+
+    def test_incremental_removal(self):
+        """Test that deleted pages are removed from the index."""
+        self.build(incremental=True)
+        os.remove(os.path.join(self.content_dir, "post0.md"))
+        self.build(incremental=True)
+        terms, docs = read_index(self.output_dir)
+        self.assertNotIn("unique0", terms)
+        self.assertEqual(len(terms["shared"]), 19)
+        self.assertNotIn("/post0", [entry[0] for entry in docs.values()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Unit tests for the builder shards module and sharded builds.
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import MagicMock
+
+from src.builder.html import build_site
+from src.builder.output_manifest import discover_outputs
+from src.builder.staging import remove_output
+from src.builder.shards import (
+    parse_shard,
+    shard_of,
+    shard_output_dir,
+    shards_path,
+    load_shard_record,
+    merge_shards,
+    discard_other_shard_sets,
+)
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+SHARDS = 3
+
+
+def build_shard(content_dir, output_dir, template_file, shard):
+    """Build one shard in a worker process, as a CI machine would."""
+    logger = logging.getLogger("static_site_generator.tests.shards")
+    return build_site(
+        logger, content_dir, shard_output_dir(output_dir, shard), template_file, shard=shard, search=True
+    )
+
+
+class TestShardHelpers(unittest.TestCase):
+    """Test cases for shard arguments and partitioning."""
+
+    def test_parse_shard(self):
+        """Test that shards are given as i/N, numbered from 1."""
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for text in ("0/4", "5/4", "2", "a/4", "2/"):
+            with self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_shard_of_is_stable_and_spread(self):
+        """Test that every source lands in one shard, always the same one."""
+        sources = [f"posts/page{i}.md" for i in range(300)]
+        shards = [shard_of(source, SHARDS) for source in sources]
+        self.assertEqual(shards, [shard_of(source, SHARDS) for source in sources])
+        for index in range(1, SHARDS + 1):
+            self.assertGreater(shards.count(index), 50)
+
+
+class TestShardedBuild(unittest.TestCase):
+    """Test cases for building shards in separate processes and merging them."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "templates", "base.html")
+        os.makedirs(os.path.join(self.content_dir, "posts"))
+        os.makedirs(os.path.dirname(self.template_file))
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        Path(self.template_file).with_name("style.css").write_text("body { color: black; }", encoding="utf-8")
+        for i in range(12):
+            self.write_page(f"posts/page{i}.md", f"Page {i}", f"page{i}", f"Post number {i} about topic{i % 4}.")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, rel_source, title, slug, body):
+        """Write a dated markdown page into the content directory."""
+        Path(self.content_dir, rel_source).write_text(
+            f"---\ntitle: {title}\nslug: {slug}\ndate: 2024-01-{len(body) % 28 + 1:02d}\n---\n\n{body}\n",
+            encoding="utf-8")
+
+    def build_shards(self, count=SHARDS):
+        """Build every shard in its own worker process."""
+        with ProcessPoolExecutor(max_workers=count) as executor:
+            futures = [
+                executor.submit(build_shard, self.content_dir, self.output_dir, self.template_file, (index, count))
+                for index in range(1, count + 1)
+            ]
+            return [future.result() for future in futures]
+
+    def shard_dirs(self, count=SHARDS):
+        """Return the output directories of every shard."""
+        return [shard_output_dir(self.output_dir, (index, count)) for index in range(1, count + 1)]
+
+    def read_tree(self, root):
+        """Return {relative path: bytes} of every site file below root."""
+        return {rel_path: Path(root, rel_path).read_bytes() for rel_path in discover_outputs(root)}
+
+    def test_merge_matches_single_build(self):
+        """Test that N merged shards give exactly the site of one build."""
+        single_dir = os.path.join(self.temp_dir, "single")
+        self.assertEqual(
+            build_site(self.logger, self.content_dir, single_dir, self.template_file, search=True), (12, 0)
+        )
+
+        results = self.build_shards()
+        self.assertEqual(sum(processed for processed, _ in results), 12)
+        self.assertEqual([errors for _, errors in results], [0] * SHARDS)
+        built = [len(load_shard_record(shard_dir)['pages']) for shard_dir in self.shard_dirs()]
+        self.assertEqual(sum(built), 12)
+        for shard_dir, pages in zip(self.shard_dirs(), built):
+            # Only its own pages, but every shared file
+            self.assertEqual(len(list(Path(shard_dir).rglob("index.html"))), pages)
+            self.assertTrue(Path(shard_dir, "style.css").exists())
+
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (12, 0))
+        self.assertEqual(self.read_tree(self.output_dir), self.read_tree(single_dir))
+
+    def test_frontmatter_error_counted_once(self):
+        """Test that a broken page fails only the shard that owns it."""
+        Path(self.content_dir, "posts", "broken.md").write_text(
+            "---\ntitle: Broken\nslug: 5\n---\n\nBody\n", encoding="utf-8")
+        results = self.build_shards()
+        self.assertEqual(sum(errors for _, errors in results), 1)
+        owner = shard_of("posts/broken.md", SHARDS)
+        self.assertIsNone(load_shard_record(self.shard_dirs()[owner - 1]))
+
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir)[1], 1)
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    def test_shard_with_failed_page_is_not_merged(self):
+        """Test that a shard that published without a failed page fails the merge."""
+        # In the shard of page0, so the shard still builds pages and publishes them
+        owner = shard_of("posts/page0.md", SHARDS)
+        broken = next(f"posts/broken{i}.md" for i in range(100) if shard_of(f"posts/broken{i}.md", SHARDS) == owner)
+        Path(self.content_dir, broken).write_bytes(b"---\ntitle: Broken\nslug: broken\n---\n\xff")
+        results = self.build_shards()
+        self.assertEqual(results[owner - 1][1], 1)
+        record = load_shard_record(self.shard_dirs()[owner - 1])
+        self.assertEqual((record['error_count'], record['failed']), (1, [broken]))
+
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (0, 1))
+        self.assertIn(broken, str(self.logger.error.call_args))
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    def test_incomplete_shards_are_not_merged(self):
+        """Test that a missing shard leaves the output unchanged."""
+        self.build_shards()
+        remove_output(self.shard_dirs()[1])
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (0, 1))
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs()[::2], self.output_dir), (0, 1))
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    def test_shards_of_different_builds_are_not_merged(self):
+        """Test that shards built with other options or content are refused."""
+        self.build_shards()
+        self.write_page("posts/page0.md", "Renamed", "page0", "Post number 0.")
+        build_shard(self.content_dir, self.output_dir, self.template_file, (1, SHARDS))
+        # Both other shards disagree with the rebuilt one
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (0, 2))
+        self.assertIn("navigation", str(self.logger.error.call_args))
+
+    def test_shards_of_different_contents_are_not_merged(self):
+        """Test that a shard built before a body was edited is refused, even with the same navigation."""
+        self.build_shards()
+        self.write_page("posts/page0.md", "Page 0", "page0", "Post number 0 about something else.")
+        build_shard(self.content_dir, self.output_dir, self.template_file, (1, SHARDS))
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (0, 2))
+        self.assertIn("content", str(self.logger.error.call_args))
+        self.assertFalse(os.path.exists(self.output_dir))
+
+    def test_shards_of_another_split_are_removed(self):
+        """Test that starting a split into N shards removes the shards of any other split."""
+        self.build_shards(count=2)
+        discard_other_shard_sets(self.output_dir, SHARDS, self.logger)
+        self.assertEqual(os.listdir(shards_path(self.output_dir)), [])
+        self.build_shards()
+        discard_other_shard_sets(self.output_dir, SHARDS, self.logger)
+        self.assertEqual(
+            sorted(path.name for path in shards_path(self.output_dir).iterdir() if not path.name.startswith(".")),
+            [f"{index}-of-{SHARDS}" for index in range(1, SHARDS + 1)])
+
+    def test_conflicting_shared_file_is_not_merged(self):
+        """Test that a file two shards disagree about fails the merge."""
+        self.build_shards()
+        Path(self.shard_dirs()[2], "style.css").write_text("body { color: red; }", encoding="utf-8")
+        self.assertEqual(merge_shards(self.logger, self.shard_dirs(), self.output_dir), (0, 1))
+        self.assertFalse(os.path.exists(self.output_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
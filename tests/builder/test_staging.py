@@ -0,0 +1,232 @@
+"""
+Unit tests for the builder staging module and staged builds.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder.html import build_site
+from src.builder import staging
+from src.builder.staging import (
+    LOCK_FILE,
+    build_state_dir,
+    link_tree,
+    prepare_staging,
+    releases_path,
+    remove_output,
+    staging_path,
+    swap_into_place,
+    write_build_state,
+    write_output,
+)
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+class TestStaging(unittest.TestCase):
+    """Test cases for the staging helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = Path(self.temp_dir, "dist")
+        (self.output_dir / "tech").mkdir(parents=True)
+        (self.output_dir / "tech" / "index.html").write_text("old", encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_staging_path_is_new_release(self):
+        """Test that each build gets its own release next to the output directory."""
+        self.assertEqual(releases_path(self.output_dir), Path(self.temp_dir, ".dist.releases"))
+        self.assertEqual(staging_path(self.output_dir).parent, releases_path(self.output_dir))
+
+    def test_link_tree_hardlinks_files(self):
+        """Test that every file is linked rather than copied."""
+        dest = Path(self.temp_dir, "copy")
+        self.assertEqual(link_tree(self.output_dir, dest), (1, 0))
+        self.assertTrue(os.path.samefile(self.output_dir / "tech" / "index.html",
+                                         dest / "tech" / "index.html"))
+
+    def test_write_output_leaves_linked_file_untouched(self):
+        """Test that writing a staged file does not change the live output."""
+        staging_dir = prepare_staging(self.output_dir, self.logger, reuse=True)
+        write_output(staging_dir / "tech" / "index.html", "new")
+        self.assertEqual((self.output_dir / "tech" / "index.html").read_text(encoding="utf-8"), "old")
+        self.assertEqual((staging_dir / "tech" / "index.html").read_text(encoding="utf-8"), "new")
+
+    def test_write_output_skips_identical_contents(self):
+        """Test that a file already holding the text is not replaced."""
+        path = self.output_dir / "tech" / "index.html"
+        before = path.stat()
+        self.assertFalse(write_output(path, "old"))
+        self.assertEqual(path.stat().st_ino, before.st_ino)
+        self.assertTrue(write_output(path, "new"))
+        self.assertNotEqual(path.stat().st_ino, before.st_ino)
+
+    def test_write_output_links_identical_previous_file(self):
+        """Test that a file identical to the previous build is hardlinked from it."""
+        previous = self.output_dir / "tech" / "index.html"
+        staging_dir = prepare_staging(self.output_dir, self.logger)
+        self.assertFalse(write_output(staging_dir / "same.html", "old", previous))
+        self.assertTrue(os.path.samefile(staging_dir / "same.html", previous))
+        self.assertTrue(write_output(staging_dir / "other.html", "new", previous))
+        self.assertEqual(previous.read_text(encoding="utf-8"), "old")
+
+    def test_swap_flips_symlink(self):
+        """Test that the output directory becomes a symlink to the new release."""
+        staging_dir = prepare_staging(self.output_dir, self.logger)
+        (staging_dir / "index.html").write_text("new", encoding="utf-8")
+        swap_into_place(staging_dir, self.output_dir, self.logger)
+        self.assertTrue(self.output_dir.is_symlink())
+        self.assertTrue(os.path.samefile(self.output_dir, staging_dir))
+        self.assertEqual(os.listdir(self.output_dir), ["index.html"])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), [".dist.releases", "dist"])
+
+    def test_output_exists_throughout_swap(self):
+        """Test that the output directory is replaced in one rename, never removed."""
+        first = prepare_staging(self.output_dir, self.logger)
+        swap_into_place(first, self.output_dir, self.logger)
+        second = prepare_staging(self.output_dir, self.logger)
+        replace = os.replace
+
+        def checked_replace(source, dest):
+            self.assertTrue(os.path.isdir(self.output_dir))
+            replace(source, dest)
+        with patch.object(staging.os, "replace", side_effect=checked_replace), \
+                patch.object(staging.os, "rename", side_effect=AssertionError("renamed")):
+            swap_into_place(second, self.output_dir, self.logger)
+        self.assertTrue(os.path.samefile(self.output_dir, second))
+
+    def test_swap_keeps_previous_release_only(self):
+        """Test that the previous release and its state are kept and older or abandoned ones are removed."""
+        releases = []
+        for _ in range(3):
+            releases.append(prepare_staging(self.output_dir, self.logger))
+            write_build_state(releases[-1], "state.json", "{}")
+            swap_into_place(releases[-1], self.output_dir, self.logger)
+        abandoned = prepare_staging(self.output_dir, self.logger)
+        latest = prepare_staging(self.output_dir, self.logger)
+        write_build_state(latest, "state.json", "{}")
+        swap_into_place(latest, self.output_dir, self.logger)
+        self.assertEqual(
+            sorted(releases_path(self.output_dir).iterdir()),
+            sorted([releases[-1], latest, build_state_dir(releases[-1]), build_state_dir(latest),
+                    releases_path(self.output_dir) / LOCK_FILE])
+        )
+        self.assertFalse(abandoned.exists())
+        self.assertTrue(os.path.samefile(Path(self.temp_dir, ".dist.build"), build_state_dir(latest)))
+
+    def test_swap_keeps_releases_of_running_builds(self):
+        """Test that a release another running process is still building is not pruned."""
+        # The parent process is running, like a second build of the same output
+        running = releases_path(self.output_dir) / f"20240101T000000.000000-{os.getppid()}"
+        running.mkdir(parents=True)
+        write_build_state(running, "state.json", "{}")
+        for _ in range(3):
+            swap_into_place(prepare_staging(self.output_dir, self.logger), self.output_dir, self.logger)
+        self.assertTrue(running.is_dir())
+        self.assertTrue(build_state_dir(running).is_dir())
+
+    def test_prepare_restores_interrupted_legacy_swap(self):
+        """Test that a site left in .dist.previous by the rename-based swap is restored, not deleted."""
+        os.rename(self.output_dir, Path(self.temp_dir, ".dist.previous"))
+        Path(self.temp_dir, ".dist.staging").mkdir()
+        prepare_staging(self.output_dir, self.logger)
+        self.assertEqual((self.output_dir / "tech" / "index.html").read_text(encoding="utf-8"), "old")
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), [".dist.releases", "dist"])
+
+    def test_remove_output(self):
+        """Test that removing the output removes every release with it."""
+        swap_into_place(prepare_staging(self.output_dir, self.logger), self.output_dir, self.logger)
+        remove_output(self.output_dir)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+class TestStagedBuild(unittest.TestCase):
+    """Test cases for staged builds in build_site."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "base.html")
+        os.makedirs(self.content_dir)
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        self.write_page("tech.md", "---\ntitle: Tech\nslug: tech\n---\n\nTech body\n")
+        self.write_page("life.md", "---\ntitle: Life\nslug: life\n---\n\nLife body\n")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, name, text):
+        """Write a markdown page into the content directory."""
+        Path(self.content_dir, name).write_text(text, encoding="utf-8")
+
+    def build(self, incremental=False, strict=False):
+        """Run a build and return its result."""
+        with patch('builtins.print'):
+            return build_site(self.logger, self.content_dir, self.output_dir,
+                              self.template_file, incremental=incremental, strict=strict)
+
+    def page_path(self, slug):
+        """Return the output path of a page."""
+        return Path(self.output_dir, slug, "index.html")
+
+    def test_strict_build_keeps_previous_output(self):
+        """Test that a strict build with errors leaves the previous site in place."""
+        self.assertEqual(self.build(), (2, 0))
+        before = self.page_path("tech").read_text(encoding="utf-8")
+        self.write_page("tech.md", "---\ntitle: Tech\nslug: tech\n---\n\nNew tech body\n")
+        Path(self.content_dir, "broken.md").write_bytes(b"---\ntitle: Broken\nslug: broken\n---\n\xff")
+
+        self.assertEqual(self.build(strict=True), (2, 1))
+        self.assertEqual(self.page_path("tech").read_text(encoding="utf-8"), before)
+        self.assertFalse(self.page_path("broken").exists())
+        self.assertEqual(len([name for name in os.listdir(releases_path(self.output_dir)) if name[0] != "."]), 1)
+
+    def test_build_with_errors_publishes_good_pages(self):
+        """Test that by default the pages that built are published without the failed one."""
+        self.assertEqual(self.build(), (2, 0))
+        self.write_page("tech.md", "---\ntitle: Tech\nslug: tech\n---\n\nNew tech body\n")
+        Path(self.content_dir, "broken.md").write_bytes(b"---\ntitle: Broken\nslug: broken\n---\n\xff")
+
+        self.assertEqual(self.build(), (2, 1))
+        self.assertIn("New tech body", self.page_path("tech").read_text(encoding="utf-8"))
+        self.assertFalse(self.page_path("broken").exists())
+
+    def test_full_build_links_identical_pages(self):
+        """Test that a full build hardlinks pages identical to the previous build."""
+        self.build()
+        previous_life = self.page_path("life").resolve()
+        self.write_page("tech.md", "---\ntitle: Tech\nslug: tech\n---\n\nNew tech body\n")
+
+        self.assertEqual(self.build(), (2, 0))
+        self.assertTrue(os.path.samefile(self.page_path("life"), previous_life))
+        self.assertNotEqual(self.page_path("life").resolve(), previous_life)
+        self.assertIn("New tech body", self.page_path("tech").read_text(encoding="utf-8"))
+
+    def test_incremental_build_links_unchanged_pages(self):
+        """Test that unchanged pages keep their file while changed pages are replaced."""
+        self.build(incremental=True)
+        life_inode = self.page_path("life").stat().st_ino
+        tech_inode = self.page_path("tech").stat().st_ino
+        self.write_page("tech.md", "---\ntitle: Tech\nslug: tech\n---\n\nNew tech body\n")
+
+        self.assertEqual(self.build(incremental=True), (2, 0))
+        self.assertEqual(self.page_path("life").stat().st_ino, life_inode)
+        self.assertNotEqual(self.page_path("tech").stat().st_ino, tech_inode)
+        self.assertIn("New tech body", self.page_path("tech").read_text(encoding="utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Unit tests for the builder utils module.
+"""
+
+import re
+import random
+import unittest
+from html import unescape
+
+from src.builder import utils
+from src.builder.utils import extract_description
+
+# Pieces of generated pages: markup, entities (complete, without ';' and
+# broken), sentence ends, stray brackets and every kind of whitespace
+FRAGMENTS = (
+    "word", "Text", "a", "longerword", "é", " ", "  ", "\n", "\t", "\n\n", "\xa0", " ",
+    ".", "!", "?", "...", ",", "<p>", "</p>", "<h1>", "</h1>", "<em>", "</em>",
+    "<a href='/x'>", "</a>", "<br />", "<pre><code>", "</code></pre>", "<img alt='a > b'>",
+    "&amp;", "&amp", "&lt;", "&gt", "&nbsp;", "&#65;", "&#x42;", "&#0000000000067", "&am", "&", "#",
+    "<", ">", "<>", "< ", "p;", ";",
+)
+
+
+def reference_description(frontmatter, html_content, max_length=160):
+    """The original extract_description, converting the whole body."""
+    if 'description' in frontmatter:
+        description = frontmatter['description']
+        if description and len(description) <= max_length:
+            return description
+    text_content = re.sub(r'<[^>]+>', '', html_content)
+    text_content = unescape(text_content)
+    text_content = re.sub(r'\s+', ' ', text_content).strip()
+    if len(text_content) <= max_length:
+        return text_content
+    sentence_match = re.search(r'^[^.!?]*[.!?]', text_content)
+    if sentence_match:
+        sentence = sentence_match.group(0)
+        if len(sentence) <= max_length:
+            return sentence
+    truncated = text_content[:max_length-3]
+    last_space = truncated.rfind(' ')
+    if last_space > max_length * 0.7:
+        truncated = truncated[:last_space]
+    return truncated + '...'
+
+
+class TestExtractDescription(unittest.TestCase):
+    """Test cases for meta description extraction."""
+
+    def test_frontmatter_description(self):
+        """Test that a short enough frontmatter description is used as is."""
+        self.assertEqual(extract_description({'description': "Given."}, "<p>Body.</p>"), "Given.")
+        self.assertEqual(extract_description({'description': "x" * 200}, "<p>Body.</p>"), "Body.")
+
+    def test_first_sentence_and_truncation(self):
+        """Test that long text gives its first sentence or is cut at a word."""
+        body = "<p>" + "First sentence. " + "more words " * 40 + "</p>"
+        self.assertEqual(extract_description({}, body), "First sentence.")
+        body = "<p>" + "word " * 100 + "</p>"
+        description = extract_description({}, body)
+        self.assertTrue(description.endswith("...") and len(description) <= 160)
+
+    def test_long_page_reads_only_a_prefix(self):
+        """Test that a long page is not converted in full."""
+        body = "<p>Intro &amp; more.</p>" + "<p>" + "filler " * 100000 + "</p>"
+        converted = []
+        original = utils.TAG_PATTERN
+
+        class RecordingPattern:
+            def sub(self, replacement, text):
+                converted.append(len(text))
+                return original.sub(replacement, text)
+
+        utils.TAG_PATTERN = RecordingPattern()
+        try:
+            self.assertEqual(extract_description({}, body), "Intro & more.")
+        finally:
+            utils.TAG_PATTERN = original
+        self.assertLess(max(converted), 10000)
+
+    def test_matches_reference_on_generated_pages(self):
+        """Test that generated pages get the same description as the original implementation."""
+        rng = random.Random(20251018)
+        for case in range(3000):
+            size = rng.choice((5, 50, 400, 2000))
+            html = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, size)))
+            max_length = rng.choice((0, 1, 3, 10, 40, 160, 160, 300))
+            with self.subTest(case=case, max_length=max_length):
+                self.assertEqual(extract_description({}, html, max_length),
+                                 reference_description({}, html, max_length), html)
+
+
+if __name__ == '__main__':
+    unittest.main()
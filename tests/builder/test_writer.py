@@ -0,0 +1,151 @@
+"""
+Unit tests for the builder writer module and threaded page writes.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder.html import build_site
+from src.builder.writer import PageWriter
+from src.builder.staging import write_output
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+class TestPageWriter(unittest.TestCase):
+    """Test cases for the threaded page writer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_writes_complete_in_submission_order(self):
+        """Test that completions come back in order even when later writes finish first."""
+        def slow_first(path, text, previous=None):
+            time.sleep(0.05 if path.name == "0.html" else 0)
+            write_output(path, text, previous)
+
+        completed = []
+        with patch("src.builder.writer.write_output", side_effect=slow_first):
+            with PageWriter(threads=4) as writer:
+                for i in range(6):
+                    completed += writer.submit(self.temp_dir / "a" / f"{i}.html", str(i), i)
+                completed += writer.close()
+        self.assertEqual([item for item, _, _ in completed], list(range(6)))
+        self.assertEqual((self.temp_dir / "a" / "5.html").read_text(encoding="utf-8"), "5")
+
+    def test_queued_items_without_text_keep_their_place(self):
+        """Test that items queued without a write complete between the writes around them."""
+        with PageWriter(threads=2) as writer:
+            completed = writer.submit(self.temp_dir / "x.html", "x", "written")
+            completed += writer.submit(None, None, "skipped")
+            completed += writer.close()
+        self.assertEqual([item for item, _, _ in completed], ["written", "skipped"])
+        self.assertFalse((self.temp_dir / "None").exists())
+
+    def test_pending_writes_are_bounded(self):
+        """Test that submit waits once max_pending writes are queued."""
+        with patch("src.builder.writer.write_output", side_effect=lambda path, text, previous=None: time.sleep(0.01)):
+            with PageWriter(threads=1, max_pending=3) as writer:
+                for i in range(10):
+                    writer.submit(self.temp_dir / f"{i}.html", "x", i)
+                    self.assertLessEqual(len(writer.pending), 3)
+                writer.close()
+
+    def test_failed_write_is_returned_with_its_item(self):
+        """Test that a write error is reported for its own item only."""
+        def fail_second(path, text, previous=None):
+            if path.name == "1.html":
+                raise OSError("disk full")
+            write_output(path, text, previous)
+
+        with patch("src.builder.writer.write_output", side_effect=fail_second):
+            with PageWriter(threads=2) as writer:
+                completed = []
+                for i in range(3):
+                    completed += writer.submit(self.temp_dir / f"{i}.html", "x", i)
+                completed += writer.close()
+        errors = {item: error for item, _, error in completed}
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], OSError)
+        self.assertIsNone(errors[2])
+
+    def test_directories_created_once(self):
+        """Test that a directory shared by several pages is only created once."""
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+            with PageWriter(threads=1) as writer:
+                for i in range(4):
+                    writer.submit(self.temp_dir / "blog" / f"{i}.html", "x", i)
+                writer.close()
+        self.assertEqual(mkdir.call_count, 1)
+
+
+class TestThreadedBuild(unittest.TestCase):
+    """Test cases for build_site with threaded page writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.template_file = os.path.join(self.temp_dir, "templates", "base.html")
+        os.makedirs(self.content_dir)
+        os.makedirs(os.path.dirname(self.template_file))
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        for i in range(12):
+            Path(self.content_dir, f"post{i}.md").write_text(
+                f"---\ntitle: Post {i}\nslug: post{i}\ndate: 2025-01-{i + 1:02d}\n---\n\nPost {i} words.\n",
+                encoding="utf-8")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read_tree(self, output_dir):
+        """Return every non-hidden output file of a build."""
+        return {
+            path.relative_to(output_dir).as_posix(): path.read_bytes()
+            for path in Path(output_dir).rglob("*") if path.is_file() and not path.name.startswith(".")
+        }
+
+    def test_output_matches_single_threaded_writes(self):
+        """Test that many writer threads give the same site as one."""
+        serial = os.path.join(self.temp_dir, "serial")
+        threaded = os.path.join(self.temp_dir, "threaded")
+        self.assertEqual(build_site(self.logger, self.content_dir, serial, self.template_file,
+                                    search=True, write_threads=1), (12, 0))
+        self.assertEqual(build_site(self.logger, self.content_dir, threaded, self.template_file,
+                                    search=True, write_threads=8), (12, 0))
+        self.assertEqual(self.read_tree(threaded), self.read_tree(serial))
+
+    def test_failed_write_is_counted_once(self):
+        """Test that a page whose write fails is an error and not reported as built."""
+        output_dir = os.path.join(self.temp_dir, "dist")
+
+        def fail_post3(path, text, previous=None):
+            if path.parent.name == "post3":
+                raise OSError("disk full")
+            write_output(path, text, previous)
+
+        with patch("src.builder.writer.write_output", side_effect=fail_post3):
+            result = build_site(self.logger, self.content_dir, output_dir, self.template_file)
+        self.assertEqual(result, (11, 1))
+        failed = [call for call in self.logger.error.call_args_list if "post3" in str(call)]
+        self.assertEqual(len(failed), 1)
+        # The pages that were written are published without the failed one
+        self.assertTrue(os.path.exists(output_dir))
+        self.assertEqual(list(Path(output_dir).rglob("post3/*.html")), [])
+        self.assertEqual(len(list(Path(output_dir).rglob("index.html"))), 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
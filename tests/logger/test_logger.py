@@ -8,7 +8,13 @@ import logging
 import unittest
 from unittest.mock import patch, MagicMock
 
-from src.logger.logger import setup_logging
+from src.logger.logger import (
+    setup_logging,
+    shutdown_logging,
+    page_status,
+    JsonLinesFormatter,
+    SummaryFilter,
+)
 from src.config.default import DEFAULT_LOG_NAME
 
 
@@ -24,6 +30,9 @@ class TestLogger(unittest.TestCase):
     def tearDown(self):
         """Clean up test fixtures."""
         # Clear any existing loggers
+        shutdown_logging()
+        for handler in logging.getLogger(DEFAULT_LOG_NAME).handlers:
+            handler.close()
         logging.getLogger(DEFAULT_LOG_NAME).handlers.clear()
         # Clean up temp files
         for file in os.listdir(self.temp_dir):
@@ -195,6 +204,94 @@ class TestLogger(unittest.TestCase):
         
         self.assertTrue(os.path.exists(log_file))
 
+    def test_setup_logging_queued(self):
+        """Test that queued logging writes every record once the queue is flushed."""
+        from logging.handlers import QueueHandler
+        log_file = os.path.join(self.temp_dir, "test.log")
+        logger = setup_logging(log_file=log_file, queued=True)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertIsInstance(logger.handlers[0], QueueHandler)
+
+        for i in range(100):
+            logger.info("Queued message %d", i)
+        shutdown_logging(logger)
+
+        with open(log_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertTrue(lines[-1].endswith("Queued message 99"))
+
+    def test_setup_logging_json_lines(self):
+        """Test that the JSON format writes one parseable object per record."""
+        import json
+        log_file = os.path.join(self.temp_dir, "test.log")
+        logger = setup_logging(log_file=log_file, log_format="json")
+        logger.info("Built: %s", "dist/index.html", extra=page_status("built"))
+
+        with open(log_file, 'r', encoding='utf-8') as f:
+            entry = json.loads(f.readline())
+        self.assertEqual(entry['message'], "Built: dist/index.html")
+        self.assertEqual(entry['level'], "INFO")
+        self.assertEqual(entry['page_status'], "built")
+        self.assertIsInstance(logger.handlers[0].formatter, JsonLinesFormatter)
+
+    def test_setup_logging_stream_and_name(self):
+        """Test that console output can go to another stream and logger."""
+        import io
+        stream = io.StringIO()
+        logger = setup_logging(stream=stream, name=f"{DEFAULT_LOG_NAME}_other")
+        try:
+            logger.info("Handed back")
+            self.assertEqual(stream.getvalue(), "INFO: Handed back\n")
+            self.assertEqual(logging.getLogger(DEFAULT_LOG_NAME).handlers, [])
+        finally:
+            logger.handlers.clear()
+
+    def test_summary_filter_replaces_page_lines(self):
+        """Test that per-page records are counted and only shown as progress."""
+        summary = SummaryFilter(interval=3600)
+        record = logging.LogRecord(DEFAULT_LOG_NAME, logging.INFO, __file__, 0, "Built: %s", ("a",), None)
+        record.page_status = "built"
+        other = logging.LogRecord(DEFAULT_LOG_NAME, logging.INFO, __file__, 0, "Found 3 files", (), None)
+        failed = logging.LogRecord(DEFAULT_LOG_NAME, logging.ERROR, __file__, 0, "Failed", (), None)
+        failed.page_status = "failed"
+
+        self.assertFalse(summary.filter(record))
+        self.assertTrue(summary.filter(other))
+        self.assertTrue(summary.filter(failed))
+        self.assertEqual(summary.counts, {"built": 1, "failed": 1})
+
+    def test_summary_filter_reports_progress(self):
+        """Test that a per-page record is rewritten into a progress line once per interval."""
+        summary = SummaryFilter(interval=0)
+        record = logging.LogRecord(DEFAULT_LOG_NAME, logging.INFO, __file__, 0, "Built: %s", ("a",), None)
+        record.page_status = "built"
+        self.assertTrue(summary.filter(record))
+        self.assertEqual(record.getMessage(), "Progress: 1 built")
+
+    def test_summary_is_flushed_on_shutdown(self):
+        """Test that the counters since the last progress line are printed when logging shuts down."""
+        import io
+        for queued in (False, True):
+            with self.subTest(queued=queued):
+                stream = io.StringIO()
+                logger = setup_logging(stream=stream, summary=True, queued=queued)
+                for name in ("a", "b"):
+                    logger.info("Built: %s", name, extra=page_status("built"))
+                logger.info("Done")
+                shutdown_logging(logger)
+                shutdown_logging(logger)
+                self.assertEqual(stream.getvalue().splitlines(), ["INFO: Done", "INFO: Summary: 2 built"])
+
+    def test_setup_logging_summary_console(self):
+        """Test that summary mode filters the console handler only."""
+        log_file = os.path.join(self.temp_dir, "test.log")
+        logger = setup_logging(log_file=log_file, summary=True)
+        console_handler = next(h for h in logger.handlers if not isinstance(h, logging.FileHandler))
+        file_handler = next(h for h in logger.handlers if isinstance(h, logging.FileHandler))
+        self.assertTrue(any(isinstance(f, SummaryFilter) for f in console_handler.filters))
+        self.assertEqual(file_handler.filters, [])
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Unit tests for the parser backends module.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.parser.backends import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    MarkdownBackend,
+    MarkdownItBackend,
+    MistuneBackend,
+    available_backends,
+    backend_fallback,
+    select_backend,
+)
+
+DOCUMENTS = [
+    "# Title\n\nSome *text* and **bold** with a [link](https://example.com).",
+    "| a | b |\n|---|---|\n| 1 | 2 |",
+    "```python\nprint('<hi>')\n```",
+    "<div>raw html</div>\n\nparagraph",
+]
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test cases for choosing the markdown backend."""
+
+    def tearDown(self):
+        """Forget backends selected under patched availability."""
+        select_backend.cache_clear()
+
+    def test_default_is_python_markdown(self):
+        """Test that Python-Markdown is used unless configured otherwise."""
+        self.assertIs(select_backend(), BACKENDS[DEFAULT_BACKEND])
+        self.assertIn(DEFAULT_BACKEND, available_backends())
+        self.assertIsNone(backend_fallback())
+
+    def test_unknown_backend_is_rejected(self):
+        """Test that a misspelt backend name is an error rather than a silent fallback."""
+        with self.assertRaises(ValueError):
+            select_backend("commonmark")
+
+    def test_missing_backend_falls_back(self):
+        """Test that a backend that is not installed falls back to Python-Markdown."""
+        with patch.object(MistuneBackend, "available", return_value=False):
+            self.assertIs(select_backend("mistune"), BACKENDS[DEFAULT_BACKEND])
+            self.assertEqual(backend_fallback("mistune"), "mistune")
+
+    def test_auto_picks_fastest_installed(self):
+        """Test that auto prefers mistune, then markdown-it, then Python-Markdown."""
+        with patch.object(MistuneBackend, "available", return_value=False), \
+                patch.object(MarkdownItBackend, "available", return_value=True):
+            self.assertIs(select_backend("auto"), MarkdownItBackend)
+        select_backend.cache_clear()
+        with patch.object(MistuneBackend, "available", return_value=False), \
+                patch.object(MarkdownItBackend, "available", return_value=False):
+            self.assertIs(select_backend("auto"), BACKENDS[DEFAULT_BACKEND])
+            self.assertIsNone(backend_fallback("auto"))
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test that a backend without render fails when created, not in the middle of a build."""
+        class Incomplete(MarkdownBackend):
+            name = "incomplete"
+            module = "markdown"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_backend_is_part_of_config_hash(self):
+        """Test that switching backends invalidates incremental builds and the render cache."""
+        import tempfile
+        from pathlib import Path
+        from unittest.mock import MagicMock
+        from src.builder.cache import hash_config
+        from src.builder.render_cache import RenderCache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "cache.sqlite3")
+            config, cache = hash_config(), RenderCache(MagicMock(), path)
+            cache.close()
+            with patch("src.builder.cache.select_backend", return_value=MistuneBackend), \
+                    patch("src.builder.render_cache.select_backend", return_value=MarkdownItBackend), \
+                    patch.object(MarkdownItBackend, "version", return_value="0.0"):
+                other = RenderCache(MagicMock(), path)
+                other.close()
+                self.assertNotEqual(hash_config(), config)
+            self.assertNotEqual(other.key("abc"), cache.key("abc"))
+
+
+class TestBackendRendering(unittest.TestCase):
+    """Test cases for the HTML of each installed backend."""
+
+    def test_python_markdown_matches_markdown_markdown(self):
+        """Test that the default backend renders like a fresh markdown.markdown call."""
+        import markdown
+        from src.config.markdown import MARKDOWN_EXTENSIONS
+
+        backend = BACKENDS[DEFAULT_BACKEND]()
+        for document in DOCUMENTS + ["[ref]: https://example.com\n\n[a][ref]", "[a][ref]"]:
+            self.assertEqual(backend.render(document), markdown.markdown(document, extensions=MARKDOWN_EXTENSIONS))
+
+    def test_optional_backends_render_the_same_structure(self):
+        """Test that every installed backend renders headings, tables, code and raw HTML."""
+        for name in available_backends():
+            backend = BACKENDS[name]()
+            with self.subTest(backend=name):
+                html = [backend.render(document) for document in DOCUMENTS]
+                self.assertIn("<h1>Title</h1>", html[0])
+                self.assertIn("<strong>bold</strong>", html[0])
+                self.assertIn("<td>1</td>", html[1])
+                self.assertIn('class="language-python"', html[2])
+                self.assertIn("&lt;hi&gt;", html[2])
+                self.assertIn("<div>raw html</div>", html[3])
+                self.assertFalse(html[3].endswith("\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,8 +22,116 @@ class TestMarkdownParser(unittest.TestCase):
         from src.parser.markdown import parse_markdown
         self.assertTrue(callable(parse_markdown))
 
-    # Add more specific tests for MarkdownParser functionality here
-    # This is a placeholder for future tests when the MarkdownParser class is implemented
+    def test_render_markdown_matches_markdown_markdown(self):
+        """Test that the pooled converter renders like a fresh markdown.markdown call."""
+        import markdown
+        from src.config.markdown import MARKDOWN_EXTENSIONS
+        from src.parser.markdown import render_markdown
+
+        documents = [
+            "# Title\n\nSome *text* with a [reference][ref].\n\n[ref]: https://example.com",
+            "| a | b |\n|---|---|\n| 1 | 2 |",
+            "```python\nprint('<hi>')\n```",
+            "Uses [ref][ref] without a definition this time.",
+            "<div>raw html</div>\n\nparagraph",
+        ]
+        for document in documents:
+            expected = markdown.markdown(document, extensions=MARKDOWN_EXTENSIONS)
+            self.assertEqual(render_markdown(document), expected)
+
+    def test_converter_is_reused_per_thread(self):
+        """Test that the same converter instance is returned within a thread."""
+        import threading
+        from src.parser.markdown import get_converter
+
+        self.assertIs(get_converter(), get_converter())
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_converter()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], get_converter())
+
+    def test_parse_markdown_frontmatter_and_body(self):
+        """Test that parse_markdown splits frontmatter from the rendered body."""
+        import os
+        import tempfile
+        from src.parser.markdown import parse_markdown
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("---\ntitle: Page\nslug: page\n---\n\n# Hello")
+            frontmatter, html_body = parse_markdown(path, MagicMock())
+
+        self.assertEqual(frontmatter, {"title": "Page", "slug": "page"})
+        self.assertEqual(html_body, "<h1>Hello</h1>")
+
+
+class TestReadFrontmatter(unittest.TestCase):
+    """Test cases for the frontmatter-only scan."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        import tempfile
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, text, name="page.md"):
+        """Write text to a file in the temp directory and return its path."""
+        import os
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_matches_parse_markdown(self):
+        """Test that the scan returns the same frontmatter as parse_markdown."""
+        from src.parser.markdown import read_frontmatter, parse_markdown
+
+        documents = [
+            "---\ntitle: Page\nslug: page\ndate: 2024-01-01\ntags: [a, b]\n---\n\n# Body",
+            "# No frontmatter\n\ntext",
+            "---\ntitle: Unclosed\n",
+            "---\ntitle: a---b\n---\nbody",
+            "------\nbody",
+            "---\ntitle: [unbalanced\n---\nbody",
+        ]
+        for text in documents:
+            path = self.write(text)
+            self.assertEqual(read_frontmatter(path, MagicMock()), parse_markdown(path, MagicMock())[0])
+
+    def test_delimiter_split_across_chunks(self):
+        """Test that a closing delimiter spanning two reads is found."""
+        from src.parser import markdown as parser
+
+        for padding in range(parser.FRONTMATTER_CHUNK_SIZE - 6, parser.FRONTMATTER_CHUNK_SIZE + 2):
+            text = "---\ntitle: " + "x" * padding + "\n---\nbody"
+            path = self.write(text)
+            self.assertEqual(parser.read_frontmatter(path, MagicMock()), {"title": "x" * padding})
+
+    def test_body_is_not_read(self):
+        """Test that bytes after the frontmatter are never decoded."""
+        import os
+        from src.parser.markdown import read_frontmatter
+
+        path = os.path.join(self.temp_dir, "page.md")
+        with open(path, "wb") as f:
+            f.write(b"---\ntitle: Page\n---\n" + b"a" * 10000 + b"\xff\xfe")
+        self.assertEqual(read_frontmatter(path, MagicMock()), {"title": "Page"})
+
+    def test_strict_mode_raises(self):
+        """Test that strict mode raises for malformed frontmatter and invalid YAML."""
+        import yaml
+        from src.parser.markdown import read_frontmatter
+
+        with self.assertRaises(ValueError):
+            read_frontmatter(self.write("---\ntitle: Unclosed\n"), MagicMock(), strict=True)
+        with self.assertRaises(yaml.YAMLError):
+            read_frontmatter(self.write("---\ntitle: [x\n---\n"), MagicMock(), strict=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1 @@
+# Profiler tests package
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Unit tests for the profiler module.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.profiler.profiler import BuildProfiler, NullProfiler, NULL_PROFILER
+
+
+class TestBuildProfiler(unittest.TestCase):
+    """Test cases for BuildProfiler and NullProfiler."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_record_accumulates_totals_and_files(self):
+        """Test that timings accumulate per phase and per file."""
+        profiler = BuildProfiler()
+        profiler.record("yaml", 0.5, "a.md")
+        profiler.record("yaml", 0.25, "b.md")
+        profiler.record("markdown", 1.0, "a.md")
+        profiler.record("assets", 0.1)
+        self.assertEqual(profiler.totals["yaml"], 0.75)
+        self.assertEqual(profiler.counts["yaml"], 2)
+        self.assertEqual(dict(profiler.files["a.md"]), {"yaml": 0.5, "markdown": 1.0})
+        self.assertNotIn(None, profiler.files)
+
+    def test_phase_context_records_time(self):
+        """Test that the phase context manager records elapsed time."""
+        profiler = BuildProfiler()
+        with profiler.phase("render", "a.md"):
+            pass
+        self.assertEqual(profiler.counts["render"], 1)
+        self.assertGreaterEqual(profiler.files["a.md"]["render"], 0.0)
+
+    def test_slowest_orders_by_total(self):
+        """Test that slowest() returns files ordered by total time."""
+        profiler = BuildProfiler()
+        profiler.record("markdown", 0.1, "fast.md")
+        profiler.record("markdown", 0.2, "slow.md")
+        profiler.record("yaml", 0.2, "slow.md")
+        self.assertEqual([entry["file"] for entry in profiler.slowest(2)], ["slow.md", "fast.md"])
+        self.assertEqual(len(profiler.slowest(1)), 1)
+
+    def test_merge_worker_records(self):
+        """Test that records from a worker profiler merge into the parent."""
+        worker = BuildProfiler()
+        worker.record("markdown", 0.3, "a.md")
+        parent = BuildProfiler()
+        parent.merge(worker.records())
+        self.assertEqual(parent.files["a.md"]["markdown"], 0.3)
+
+    def test_write_profile_json(self):
+        """Test that the profile is written as JSON."""
+        profiler = BuildProfiler()
+        profiler.record("markdown", 0.3, "a.md")
+        path = os.path.join(self.temp_dir, "build-profile.json")
+        profiler.write(path, total_seconds=1.5, top=5)
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+        self.assertEqual(profile["total_seconds"], 1.5)
+        self.assertEqual(profile["phases"]["markdown"]["count"], 1)
+        self.assertEqual(profile["slowest_files"][0]["file"], "a.md")
+
+    def test_null_profiler_records_nothing(self):
+        """Test that the null profiler is disabled and accepts all calls."""
+        self.assertIsInstance(NULL_PROFILER, NullProfiler)
+        self.assertFalse(NULL_PROFILER.enabled)
+        with NULL_PROFILER.phase("render", "a.md"):
+            pass
+        NULL_PROFILER.record("render", 1.0)
+
+    def test_build_site_records_phases(self):
+        """Test that build_site reports its phases to the profiler."""
+        from src.builder.html import build_site
+
+        content_dir = os.path.join(self.temp_dir, "content")
+        os.makedirs(content_dir)
+        with open(os.path.join(content_dir, "page.md"), "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Page\nslug: page\n---\n\n# Page")
+
+        profiler = BuildProfiler()
+        with patch('builtins.print'):
+            result = build_site(MagicMock(), content_dir, os.path.join(self.temp_dir, "dist"),
+                                "templates/base.html", profiler=profiler)
+
+        self.assertEqual(result, (1, 0))
+        for phase in ["discovery", "yaml", "markdown", "description", "navigation", "render", "write", "assets"]:
+            self.assertIn(phase, profiler.totals)
+        self.assertIn(os.path.join(content_dir, "page.md"), profiler.files)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for the server daemon module and lazy imports.
+"""
+
+import io
+import sys
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout, redirect_stderr
+from unittest.mock import MagicMock, patch
+
+from src.server.daemon import BuildDaemon, ClientStream, build_on_daemon, daemon_is_running, serve_daemon
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def import_times(statement):
+    """Run statement in a fresh interpreter and return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestBuildDaemon(unittest.TestCase):
+    """Test cases for handing builds to the daemon."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "daemon.sock"
+        self.logger = MagicMock()
+        self.builds = []
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_build(self, argv, stream):
+        """Stand in for the generator: echo argv and fail with --check."""
+        self.builds.append(argv)
+        stream.write(f"INFO: building {' '.join(argv)}\n")
+        return 1 if "--check" in argv else 0
+
+    def hand_over(self, daemon, argv):
+        """Serve one request while the client hands argv over."""
+        server = threading.Thread(target=daemon.handle_request)
+        server.start()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = build_on_daemon(argv, self.path)
+        server.join(5)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_no_daemon(self):
+        """Test that without a listening daemon the build stays in process."""
+        self.assertIsNone(build_on_daemon([], self.path))
+        self.path.write_text("left behind", encoding="utf-8")
+        self.assertIsNone(build_on_daemon([], self.path))
+        self.assertFalse(daemon_is_running(self.path))
+
+    def test_build_output_and_status(self):
+        """Test that the client prints the build output and returns its status."""
+        with BuildDaemon(self.run_build, self.logger, self.path) as daemon:
+            self.assertEqual(self.path.stat().st_mode & 0o777, 0o600)
+            self.assertEqual(self.hand_over(daemon, ["--minify"]), (0, "INFO: building --minify\n", ""))
+            self.assertEqual(self.hand_over(daemon, ["--check"])[0], 1)
+        self.assertEqual(self.builds, [["--minify"], ["--check"]])
+
+    def test_other_directory_is_declined(self):
+        """Test that a client in another directory builds in process."""
+        with BuildDaemon(self.run_build, self.logger, self.path) as daemon:
+            daemon.directory = str(self.temp_dir)
+            status, stdout, stderr = self.hand_over(daemon, [])
+        self.assertIsNone(status)
+        self.assertIn("declined", stderr)
+        self.assertEqual(self.builds, [])
+
+    def test_changed_generator_is_declined(self):
+        """Test that a daemon running outdated code stops taking builds."""
+        with BuildDaemon(self.run_build, self.logger, self.path) as daemon:
+            with patch("src.server.daemon.source_signature", return_value={}):
+                status, _, _ = self.hand_over(daemon, [])
+            self.assertIsNone(status)
+            self.assertTrue(daemon.stale)
+
+    def test_failed_build_reports_error(self):
+        """Test that an exception in the daemon fails the build instead of hanging the client."""
+        def broken(argv, stream):
+            raise RuntimeError("boom")
+        with BuildDaemon(broken, self.logger, self.path) as daemon:
+            status, stdout, _ = self.hand_over(daemon, [])
+        self.assertEqual(status, 1)
+        self.assertIn("boom", stdout)
+
+    def test_second_daemon_refused(self):
+        """Test that a second daemon does not take over a live socket."""
+        with BuildDaemon(self.run_build, self.logger, self.path):
+            self.assertTrue(daemon_is_running(self.path))
+            self.assertEqual(serve_daemon(self.logger, self.run_build, self.path), 1)
+            self.logger.error.assert_called_once()
+
+    def test_client_stream_survives_disconnect(self):
+        """Test that output to a client that went away is dropped, not raised."""
+        wfile = MagicMock()
+        wfile.write.side_effect = BrokenPipeError()
+        stream = ClientStream(wfile)
+        self.assertEqual(stream.write("INFO: x\n"), 8)
+        stream.write("INFO: y\n")
+        self.assertFalse(stream.connected)
+        self.assertEqual(wfile.write.call_count, 1)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for the startup cost of the command line, measured with -X importtime."""
+
+    DEFERRED = ("markdown", "yaml")
+
+    def test_generator_defers_markdown_and_yaml(self):
+        """Test that --help and daemon clients never import markdown, yaml or the builder."""
+        lazy = import_times("import src.generator")
+        for module in self.DEFERRED + ("src.builder.html",):
+            self.assertNotIn(module, lazy)
+
+    def test_parsing_arguments_defers_markdown_and_yaml(self):
+        """Test that markdown, yaml and the builder are still not loaded once the arguments are parsed."""
+        modules = self.DEFERRED + ("src.builder.html",)
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, src.generator; src.generator.parse_args(['--jobs', '2']); "
+             f"print(' '.join(module for module in {modules!r} if module in sys.modules))"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_check_does_not_import_markdown(self):
+        """Test that validating frontmatter loads yaml only when it parses a file."""
+        lazy = import_times("import src.builder.check")
+        for module in self.DEFERRED:
+            self.assertNotIn(module, lazy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the server dev module.
+"""
+
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import http.client
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from src.server.dev import LIVE_RELOAD_SCRIPT, LiveReload, inject_live_reload, start_dev_server, stop_dev_server
+from src.config.default import LIVE_RELOAD_PATH
+
+
+class TestLiveReload(unittest.TestCase):
+    """Test cases for the reload broadcast and script injection."""
+
+    def test_inject_before_closing_body(self):
+        """Test that the script goes right before the last </body>."""
+        html = b"<html><body><p>x</p></BODY></html>"
+        self.assertEqual(inject_live_reload(html), b"<html><body><p>x</p>" + LIVE_RELOAD_SCRIPT + b"</BODY></html>")
+
+    def test_inject_without_body(self):
+        """Test that a fragment gets the script appended."""
+        self.assertEqual(inject_live_reload(b"<p>x</p>"), b"<p>x</p>" + LIVE_RELOAD_SCRIPT)
+
+    def test_wait_returns_on_notify(self):
+        """Test that a waiting stream wakes up with the new generation."""
+        live_reload = LiveReload()
+        threading.Timer(0.05, live_reload.notify).start()
+        self.assertEqual(live_reload.wait(0, timeout=5), 1)
+
+    def test_wait_times_out(self):
+        """Test that a wait without a rebuild returns the same generation."""
+        self.assertEqual(LiveReload().wait(0, timeout=0.01), 0)
+
+
+class TestDevServer(unittest.TestCase):
+    """Test cases for serving the output directory."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "docs").mkdir()
+        self.page = b"<html><body><h1>Docs</h1></body></html>"
+        (self.temp_dir / "docs" / "index.html").write_bytes(self.page)
+        (self.temp_dir / "style.css").write_bytes(b"body{}")
+        self.server = start_dev_server(self.temp_dir, MagicMock(), host="127.0.0.1", port=0)
+        self.port = self.server.server_address[1]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        stop_dev_server(self.server)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def get(self, path):
+        """Request path and return the response and its body."""
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_html_gets_script_in_response_only(self):
+        """Test that pages are served with the script but unchanged on disk."""
+        response, body = self.get("/docs/")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, inject_live_reload(self.page))
+        self.assertEqual(int(response.getheader("Content-Length")), len(body))
+        self.assertEqual(response.getheader("Cache-Control"), "no-store")
+        self.assertEqual((self.temp_dir / "docs" / "index.html").read_bytes(), self.page)
+
+    def test_head_request_has_no_body(self):
+        """Test that HEAD for a page sends the headers of GET without the page."""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as connection:
+            connection.sendall(b"HEAD /docs/ HTTP/1.0\r\n\r\n")
+            data = b""
+            while chunk := connection.recv(4096):
+                data += chunk
+        headers, _, body = data.partition(b"\r\n\r\n")
+        self.assertTrue(headers.startswith(b"HTTP/1.0 200"))
+        self.assertIn(f"Content-Length: {len(inject_live_reload(self.page))}".encode(), headers)
+        self.assertEqual(body, b"")
+
+    def test_other_files_are_served_as_is(self):
+        """Test that assets and missing files behave like a plain file server."""
+        response, body = self.get("/style.css")
+        self.assertEqual((response.status, body), (200, b"body{}"))
+        response, _ = self.get("/docs")
+        self.assertEqual(response.status, 301)
+        response, _ = self.get("/missing.html")
+        self.assertEqual(response.status, 404)
+
+    def test_event_stream_sends_reload(self):
+        """Test that a rebuild reaches a connected browser as a reload event."""
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        connection.request("GET", LIVE_RELOAD_PATH)
+        response = connection.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        self.server.live_reload.notify()
+        self.assertEqual(response.fp.readline(), b"data: reload\n")
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
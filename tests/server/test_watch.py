@@ -0,0 +1,280 @@
+"""
+Unit tests for the server watch module and in-place rebuilds.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.builder.html import build_site
+from src.builder.render_cache import RenderCache
+from src.parser.markdown import read_frontmatter
+from src.builder.staging import build_state_dir, releases_path, remove_output
+from src.builder.warm import WarmBuild
+from src.server.dev import LiveReload, watch_site
+from src.server.watch import SourceWatcher, scan_tree
+from src.config.default import BUILD_MANIFEST_FILE
+
+TEMPLATE = "<html><title>{title}</title><nav>{navigation}</nav><body>{content}</body></html>"
+
+
+class TestSourceWatcher(unittest.TestCase):
+    """Test cases for polling directories for changes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "docs").mkdir()
+        (self.temp_dir / "index.md").write_text("home", encoding="utf-8")
+        (self.temp_dir / "docs" / "guide.md").write_text("guide", encoding="utf-8")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_scan_skips_hidden_and_backup_files(self):
+        """Test that editor and tool files are not watched."""
+        (self.temp_dir / ".index.md.swp").write_text("x", encoding="utf-8")
+        (self.temp_dir / "index.md~").write_text("x", encoding="utf-8")
+        (self.temp_dir / ".git").mkdir()
+        (self.temp_dir / ".git" / "HEAD").write_text("x", encoding="utf-8")
+        self.assertEqual(
+            sorted(scan_tree(self.temp_dir)), [self.temp_dir / "docs" / "guide.md", self.temp_dir / "index.md"]
+        )
+
+    def test_missing_directory_scans_empty(self):
+        """Test that a directory that does not exist yet is not an error."""
+        self.assertEqual(scan_tree(self.temp_dir / "missing"), {})
+
+    def test_changes_reports_added_modified_and_removed(self):
+        """Test that every kind of change is reported once."""
+        watcher = SourceWatcher([self.temp_dir])
+        self.assertEqual(watcher.changes(), [])
+
+        (self.temp_dir / "index.md").write_text("home, edited", encoding="utf-8")
+        (self.temp_dir / "docs" / "new.md").write_text("new", encoding="utf-8")
+        (self.temp_dir / "docs" / "guide.md").unlink()
+        self.assertEqual(watcher.changes(), [
+            self.temp_dir / "docs" / "guide.md", self.temp_dir / "docs" / "new.md", self.temp_dir / "index.md"
+        ])
+        self.assertEqual(watcher.changes(), [])
+
+    def test_touch_is_a_change(self):
+        """Test that a new modification time with the same size is noticed."""
+        watcher = SourceWatcher([self.temp_dir])
+        os.utime(self.temp_dir / "index.md", ns=(0, 1))
+        self.assertEqual(watcher.changes(), [self.temp_dir / "index.md"])
+
+
+class TestWatchSite(unittest.TestCase):
+    """Test cases for the watch loop."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.logger = MagicMock()
+        self.stop = threading.Event()
+        self.live_reload = LiveReload()
+
+    def run_loop(self, results, changes):
+        """Run the watch loop until every change has been handled."""
+        watcher = MagicMock()
+        watcher.changes.side_effect = changes + [[]] * 1000
+        calls = []
+
+        def rebuild(changed):
+            calls.append(changed)
+            if len(calls) == len(results):
+                self.stop.set()
+            return results[len(calls) - 1]
+
+        watch_site(self.logger, rebuild, watcher, self.live_reload, self.stop, interval=0)
+        return calls
+
+    def test_rebuilds_only_on_change_and_reloads(self):
+        """Test that each change triggers one rebuild and one reload."""
+        calls = self.run_loop([(1, 0), (2, 0)], [[], [Path("a.md")], [], [Path("b.md"), Path("c.md")]])
+        self.assertEqual(calls, [[Path("a.md")], [Path("b.md"), Path("c.md")]])
+        self.assertEqual(self.live_reload.generation, 2)
+
+    def test_failed_rebuild_does_not_reload(self):
+        """Test that browsers are not reloaded into a broken build."""
+        self.run_loop([(0, 1)], [[Path("a.md")]])
+        self.assertEqual(self.live_reload.generation, 0)
+        self.logger.warning.assert_called_once()
+
+
+class TestInPlaceRebuild(unittest.TestCase):
+    """Test cases for the unstaged incremental builds used by watch mode."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.content_dir = os.path.join(self.temp_dir, "content")
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.template_file = os.path.join(self.temp_dir, "templates", "base.html")
+        os.makedirs(self.content_dir)
+        os.makedirs(os.path.dirname(self.template_file))
+        Path(self.template_file).write_text(TEMPLATE, encoding="utf-8")
+        for i in range(20):
+            self.write_page(i, f"Body {i}.")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_page(self, i, body):
+        """Write a markdown page into the content directory."""
+        Path(self.content_dir, f"page{i}.md").write_text(
+            f"---\ntitle: Page {i}\nslug: page{i}\n---\n\n{body}\n", encoding="utf-8")
+
+    def rebuild(self, hash_cache):
+        """Rebuild the site in place."""
+        return build_site(
+            self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True,
+            jobs=1, staged=False, hash_cache=hash_cache
+        )
+
+    def test_rebuild_writes_into_output_directory(self):
+        """Test that an unstaged build updates only the edited page in place."""
+        build_site(self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True, jobs=1)
+        releases = os.listdir(releases_path(self.output_dir))
+        output_inode = os.stat(self.output_dir).st_ino
+        page0 = Path(self.output_dir, "page0", "index.html")
+        before = page0.stat().st_mtime_ns
+        hash_cache = {}
+        self.assertEqual(self.rebuild(hash_cache), (20, 0))
+        self.assertEqual(len(hash_cache), 20)
+
+        self.write_page(5, "Edited in place.")
+        self.assertEqual(self.rebuild(hash_cache), (20, 0))
+
+        self.assertEqual(os.stat(self.output_dir).st_ino, output_inode)
+        self.assertEqual(os.listdir(releases_path(self.output_dir)), releases)
+        self.assertIn("Edited in place.", Path(self.output_dir, "page5", "index.html").read_text(encoding="utf-8"))
+        self.assertEqual(page0.stat().st_mtime_ns, before)
+        self.assertTrue((build_state_dir(self.output_dir) / BUILD_MANIFEST_FILE).exists())
+
+    def test_rebuild_removes_deleted_page(self):
+        """Test that deleting a source removes its page from the served output."""
+        hash_cache = {}
+        self.assertEqual(self.rebuild(hash_cache), (20, 0))
+        os.remove(os.path.join(self.content_dir, "page3.md"))
+        self.assertEqual(self.rebuild(hash_cache), (19, 0))
+        self.assertFalse(Path(self.output_dir, "page3", "index.html").exists())
+
+
+class TestWarmRebuild(unittest.TestCase):
+    """Test cases for watch rebuilds of a realistic site from warm state."""
+
+    PAGES = 1000
+    SECTIONS = ("tech", "life", "notes", "projects", "books")
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a site of PAGES pages once for every test."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.content_dir = os.path.join(cls.temp_dir, "content")
+        cls.template_file = os.path.join(cls.temp_dir, "templates", "base.html")
+        os.makedirs(os.path.dirname(cls.template_file))
+        Path(cls.template_file).write_text(TEMPLATE, encoding="utf-8")
+        Path(cls.template_file).with_name("style.css").write_text("body { color: black; }", encoding="utf-8")
+        for i, section in enumerate(cls.SECTIONS):
+            cls.write_page(Path(cls.content_dir, f"{section}.md"), section.title(), section, "Section index.")
+        for i in range(cls.PAGES - len(cls.SECTIONS)):
+            section = cls.SECTIONS[i % len(cls.SECTIONS)]
+            path = Path(cls.content_dir, section, f"topic-{i % 7}", f"post-{i}.md")
+            cls.write_page(path, f"Post {i}", f"post-{i}", cls.body(i))
+        # Shared so each test's initial build reuses the bodies rendered by the first
+        cls.render_cache = RenderCache(MagicMock(), Path(cls.temp_dir, "render-cache.sqlite3"))
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test fixtures."""
+        cls.render_cache.close()
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def write_page(path, title, slug, body, date="2024-03-01"):
+        """Write a dated markdown page."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"---\ntitle: {title}\nslug: {slug}\ndate: {date}\n---\n\n{body}\n", encoding="utf-8")
+
+    @staticmethod
+    def body(i):
+        """Return a body with headings, paragraphs, a list, a table and code."""
+        paragraph = f"Post {i} covers *latency*, **throughput** and [caching](/tech). " * 3
+        return (
+            f"# Post {i}\n\n{paragraph}\n\n- first point\n- second point\n\n"
+            f"| key | value |\n|---|---|\n| id | {i} |\n\n```python\nprint({i})\n```"
+        )
+
+    def setUp(self):
+        """Build into a fresh output directory and warm up like watch mode."""
+        self.output_dir = os.path.join(self.temp_dir, "dist")
+        self.logger = MagicMock()
+        self.warm = WarmBuild()
+        self.edited = Path(self.content_dir, "tech", "topic-0", "post-0.md")
+        self.addCleanup(self.edited.write_text, self.edited.read_text(encoding="utf-8"), encoding="utf-8")
+        self.assertEqual(
+            build_site(self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True,
+                       render_cache=self.render_cache),
+            (self.PAGES, 0))
+        self.assertEqual(self.rebuild([]), (self.PAGES, 0))
+
+    def tearDown(self):
+        """Remove the output of the test."""
+        remove_output(self.output_dir)
+
+    def rebuild(self, changed):
+        """Rebuild in place from the warm state, as watch mode does."""
+        self.warm.mark_changed(changed)
+        return build_site(
+            self.logger, self.content_dir, self.output_dir, self.template_file, incremental=True,
+            staged=False, render_cache=self.render_cache, warm=self.warm
+        )
+
+    def test_edited_page_rebuilds_within_200_ms(self):
+        """Test that saving one page re-reads and re-renders only that page, in under 200 ms."""
+        timings = []
+        for edit in range(3):
+            self.write_page(self.edited, "Post 0", "post-0", f"Edit {edit}. {self.body(0)}")
+            with patch("src.builder.html.read_frontmatter", wraps=read_frontmatter) as read_mock, \
+                    patch("src.builder.html.load_template") as template_mock:
+                start = time.perf_counter()
+                self.assertEqual(self.rebuild([self.edited]), (self.PAGES, 0))
+                timings.append(time.perf_counter() - start)
+            self.assertEqual(read_mock.call_count, 1)
+            template_mock.assert_not_called()
+            page = Path(self.output_dir, "tech", "topic-0", "post-0", "index.html").read_text(encoding="utf-8")
+            self.assertIn(f"Edit {edit}.", page)
+        self.assertLess(min(timings), 0.2)
+
+    def test_navigation_change_rebuilds_every_page(self):
+        """Test that retitling a page in the navigation re-renders every page."""
+        page = Path(self.output_dir, "life", "topic-1", "post-1", "index.html")
+        self.write_page(Path(self.content_dir, "tech.md"), "Technology", "tech", "Section index.")
+        self.addCleanup(self.write_page, Path(self.content_dir, "tech.md"), "Tech", "tech", "Section index.")
+        self.assertEqual(self.rebuild([Path(self.content_dir, "tech.md")]), (self.PAGES, 0))
+        self.assertIn("Technology", page.read_text(encoding="utf-8"))
+
+    def test_added_and_removed_pages_are_discovered(self):
+        """Test that pages the watcher reports added or removed are built or removed without a walk."""
+        added = Path(self.content_dir, "notes", "new.md")
+        self.write_page(added, "New", "new", "Brand new.")
+        self.addCleanup(added.unlink, missing_ok=True)
+        with patch.object(Path, "rglob", side_effect=AssertionError("walked the content directory")):
+            self.assertEqual(self.rebuild([added]), (self.PAGES + 1, 0))
+            self.assertTrue(Path(self.output_dir, "notes", "new", "index.html").exists())
+            added.unlink()
+            self.assertEqual(self.rebuild([added]), (self.PAGES, 0))
+        self.assertFalse(Path(self.output_dir, "notes", "new", "index.html").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,8 +22,40 @@ class TestTemplateLoader(unittest.TestCase):
         from src.templates.loader import load_template
         self.assertTrue(callable(load_template))
 
-    # Add more specific tests for TemplateLoader functionality here
-    # This is a placeholder for future tests when the TemplateLoader class is implemented
+    def test_compiled_template_matches_replace(self):
+        """Test that rendering matches chained str.replace on plain values."""
+        from src.templates.loader import compile_template
+
+        source = "<title>{title}</title><meta content=\"{description}\">{navigation}<main>{content}</main>{title}"
+        values = {"title": "T", "content": "<p>Body</p>", "navigation": "<nav></nav>", "description": "D"}
+        expected = source
+        for name, value in values.items():
+            expected = expected.replace("{" + name + "}", value)
+        self.assertEqual(compile_template(source).render(**values), expected)
+
+    def test_compiled_template_ignores_placeholders_in_values(self):
+        """Test that placeholders inside substituted content are not expanded."""
+        from src.templates.loader import compile_template
+
+        template = compile_template("{navigation}|{content}|{title}|{description}")
+        html = template.render(title="T", content="literal {navigation} and {title}",
+                               navigation="NAV", description="D")
+        self.assertEqual(html, "NAV|literal {navigation} and {title}|T|D")
+
+    def test_compiled_template_keeps_unknown_braces(self):
+        """Test that braces that are not placeholders are left alone."""
+        from src.templates.loader import compile_template
+
+        template = compile_template("body { color: red; } {content} {unknown}")
+        self.assertEqual(template.render(content="x"), "body { color: red; } x {unknown}")
+        self.assertEqual(template.placeholders, ["content"])
+
+    def test_compiled_template_missing_value(self):
+        """Test that a missing placeholder value raises KeyError."""
+        from src.templates.loader import compile_template
+
+        with self.assertRaises(KeyError):
+            compile_template("{title}{content}").render(title="T")
 
 
 if __name__ == '__main__':